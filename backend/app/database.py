@@ -1,6 +1,6 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Float
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON, Index, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, relationship, deferred, undefer_group
 from datetime import datetime
 import os
 
@@ -22,8 +22,9 @@ class Article(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
     url = Column(String, unique=True, nullable=False)
-    content = Column(Text)
-    summary = Column(Text)
+    # Article bodies (up to ~10KB each) load only when accessed or undeferred
+    content = deferred(Column(Text), group="body")
+    summary = deferred(Column(Text), group="body")
     author = Column(String)
     published_at = Column(DateTime, index=True)
     source = Column(String, index=True)
@@ -32,6 +33,61 @@ class Article(Base):
     image_url = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    features = relationship(
+        "ArticleFeatures",
+        uselist=False,
+        back_populates="article",
+        cascade="all, delete-orphan"
+    )
+    
+    # Keyset pagination ranges on (published_at, id), optionally within a category or source
+    __table_args__ = (
+        Index("ix_articles_published_id", "published_at", "id"),
+        Index("ix_articles_category_published_id", "category", "published_at", "id"),
+        Index("ix_articles_source_published_id", "source", "published_at", "id"),
+    )
+
+# Loader option for queries whose articles are serialized with content and summary
+WITH_ARTICLE_BODY = undefer_group("body")
+
+class ArticleFeatures(Base):
+    """Per-article text features computed once at ingest and shared by all consumers"""
+    __tablename__ = "article_features"
+    
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, nullable=False)
+    text_length = Column(Integer, default=0)
+    lexicon_counts = Column(JSON)  # sentiment lexicon hits: [positive, negative, neutral, other]
+    terms = Column(JSON)  # {field: {term: count}} for title/content keywords and phrases
+    topics = Column(JSON)  # related tech topics
+    category_hits = Column(JSON)  # fallback categories whose keywords matched
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    article = relationship("Article", back_populates="features")
+
+class ArticleRollup(Base):
+    """Article counts per published hour, category, source and sentiment for analytics"""
+    __tablename__ = "article_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    hour = Column(DateTime, index=True)  # start of the published hour (UTC); NULL if undated
+    category = Column(String)
+    source = Column(String)
+    sentiment = Column(String)
+    count = Column(Integer, default=0, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_article_rollups_key", "hour", "category", "source", "sentiment"),
+    )
+
+class RollupState(Base):
+    """How far the rollups have counted: every article up to last_article_id, article_count in all"""
+    __tablename__ = "rollup_state"
+    
+    id = Column(Integer, primary_key=True)
+    last_article_id = Column(Integer, default=0, nullable=False)
+    article_count = Column(Integer, default=0, nullable=False)
 
 class Bookmark(Base):
     __tablename__ = "bookmarks"
@@ -52,6 +108,7 @@ class ChatHistory(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 class TrendingTopic(Base):
+    """One topic of a materialized trending snapshot; all rows of a snapshot share `date`"""
     __tablename__ = "trending_topics"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -59,6 +116,13 @@ class TrendingTopic(Base):
     count = Column(Integer, default=1)
     score = Column(Float, default=0.0)
     date = Column(DateTime, default=datetime.utcnow, index=True)
+    window_hours = Column(Integer)  # trending window the snapshot was computed for
+    rank = Column(Integer)  # position by count, before the score ordering
+    article_ids = Column(JSON)  # related articles, newest first
+    
+    __table_args__ = (
+        Index("ix_trending_topics_window_date", "window_hours", "date"),
+    )
 
 def get_db():
     """Dependency to get database session"""
@@ -68,10 +132,32 @@ def get_db():
     finally:
         db.close()
 
+def add_missing_columns():
+    """Add model columns and indexes missing from existing tables; create_all never alters tables"""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            added = [column for column in table.columns if column.name not in existing]
+            for column in added:
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                print(f"🔧 Added column {table.name}.{column.name}")
+            
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(bind=connection, checkfirst=True)
+                    print(f"🔧 Added index {index.name}")
+
 def init_db():
     """Initialize database tables"""
     try:
         Base.metadata.create_all(bind=engine)
+        add_missing_columns()
         print("✅ Database initialized successfully")
     except Exception as e:
         print(f"ℹ️  Database already exists or initialization skipped: {e}")
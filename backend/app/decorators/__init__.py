@@ -3,5 +3,6 @@ Decorators package for the tech news aggregator
 """
 
 from .cache_decorator import cached
+from .search_log import logged_search
 
-__all__ = ['cached']
\ No newline at end of file
+__all__ = ['cached', 'logged_search']
\ No newline at end of file
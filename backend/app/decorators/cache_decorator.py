@@ -2,44 +2,98 @@
 Simple cache decorator to eliminate duplicated caching logic
 """
 
-import logging
 import hashlib
-from typing import Any, Callable, Optional
+import inspect
+import json
+import logging
+from collections import defaultdict
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Sequence
 from functools import wraps
 
+from fastapi.params import Depends as DependsParam, Param
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
 from ..services.redis_cache import cache
+from ..services.timeutil import to_naive_utc
 
 logger = logging.getLogger(__name__)
 
-def cached(ttl: int = 300, key_prefix: str = ""):
+# key prefix -> {"hits": n, "misses": n} for this process
+cache_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+def canonical_value(value: Any) -> Any:
+    """JSON-ready form of an argument that is equal for equal requests"""
+    if isinstance(value, Param):
+        value = value.default  # a Query(...) default when called directly
+    if isinstance(value, datetime):
+        return to_naive_utc(value).isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return canonical_value(value.value)
+    if isinstance(value, BaseModel):
+        return canonical_value(value.dict())
+    if isinstance(value, dict):
+        return {str(key): canonical_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [canonical_value(item) for item in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+def is_dependency(parameter: inspect.Parameter, value: Any) -> bool:
+    """Injected by FastAPI (database sessions and other dependencies) rather than part of the request"""
+    return isinstance(parameter.default, DependsParam) or isinstance(value, Session)
+
+def cache_key(func: Callable, key_prefix: str, args: tuple, kwargs: dict, scope: Sequence[str] = ()) -> str:
+    """`prefix:[scope values:]function:hash`, where the hash covers every request parameter"""
+    signature = inspect.signature(func)
+    bound = signature.bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    params = {
+        name: canonical_value(value)
+        for name, value in bound.arguments.items()
+        if not is_dependency(signature.parameters[name], value)
+    }
+    payload = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    args_hash = hashlib.md5(payload.encode()).hexdigest()[:16]
+    # Scope values stay readable so their entries can be invalidated together
+    parts = [key_prefix] if key_prefix else []
+    parts += [str(params.get(name)) for name in scope]
+    return ":".join(parts + [func.__name__, args_hash])
+
+def cached(ttl: int = 300, key_prefix: str = "", scope: Sequence[str] = ()):
     """
     Simple cache decorator for FastAPI endpoints
-    
+
     Args:
         ttl: Time to live in seconds (default: 5 minutes)
         key_prefix: Optional prefix for cache keys
+        scope: Parameters whose values are written into the key (e.g. user_id), for invalidation
     """
     def decorator(func):
+        stats = cache_stats[key_prefix or func.__name__]
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Generate a simple cache key from function name and all arguments
-            func_name = f"{key_prefix}:{func.__name__}" if key_prefix else func.__name__
-            
-            # Create a deterministic hash from all arguments
-            args_str = str(args) + str(sorted(kwargs.items()))
-            args_hash = hashlib.md5(args_str.encode()).hexdigest()[:12]  # Short hash
-            cache_key = f"{func_name}:{args_hash}"
-            
+            # Same request parameters, same key; injected dependencies are left out
+            cache_key_value = cache_key(func, key_prefix, args, kwargs, scope)
+
             # Try to get from cache
-            cached_result = cache.get(cache_key)
+            cached_result = cache.get(cache_key_value)
             if cached_result is not None:
-                logger.debug(f"🎯 Cache HIT: {cache_key}")
+                stats["hits"] += 1
+                logger.debug(f"🎯 Cache HIT: {cache_key_value}")
                 return cached_result
-            
+
             # Cache miss - execute function
-            logger.debug(f"💭 Cache MISS: {cache_key}")
+            stats["misses"] += 1
+            logger.debug(f"💭 Cache MISS: {cache_key_value}")
             result = await func(*args, **kwargs)
-            
+
             # Serialize result for caching
             if hasattr(result, 'dict'):
                 # Pydantic models
@@ -53,10 +107,17 @@ def cached(ttl: int = 300, key_prefix: str = ""):
             else:
                 # Plain Python objects (dict, list, etc.)
                 cache_data = result
-            
+
             # Cache the result
-            cache.set(cache_key, cache_data, ttl)
-            
+            cache.set(cache_key_value, cache_data, ttl)
+
             return result
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
+
+def cache_hit_rates() -> Dict[str, Dict[str, Any]]:
+    """Hits, misses and hit rate per key prefix since this process started"""
+    return {
+        prefix: dict(counts, hit_rate=round(counts["hits"] / max(counts["hits"] + counts["misses"], 1), 3))
+        for prefix, counts in sorted(cache_stats.items())
+    }
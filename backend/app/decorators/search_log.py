@@ -0,0 +1,25 @@
+"""
+Search logging decorator, applied outside the response cache so cached
+searches are counted too
+"""
+
+from functools import wraps
+
+from ..services.query_log import query_log
+
+def logged_search(query_param: str = "q"):
+    """
+    Record the search text of first-page requests in the query log
+
+    Args:
+        query_param: Name of the endpoint argument holding the search text
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            # Later pages and cursors continue a search that was already counted
+            if kwargs.get("page", 1) == 1 and not kwargs.get("cursor"):
+                query_log.record(kwargs.get(query_param))
+            return await func(*args, **kwargs)
+        return wrapper
+    return decorator
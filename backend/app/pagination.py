@@ -0,0 +1,199 @@
+"""
+Cursor pagination for article lists
+Cursors are opaque tokens. Lists ordered by recency use keyset cursors on
+(published_at, id), so every page is an index range scan however deep it is;
+relevance-ranked lists carry their offset. `has_next` comes from fetching one
+row past the page, and totals (from the count subsystem) only when asked for.
+Pages within the recent-article hot set are selected in memory instead.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+from .database import Article
+from .schemas import ArticleListResponse
+from .services.counts import count_articles
+from .services.hot_set import hot_set
+
+# Filters the in-memory hot set can apply
+HOT_FILTERS = {"category", "source", "sentiment", "date_from", "date_to"}
+
+# Newest first; undated articles last on every database
+RECENCY_ORDER = (Article.published_at.desc().nullslast(), Article.id.desc())
+
+KEYSET = "k"
+OFFSET = "o"
+
+def encode_cursor(kind: str, *values) -> str:
+    payload = json.dumps([kind, *values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(cursor: str, kind: str) -> list:
+    """Values stored in a cursor of the given kind; 400 for anything else"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if isinstance(payload, list) and payload and payload[0] == kind:
+            return payload[1:]
+    except ValueError:
+        pass
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def wants_total(include_total: Optional[bool], cursor: Optional[str]) -> bool:
+    """Totals by default for page-number requests, on request for cursor requests"""
+    return include_total if include_total is not None else cursor is None
+
+def page_total(query: Query, filters: Optional[Dict]) -> Tuple[int, bool]:
+    """(total, approximate) from the count subsystem when the filters are known, else an exact count"""
+    if filters is None:
+        return query.count(), False
+    return count_articles(query.session, filters)
+
+def keyset_position(cursor: str) -> Tuple[Optional[datetime], int]:
+    values = decode_cursor(cursor, KEYSET)
+    try:
+        published_at, article_id = values
+        return (datetime.fromisoformat(published_at) if published_at else None), int(article_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_rows(query: Query, position: Tuple[Optional[datetime], int], limit: int) -> List[Article]:
+    """Up to `limit` articles after position in recency order"""
+    published_at, article_id = position
+    rows = []
+    # Dated articles first, then undated ones; each part is a plain range on an index
+    if published_at is not None:
+        rows = query.filter(
+            Article.published_at.isnot(None),
+            or_(
+                Article.published_at < published_at,
+                and_(Article.published_at == published_at, Article.id < article_id)
+            )
+        ).order_by(Article.published_at.desc(), Article.id.desc()).limit(limit).all()
+    if len(rows) < limit:
+        undated = query.filter(Article.published_at.is_(None))
+        if published_at is None:
+            undated = undated.filter(Article.id < article_id)
+        rows += undated.order_by(Article.id.desc()).limit(limit - len(rows)).all()
+    return rows
+
+def rows_in_order(query: Query, ids: List[int]) -> List[Article]:
+    """Rows of query with the given ids, keeping the order of ids"""
+    if not ids:
+        return []
+    by_id = {article.id: article for article in query.filter(Article.id.in_(ids)).all()}
+    return [by_id[article_id] for article_id in ids if article_id in by_id]
+
+def hot_rows(
+    query: Query,
+    filters: Optional[Dict],
+    position: Optional[Tuple[Optional[datetime], int]],
+    offset: int,
+    limit: int
+) -> Optional[Tuple[List[Article], Optional[int]]]:
+    """(rows, exact total or None) from the recent-article hot set, or None if it cannot serve the page"""
+    if filters is None or not set(filters) <= HOT_FILTERS:
+        return None
+    if position is not None and position[0] is None:
+        return None  # undated articles are never held
+    if not hot_set.ready(query.session):
+        return None
+    page = hot_set.page(filters, position, offset, limit)
+    if page is None:
+        return None
+    ids, total = page
+    return rows_in_order(query, ids), total
+
+def paginate_recent(
+    query: Query,
+    page: int,
+    page_size: int,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
+    filters: Optional[Dict] = None
+) -> ArticleListResponse:
+    """One page of an (unordered) article query, newest first; `filters` describe the query for counting"""
+    position = keyset_position(cursor) if cursor else None
+    offset = 0 if cursor else (page - 1) * page_size
+
+    # Recent pages are picked from the in-memory hot set and only their rows loaded
+    hot = hot_rows(query, filters, position, offset, page_size + 1)
+    if hot is not None:
+        rows, hot_total = hot
+    else:
+        hot_total = None
+        if position is not None:
+            rows = keyset_rows(query, position, page_size + 1)
+        else:
+            rows = query.order_by(*RECENCY_ORDER).offset(offset).limit(page_size + 1).all()
+
+    total, approximate = None, False
+    if wants_total(include_total, cursor):
+        total, approximate = (hot_total, False) if hot_total is not None else page_total(query, filters)
+
+    has_next = len(rows) > page_size
+    articles = rows[:page_size]
+    next_cursor = None
+    if has_next:
+        last = articles[-1]
+        next_cursor = encode_cursor(KEYSET, last.published_at.isoformat() if last.published_at else None, last.id)
+
+    return ArticleListResponse(
+        articles=articles,
+        total=total,
+        approximate=approximate,
+        page=page,
+        page_size=page_size,
+        has_next=has_next,
+        next_cursor=next_cursor
+    )
+
+def ranked_offset(page: int, page_size: int, cursor: Optional[str] = None) -> int:
+    """Position of the first result for a relevance-ranked page"""
+    if not cursor:
+        return (page - 1) * page_size
+    values = decode_cursor(cursor, OFFSET)
+    if len(values) != 1 or not isinstance(values[0], int) or values[0] < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values[0]
+
+def ranked_response(
+    articles: List[Article],
+    total: Optional[int],
+    offset: int,
+    page: int,
+    page_size: int,
+    has_next: bool,
+    approximate: bool = False,
+    response_model: Type[ArticleListResponse] = ArticleListResponse,
+    **fields
+) -> ArticleListResponse:
+    return response_model(
+        **fields,
+        articles=articles,
+        total=total,
+        approximate=approximate,
+        page=page,
+        page_size=page_size,
+        has_next=has_next,
+        next_cursor=encode_cursor(OFFSET, offset + page_size) if has_next else None
+    )
+
+def paginate_ranked(
+    query: Query,
+    page: int,
+    page_size: int,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
+    filters: Optional[Dict] = None
+) -> ArticleListResponse:
+    """One page of an already ordered (e.g. by relevance) article query"""
+    total, approximate = page_total(query, filters) if wants_total(include_total, cursor) else (None, False)
+    offset = ranked_offset(page, page_size, cursor)
+    rows = query.offset(offset).limit(page_size + 1).all()
+    return ranked_response(rows[:page_size], total, offset, page, page_size, len(rows) > page_size, approximate)
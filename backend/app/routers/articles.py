@@ -3,9 +3,11 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 
-from ..database import get_db, Article
+from ..database import get_db, Article, WITH_ARTICLE_BODY
 from ..schemas import ArticleResponse, ArticleListResponse, ArticleFilter
 from ..decorators import cached
+from ..pagination import paginate_recent
+from ..services.vector_index import vector_index
 
 router = APIRouter()
 
@@ -19,10 +21,12 @@ async def get_articles(
     sentiment: Optional[str] = Query(None),
     date_from: Optional[datetime] = Query(None),
     date_to: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: only without cursor)"),
     db: Session = Depends(get_db)
 ):
     """Get paginated list of articles with optional filtering"""
-    query = db.query(Article)
+    query = db.query(Article).options(WITH_ARTICLE_BODY)
     
     # Apply filters
     if category:
@@ -36,104 +40,80 @@ async def get_articles(
     if date_to:
         query = query.filter(Article.published_at <= date_to)
     
-    # Order by published date (newest first)
-    query = query.order_by(Article.published_at.desc())
-    
-    # Get total count and paginated results
-    total = query.count()
-    offset = (page - 1) * page_size
-    articles = query.offset(offset).limit(page_size).all()
-    has_next = total > (page * page_size)
-    
-    return ArticleListResponse(
-        articles=articles,
-        total=total,
-        page=page,
-        page_size=page_size,
-        has_next=has_next
-    )
+    # Newest first, by page number or by cursor
+    filters = dict(category=category, source=source, sentiment=sentiment, date_from=date_from, date_to=date_to)
+    return paginate_recent(query, page, page_size, cursor, include_total, filters)
 
 @router.get("/{article_id}", response_model=ArticleResponse)
-@cached(ttl=900, key_prefix="article_detail")  # 15 minutes
+@cached(ttl=900, key_prefix="articles:detail")  # 15 minutes
 async def get_article(article_id: int, db: Session = Depends(get_db)):
     """Get a specific article by ID"""
-    article = db.query(Article).filter(Article.id == article_id).first()
+    article = db.query(Article).options(WITH_ARTICLE_BODY).filter(Article.id == article_id).first()
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     return article
 
+@router.get("/{article_id}/related", response_model=List[ArticleResponse])
+@cached(ttl=900, key_prefix="articles:related")  # 15 minutes
+async def get_related_articles(
+    article_id: int,
+    limit: int = Query(5, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """Get articles with similar content, by local embedding similarity"""
+    if not vector_index.ready(db):
+        # Loading in the background; don't block the event loop embedding the corpus
+        raise HTTPException(status_code=503, detail="Related articles are not available yet", headers={"Retry-After": "30"})
+    vector = vector_index.vector_for(db, article_id)
+    if vector is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    
+    related_ids = [related_id for related_id, _ in vector_index.nearest(vector, limit, exclude=article_id)]
+    by_id = {
+        article.id: article
+        for article in db.query(Article).options(WITH_ARTICLE_BODY).filter(Article.id.in_(related_ids)).all()
+    } if related_ids else {}
+    return [by_id[related_id] for related_id in related_ids if related_id in by_id]
+
 @router.get("/category/{category}", response_model=ArticleListResponse)
 async def get_articles_by_category(
     category: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: only without cursor)"),
     db: Session = Depends(get_db)
 ):
     """Get articles filtered by category"""
-    query = db.query(Article).filter(Article.category == category)
-    query = query.order_by(Article.published_at.desc())
+    query = db.query(Article).options(WITH_ARTICLE_BODY).filter(Article.category == category)
     
-    total = query.count()
-    offset = (page - 1) * page_size
-    articles = query.offset(offset).limit(page_size).all()
-    
-    has_next = total > (page * page_size)
-    
-    return ArticleListResponse(
-        articles=articles,
-        total=total,
-        page=page,
-        page_size=page_size,
-        has_next=has_next
-    )
+    return paginate_recent(query, page, page_size, cursor, include_total, dict(category=category))
 
 @router.get("/source/{source}", response_model=ArticleListResponse)
 async def get_articles_by_source(
     source: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: only without cursor)"),
     db: Session = Depends(get_db)
 ):
     """Get articles filtered by source"""
-    query = db.query(Article).filter(Article.source == source)
-    query = query.order_by(Article.published_at.desc())
-    
-    total = query.count()
-    offset = (page - 1) * page_size
-    articles = query.offset(offset).limit(page_size).all()
+    query = db.query(Article).options(WITH_ARTICLE_BODY).filter(Article.source == source)
     
-    has_next = total > (page * page_size)
-    
-    return ArticleListResponse(
-        articles=articles,
-        total=total,
-        page=page,
-        page_size=page_size,
-        has_next=has_next
-    )
+    return paginate_recent(query, page, page_size, cursor, include_total, dict(source=source))
 
 @router.get("/recent/{hours}", response_model=ArticleListResponse)
 async def get_recent_articles(
     hours: int = 24,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: only without cursor)"),
     db: Session = Depends(get_db)
 ):
     """Get articles from the last N hours"""
     since = datetime.utcnow() - timedelta(hours=hours)
-    query = db.query(Article).filter(Article.published_at >= since)
-    query = query.order_by(Article.published_at.desc())
-    
-    total = query.count()
-    offset = (page - 1) * page_size
-    articles = query.offset(offset).limit(page_size).all()
-    
-    has_next = total > (page * page_size)
+    query = db.query(Article).options(WITH_ARTICLE_BODY).filter(Article.published_at >= since)
     
-    return ArticleListResponse(
-        articles=articles,
-        total=total,
-        page=page,
-        page_size=page_size,
-        has_next=has_next
-    )
\ No newline at end of file
+    return paginate_recent(query, page, page_size, cursor, include_total, dict(date_from=since))
\ No newline at end of file
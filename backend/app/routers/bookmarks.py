@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 
-from ..database import get_db, Bookmark, Article
+from ..database import get_db, Bookmark, Article, WITH_ARTICLE_BODY
 from ..schemas import BookmarkCreate, BookmarkResponse
 from ..services.redis_cache import CacheInvalidator
 from ..decorators import cached
@@ -50,7 +50,7 @@ async def create_bookmark(
     )
 
 @router.get("/", response_model=List[BookmarkResponse])
-@cached(ttl=300, key_prefix="bookmarks")  # 5 minutes
+@cached(ttl=300, key_prefix="bookmarks", scope=("user_id",))  # 5 minutes
 async def get_bookmarks(
     user_id: str = "anonymous",
     skip: int = 0,
@@ -65,7 +65,7 @@ async def get_bookmarks(
     # Fetch articles for each bookmark
     result = []
     for bookmark in bookmarks:
-        article = db.query(Article).filter(Article.id == bookmark.article_id).first()
+        article = db.query(Article).options(WITH_ARTICLE_BODY).filter(Article.id == bookmark.article_id).first()
         if article:
             result.append(BookmarkResponse(
                 id=bookmark.id,
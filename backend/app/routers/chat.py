@@ -28,8 +28,8 @@ async def chat_with_ai(
         # Get article context if article_id provided
         article_context = None
         if chat_message.article_id:
-            from ..database import Article
-            article = db.query(Article).filter(Article.id == chat_message.article_id).first()
+            from ..database import Article, WITH_ARTICLE_BODY
+            article = db.query(Article).options(WITH_ARTICLE_BODY).filter(Article.id == chat_message.article_id).first()
             article_context = article
         
         return ChatResponse(
@@ -1,19 +1,98 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
 from typing import Optional, List
 from datetime import datetime
 
-from ..database import get_db, Article
-from ..schemas import ArticleListResponse, SearchRequest
-from ..decorators import cached
+from ..database import get_db, Article, WITH_ARTICLE_BODY
+from ..schemas import ArticleListResponse, FacetedArticleListResponse, SearchRequest
+from ..decorators import cached, logged_search
+from ..pagination import paginate_ranked, paginate_recent, ranked_offset, ranked_response, rows_in_order
+from ..services.search_backend import search_backend
+from ..services.spell_checker import spell_checker
+from ..services.facet_index import facet_index
+from ..services.inverted_index import search_index
+from ..services.query_log import query_log
+from ..services.query_parser import MAX_QUERY_LENGTH, parse_query
+from ..services.suggestion_index import suggestion_index
+from ..services.vector_index import embed_text, vector_index
 
 router = APIRouter()
 
+# Nearest neighbors considered by semantic search before filters and paging
+SEMANTIC_CANDIDATES = 500
+
+def articles_in_order(db: Session, ids: List[int]) -> List[Article]:
+    """Load articles by id, keeping the order of ids"""
+    return rows_in_order(db.query(Article).options(WITH_ARTICLE_BODY), ids)
+
+def with_correction(db: Session, response: ArticleListResponse, text_query: str) -> ArticleListResponse:
+    """Add a corrected query when the text has words the corpus does not contain"""
+    if spell_checker.ready(db):
+        response.did_you_mean = spell_checker.did_you_mean(text_query)
+    return response
+
+def index_search(
+    db: Session,
+    text_query: str,
+    filters: dict,
+    page: int,
+    page_size: int,
+    cursor: Optional[str] = None,
+    by_recency: bool = False
+) -> Optional[ArticleListResponse]:
+    """Serve a text search from the in-process index; None when the database should handle it"""
+    if parse_query(text_query) is None or not search_index.serves_queries() or not search_index.ready(db):
+        return None
+
+    offset = ranked_offset(page, page_size, cursor)
+    ids, total = search_index.search(
+        text_query, offset=offset, limit=page_size, by_recency=by_recency, **filters
+    )
+    # The index always knows the exact total
+    return ranked_response(articles_in_order(db, ids), total, offset, page, page_size, total > offset + page_size)
+
+def semantic_search(
+    db: Session,
+    text_query: str,
+    category: Optional[str],
+    source: Optional[str],
+    sentiment: Optional[str],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    page: int,
+    page_size: int,
+    cursor: Optional[str] = None
+) -> Optional[ArticleListResponse]:
+    """Articles closest to the query in the local embedding space, filtered in the database; None while the index loads"""
+    if not vector_index.ready(db):
+        return None
+    ranked_ids = [article_id for article_id, _ in vector_index.nearest(embed_text(text_query), SEMANTIC_CANDIDATES)]
+    
+    query = db.query(Article.id).filter(Article.id.in_(ranked_ids))
+    if category:
+        query = query.filter(Article.category == category)
+    if source:
+        query = query.filter(Article.source == source)
+    if sentiment:
+        query = query.filter(Article.sentiment == sentiment)
+    if date_from:
+        query = query.filter(Article.published_at >= date_from)
+    if date_to:
+        query = query.filter(Article.published_at <= date_to)
+    matching = {article_id for (article_id,) in query.all()} if ranked_ids else set()
+    ids = [article_id for article_id in ranked_ids if article_id in matching]
+    
+    offset = ranked_offset(page, page_size, cursor)
+    return ranked_response(
+        articles_in_order(db, ids[offset:offset + page_size]), len(ids), offset, page, page_size,
+        len(ids) > offset + page_size
+    )
+
 @router.get("/", response_model=ArticleListResponse)
+@logged_search("q")
 @cached(ttl=600, key_prefix="search")  # 10 minutes
 async def search_articles(
-    q: str = Query(..., description="Search query"),
+    q: str = Query(..., max_length=MAX_QUERY_LENGTH, description="Search query"),
     category: Optional[str] = Query(None, description="Filter by category"),
     source: Optional[str] = Query(None, description="Filter by source"),
     sentiment: Optional[str] = Query(None, description="Filter by sentiment"),
@@ -21,23 +100,27 @@ async def search_articles(
     date_to: Optional[datetime] = Query(None, description="Filter articles to this date"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    mode: str = Query("keyword", pattern="^(keyword|semantic)$", description="Keyword or semantic (embedding) search"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: only without cursor)"),
     db: Session = Depends(get_db)
 ):
     """Search articles with full-text search and filters"""
     
-    # Start with base query
-    query = db.query(Article)
+    if mode == "semantic" and q.strip():
+        response = semantic_search(db, q, category, source, sentiment, date_from, date_to, page, page_size, cursor)
+        # Keyword results until the embeddings have loaded
+        if response is not None:
+            return response
     
-    # Apply text search (search in title, content, and summary)
+    filters = dict(category=category, source=source, sentiment=sentiment, date_from=date_from, date_to=date_to)
     if q and q.strip():
-        search_term = f"%{q}%"
-        query = query.filter(
-            or_(
-                Article.title.ilike(search_term),
-                Article.content.ilike(search_term),
-                Article.summary.ilike(search_term)
-            )
-        )
+        response = index_search(db, q, filters, page, page_size, cursor)
+        if response is not None:
+            return with_correction(db, response, q)
+    
+    # Start with base query
+    query = db.query(Article).options(WITH_ARTICLE_BODY)
     
     # Apply filters
     if category:
@@ -55,31 +138,11 @@ async def search_articles(
     if date_to:
         query = query.filter(Article.published_at <= date_to)
     
-    # Order by relevance (articles with search term in title first) and then by date
+    # Full-text match ordered by relevance (title matches weigh most), then by date
     if q and q.strip():
-        query = query.order_by(
-            Article.title.ilike(f"%{q}%").desc(),
-            Article.published_at.desc()
-        )
-    else:
-        query = query.order_by(Article.published_at.desc())
-    
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * page_size
-    articles = query.offset(offset).limit(page_size).all()
-    
-    has_next = total > (page * page_size)
-    
-    return ArticleListResponse(
-        articles=articles,
-        total=total,
-        page=page,
-        page_size=page_size,
-        has_next=has_next
-    )
+        query = search_backend.search(query, q)
+        return with_correction(db, paginate_ranked(query, page, page_size, cursor, include_total, dict(filters, text=(q,))), q)
+    return paginate_recent(query, page, page_size, cursor, include_total, filters)
 
 @router.post("/", response_model=ArticleListResponse)
 async def advanced_search(
@@ -87,24 +150,38 @@ async def advanced_search(
     db: Session = Depends(get_db)
 ):
     """Advanced search with complex filters"""
+    if search_request.page == 1 and not search_request.cursor:
+        query_log.record(search_request.query)
     
-    query = db.query(Article)
-    
-    # Apply text search
-    if search_request.query and search_request.query.strip():
-        search_term = f"%{search_request.query}%"
-        query = query.filter(
-            or_(
-                Article.title.ilike(search_term),
-                Article.content.ilike(search_term),
-                Article.summary.ilike(search_term)
-            )
+    # Text matching (query and/or filters.search_query) can be served by the in-process index
+    filters = search_request.filters
+    has_query = bool(search_request.query and search_request.query.strip())
+    parts = [part for part in (search_request.query, filters and filters.search_query) if part and part.strip()]
+    # Both must match; parentheses keep each part's own operators together
+    text_query = " ".join(f"({part})" for part in parts) if len(parts) > 1 else "".join(parts)
+    if text_query.strip():
+        response = index_search(
+            db,
+            text_query,
+            dict(
+                category=filters and filters.category,
+                source=filters and filters.source,
+                sentiment=filters and filters.sentiment,
+                date_from=filters and filters.date_from,
+                date_to=filters and filters.date_to
+            ),
+            search_request.page,
+            search_request.page_size,
+            search_request.cursor,
+            by_recency=not has_query
         )
+        if response is not None:
+            return with_correction(db, response, text_query)
+    
+    query = db.query(Article).options(WITH_ARTICLE_BODY)
     
     # Apply filters if provided
-    if search_request.filters:
-        filters = search_request.filters
-        
+    if filters:
         if filters.category:
             query = query.filter(Article.category == filters.category)
         
@@ -121,111 +198,75 @@ async def advanced_search(
             query = query.filter(Article.published_at <= filters.date_to)
         
         if filters.search_query:
-            additional_term = f"%{filters.search_query}%"
-            query = query.filter(
-                or_(
-                    Article.title.ilike(additional_term),
-                    Article.content.ilike(additional_term),
-                    Article.summary.ilike(additional_term)
-                )
-            )
-    
-    # Order by relevance and date
-    if search_request.query and search_request.query.strip():
-        query = query.order_by(
-            Article.title.ilike(f"%{search_request.query}%").desc(),
-            Article.published_at.desc()
+            query = search_backend.filter(query, filters.search_query)
+    
+    # Full-text match ordered by relevance, then by date
+    page, page_size = search_request.page, search_request.page_size
+    count_filters = dict(
+        filters.dict(exclude={"search_query"}) if filters else {},
+        text=(search_request.query, filters and filters.search_query)
+    )
+    if has_query:
+        query = search_backend.search(query, search_request.query)
+        response = paginate_ranked(
+            query, page, page_size, search_request.cursor, search_request.include_total, count_filters
         )
     else:
-        query = query.order_by(Article.published_at.desc())
-    
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    offset = (search_request.page - 1) * search_request.page_size
-    articles = query.offset(offset).limit(search_request.page_size).all()
-    
-    has_next = total > (search_request.page * search_request.page_size)
-    
-    return ArticleListResponse(
-        articles=articles,
-        total=total,
-        page=search_request.page,
-        page_size=search_request.page_size,
-        has_next=has_next
+        response = paginate_recent(query, page, page_size, search_request.cursor, search_request.include_total, count_filters)
+    return with_correction(db, response, text_query) if text_query.strip() else response
+
+@router.get("/facets", response_model=FacetedArticleListResponse)
+@cached(ttl=300, key_prefix="search:facets")  # 5 minutes
+async def faceted_search(
+    category: Optional[List[str]] = Query(None, description="Categories (repeat for any of several)"),
+    source: Optional[List[str]] = Query(None, description="Sources (repeat for any of several)"),
+    sentiment: Optional[List[str]] = Query(None, description="Sentiments (repeat for any of several)"),
+    date_from: Optional[datetime] = Query(None, description="Filter articles from this date"),
+    date_to: Optional[datetime] = Query(None, description="Filter articles to this date"),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    db: Session = Depends(get_db)
+):
+    """Filter articles by facets (newest first) with per-value counts for every facet"""
+    facet_index.sync(db)
+    offset = ranked_offset(page, page_size, cursor)
+    ids, total, facets = facet_index.search(
+        dict(category=category, source=source, sentiment=sentiment), date_from, date_to, offset, page_size
+    )
+    return ranked_response(
+        articles_in_order(db, ids), total, offset, page, page_size, total > offset + page_size,
+        response_model=FacetedArticleListResponse, facets=facets
     )
 
 @router.get("/suggestions")
-@cached(ttl=1800, key_prefix="suggestions")  # 30 minutes
+@cached(ttl=1800, key_prefix="search:suggestions")  # 30 minutes
 async def get_search_suggestions(
-    q: str = Query(..., min_length=2, description="Partial search query"),
+    q: str = Query(..., min_length=2, max_length=MAX_QUERY_LENGTH, description="Partial search query"),
     limit: int = Query(10, ge=1, le=20, description="Number of suggestions"),
     db: Session = Depends(get_db)
 ):
     """Get search suggestions based on article titles and keywords"""
-    search_term = f"%{q}%"
-    
-    # Get article titles that match the search term
-    suggestions = db.query(Article.title).filter(
-        Article.title.ilike(search_term)
-    ).distinct().limit(limit).all()
-    
-    # Extract unique words from matching titles
-    title_words = set()
-    for (title,) in suggestions:
-        words = title.lower().split()
-        for word in words:
-            if q.lower() in word and len(word) > 2:
-                title_words.add(word)
-    
-    # Return suggestions sorted by relevance (exact matches first)
-    suggestion_list = list(title_words)
-    suggestion_list.sort(key=lambda x: (x.startswith(q.lower()), x))
-    
-    return {"suggestions": suggestion_list[:limit]}
+    # Prefix lookup in the title term index, most common terms first
+    suggestion_index.sync(db)
+    suggestions = suggestion_index.suggest(q, limit)
+    
+    # Nothing starts with the text: it may be misspelled
+    did_you_mean = None
+    if not suggestions and spell_checker.ready(db):
+        did_you_mean = spell_checker.did_you_mean(q)
+        if did_you_mean:
+            suggestions = suggestion_index.suggest(did_you_mean, limit)
+    return {"suggestions": suggestions, "did_you_mean": did_you_mean}
 
 @router.get("/popular")
 async def get_popular_searches(
     limit: int = Query(10, ge=1, le=20),
-    db: Session = Depends(get_db)
+    window: str = Query("day", pattern="^(hour|day)$", description="Count searches from the last hour or day")
 ):
-    """Get popular search terms based on article categories and trending topics"""
-    
-    # Get popular categories
-    popular_categories = db.query(
-        Article.category,
-        func.count(Article.id).label('count')
-    ).filter(
-        Article.category.isnot(None)
-    ).group_by(Article.category).order_by(func.count(Article.id).desc()).limit(5).all()
-    
-    # Get popular sources
-    popular_sources = db.query(
-        Article.source,
-        func.count(Article.id).label('count')
-    ).filter(
-        Article.source.isnot(None)
-    ).group_by(Article.source).order_by(func.count(Article.id).desc()).limit(5).all()
-    
-    # Combine and format results
-    popular_terms = []
-    
-    for category, count in popular_categories:
-        popular_terms.append({
-            "term": category,
-            "type": "category",
-            "count": count
-        })
-    
-    for source, count in popular_sources:
-        popular_terms.append({
-            "term": source,
-            "type": "source",
-            "count": count
-        })
-    
-    # Sort by count and return top results
-    popular_terms.sort(key=lambda x: x["count"], reverse=True)
-    
-    return {"popular_searches": popular_terms[:limit]}
\ No newline at end of file
+    """Get the most frequent search queries from the query log"""
+    popular_terms = [
+        {"term": term, "type": "query", "count": count}
+        for term, count in query_log.popular(window, limit)
+    ]
+    return {"popular_searches": popular_terms, "window": window}
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, HttpUrl, field_validator
+from pydantic import BaseModel, Field, HttpUrl, field_validator
 from datetime import datetime
-from typing import Optional, List, Union
+from typing import Dict, Optional, List, Union
 from enum import Enum
 
+from .services.query_parser import MAX_QUERY_LENGTH
+
 class SentimentEnum(str, Enum):
     positive = "positive"
     negative = "negative"
@@ -59,10 +61,16 @@ class ArticleResponse(ArticleBase):
 
 class ArticleListResponse(BaseModel):
     articles: List[ArticleResponse]
-    total: int
+    total: Optional[int] = None  # omitted for cursor requests unless include_total is set
+    approximate: bool = False  # total is an estimate
     page: int
     page_size: int
     has_next: bool
+    next_cursor: Optional[str] = None  # pass as `cursor` to fetch the following page
+    did_you_mean: Optional[str] = None  # the query with misspelled words corrected
+
+class FacetedArticleListResponse(ArticleListResponse):
+    facets: Dict[str, Dict[str, int]]  # field -> value -> matching articles
 
 # Chat Schemas
 class ChatMessage(BaseModel):
@@ -106,13 +114,15 @@ class ArticleFilter(BaseModel):
     sentiment: Optional[SentimentEnum] = None
     date_from: Optional[datetime] = None
     date_to: Optional[datetime] = None
-    search_query: Optional[str] = None
+    search_query: Optional[str] = Field(None, max_length=MAX_QUERY_LENGTH)
 
 class SearchRequest(BaseModel):
-    query: str
+    query: str = Field(..., max_length=MAX_QUERY_LENGTH)
     filters: Optional[ArticleFilter] = None
     page: int = 1
     page_size: int = 20
+    cursor: Optional[str] = None
+    include_total: Optional[bool] = None
 
 # Trending Topics Schema
 class TrendingTopicResponse(BaseModel):
@@ -124,6 +134,13 @@ class TrendingTopicResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class TrendingBurstResponse(BaseModel):
+    topic: str
+    count: int
+    recent_rate: float
+    baseline_rate: float
+    score: float
+
 # Error Schema
 class ErrorResponse(BaseModel):
     error: str
@@ -10,7 +10,8 @@ from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.schema.runnable import RunnablePassthrough
 from langchain.schema.output_parser import StrOutputParser
 
-from ..database import SessionLocal, Article, ChatHistory
+from ..database import SessionLocal, Article, ChatHistory, WITH_ARTICLE_BODY
+from .feature_store import article_topics
 
 logger = logging.getLogger(__name__)
 
@@ -92,7 +93,7 @@ When a user references a specific article, use the article content provided to g
         
         db = SessionLocal()
         try:
-            article = db.query(Article).filter(Article.id == article_id).first()
+            article = db.query(Article).options(WITH_ARTICLE_BODY).filter(Article.id == article_id).first()
             if not article:
                 return "Article not found."
             
@@ -235,23 +236,8 @@ When a user references a specific article, use the article content provided to g
             if not article:
                 return []
             
-            # Extract topics from title and content
-            text = f"{article.title} {article.content}".lower()
-            
-            # Common tech topics
-            topics = []
-            tech_topics = {
-                "artificial intelligence": ["ai", "machine learning", "neural network", "deep learning"],
-                "blockchain": ["bitcoin", "ethereum", "cryptocurrency", "web3"],
-                "cybersecurity": ["security", "hack", "breach", "vulnerability"],
-                "mobile": ["smartphone", "ios", "android", "mobile app"],
-                "startups": ["funding", "venture capital", "ipo", "unicorn"],
-                "big tech": ["google", "apple", "microsoft", "amazon", "meta"]
-            }
-            
-            for topic, keywords in tech_topics.items():
-                if any(keyword in text for keyword in keywords):
-                    topics.append(topic)
+            # Topics are detected once at ingest and stored with the article features
+            topics = article_topics(article)
             
             return topics[:5]  # Return top 5 topics
             
@@ -0,0 +1,58 @@
+"""
+Checkpoint storage for long-running maintenance jobs
+Keeps progress in a small JSON file so interrupted runs can resume
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+class Checkpoint:
+    """Thread-safe JSON checkpoint file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state: Dict[str, Any] = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        """Load checkpoint state from disk"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable checkpoint {self.path}: {e}")
+            return {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get the saved progress for a key"""
+        with self._lock:
+            return self.state.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """Record progress for a key and flush it to disk"""
+        with self._lock:
+            self.state[key] = value
+            self._save()
+
+    def reset(self):
+        """Forget all saved progress"""
+        with self._lock:
+            self.state = {}
+            self._save()
+
+    def _save(self):
+        """Write state atomically so a crash never leaves a truncated file"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, default=str)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,107 @@
+"""
+Totals for paginated article queries
+Filter-only totals are summed from the hourly rollups (counted exactly if
+the rollups cannot be brought up to date). Totals involving a text
+match are cached per normalized filter set (cleared with the articles cache
+when articles are inserted or reprocessed) and, when the search backend
+would have to scan every row, estimated from a sample of recent articles and
+flagged as approximate.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..database import Article
+from .query_parser import parse_query
+from .redis_cache import cache
+from .rollups import count_matching
+from .search_backend import search_backend
+from .timeutil import to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+COUNT_TTL = 600  # seconds
+# Recent articles used to estimate the selectivity of a scanning text match
+ESTIMATE_SAMPLE = 2000
+
+EQUALITY_FILTERS = ("category", "source", "sentiment")
+
+def text_key(text: str) -> str:
+    """Equal for text queries that match the same articles"""
+    plan = parse_query(text)
+    return plan.key if plan else " ".join(text.lower().split())
+
+def normalize_filters(filters: Dict) -> Dict:
+    """Filters without empty values, with comparable dates and text"""
+    normalized = {}
+    for name, value in filters.items():
+        if value in (None, "", ()):
+            continue
+        if isinstance(value, datetime):
+            value = to_naive_utc(value).isoformat()
+        elif name == "text":
+            value = sorted({text_key(text) for text in value if text and text.strip()})
+            if not value:
+                continue
+        normalized[name] = value
+    return normalized
+
+def count_key(filters: Dict) -> str:
+    digest = hashlib.sha1(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+    # Under articles: so CacheInvalidator.invalidate_articles() clears counts too
+    return f"articles:count:{digest}"
+
+def filtered_query(db: Session, filters: Dict, *columns):
+    query = db.query(*columns)
+    for name in EQUALITY_FILTERS:
+        if filters.get(name):
+            query = query.filter(getattr(Article, name) == filters[name])
+    if filters.get("date_from"):
+        query = query.filter(Article.published_at >= filters["date_from"])
+    if filters.get("date_to"):
+        query = query.filter(Article.published_at <= filters["date_to"])
+    return query
+
+def with_text(query, filters: Dict):
+    for text in filters.get("text") or ():
+        if text and text.strip():
+            query = search_backend.filter(query, text)
+    return query
+
+def estimate_text_count(db: Session, filters: Dict, base_total: int) -> Tuple[int, bool]:
+    """Scale the match rate among the most recent articles up to all articles matching the other filters"""
+    sample = filtered_query(db, filters, Article.id).order_by(
+        Article.published_at.desc()
+    ).limit(ESTIMATE_SAMPLE).subquery()
+    sample_size = db.query(func.count()).select_from(sample).scalar()
+    matches = with_text(db.query(Article.id).filter(Article.id.in_(db.query(sample.c.id))), filters).count()
+
+    if sample_size >= base_total:
+        return matches, False
+    return round(base_total * matches / max(sample_size, 1)), True
+
+def count_articles(db: Session, filters: Dict, allow_estimate: bool = True) -> Tuple[int, bool]:
+    """(total, approximate) for category/source/sentiment, an inclusive date range and every `text` match"""
+    base_total = count_matching(db, **{name: filters.get(name) for name in (*EQUALITY_FILTERS, "date_from", "date_to")})
+    normalized = normalize_filters(filters)
+    if not normalized.get("text") or base_total == 0:
+        return base_total, False
+
+    key = count_key(normalized)
+    cached_count = cache.get(key)
+    if cached_count is not None and (allow_estimate or not cached_count["approximate"]):
+        return cached_count["total"], cached_count["approximate"]
+
+    if allow_estimate and not search_backend.indexed:
+        total, approximate = estimate_text_count(db, filters, base_total)
+    else:
+        total, approximate = with_text(filtered_query(db, filters, Article.id), filters).count(), False
+
+    cache.set(key, {"total": total, "approximate": approximate}, ttl=COUNT_TTL)
+    return total, approximate
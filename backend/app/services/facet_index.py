@@ -0,0 +1,312 @@
+"""
+Bitmap facet index over article metadata
+Every category, source and sentiment value has a bitset over article ids
+(packed uint64 words, one bit per article) and publication dates are kept as
+a sorted array, so any filter combination is a few bitwise ANDs/ORs and
+facet counts are popcounts. Kept current at ingest and snapshotted to disk.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..database import Article
+from .incremental_index import IncrementalIndex
+from .inverted_index import NO_DATE, to_timestamp
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = os.getenv("FACET_INDEX_PATH", "./data/facet_index.npz")
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_EVERY = 1000  # new articles between snapshots
+
+FACET_FIELDS = ("category", "source", "sentiment")
+NO_VALUE = -1
+WORD = np.dtype("<u8")  # little-endian, so a uint8 view lists bits in article id order
+POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+def popcount(words: np.ndarray) -> int:
+    return int(POPCOUNT[words.view(np.uint8)].sum(dtype=np.int64))
+
+def set_bits(words: np.ndarray, ids: np.ndarray):
+    np.bitwise_or.at(words, ids >> 6, np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64)))
+
+def clear_bits(words: np.ndarray, ids: np.ndarray):
+    np.bitwise_and.at(words, ids >> 6, ~np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64)))
+
+def bit_ids(words: np.ndarray) -> np.ndarray:
+    """Article ids whose bits are set, ascending"""
+    return np.flatnonzero(np.unpackbits(words.view(np.uint8), bitorder="little"))
+
+class FacetIndex(IncrementalIndex):
+    """Per-value bitsets and a sorted date array for filtering and facet counts"""
+
+    name = "facet index"
+
+    def __init__(self, snapshot_path: str = SNAPSHOT_PATH):
+        super().__init__()
+        self.snapshot_path = snapshot_path
+        self.clear()
+
+    def clear(self):
+        self.words = 0  # length of every bitset
+        self.present = np.zeros(0, dtype=WORD)
+        self.values: Dict[str, List[str]] = {field: [] for field in FACET_FIELDS}
+        self.codes: Dict[str, Dict[str, int]] = {field: {} for field in FACET_FIELDS}
+        self.bitmaps: Dict[str, List[np.ndarray]] = {field: [] for field in FACET_FIELDS}
+        # Per-article value codes and dates, indexed by article id, to move bits when articles change
+        self.attributes = {field: np.zeros(0, dtype=np.int32) for field in FACET_FIELDS}
+        self.published = np.zeros(0, dtype=np.int64)
+        # Dated articles ordered by publication time
+        self.date_times = np.zeros(0, dtype=np.int64)
+        self.date_ids = np.zeros(0, dtype=np.int64)
+        self.attributes_synced_at = datetime.utcnow()
+        self._unsaved = 0
+
+    # Building
+
+    def load_rows(self, db, after_id: int, limit: int) -> Sequence:
+        return db.query(
+            Article.id, Article.category, Article.source, Article.sentiment, Article.published_at
+        ).filter(Article.id > after_id).order_by(Article.id).limit(limit).all()
+
+    def _ensure_capacity(self, max_id: int):
+        words = (max_id >> 6) + 1
+        if words <= self.words:
+            return
+        words = max(words, self.words * 2, 1024)
+        grow = words - self.words
+        self.present = np.concatenate([self.present, np.zeros(grow, dtype=WORD)])
+        for field in FACET_FIELDS:
+            self.bitmaps[field] = [np.concatenate([bitmap, np.zeros(grow, dtype=WORD)]) for bitmap in self.bitmaps[field]]
+            self.attributes[field] = np.concatenate([self.attributes[field], np.full(grow * 64, NO_VALUE, dtype=np.int32)])
+        self.published = np.concatenate([self.published, np.full(grow * 64, NO_DATE, dtype=np.int64)])
+        self.words = words
+
+    def _code(self, field: str, value: Optional[str]) -> int:
+        if value is None:
+            return NO_VALUE
+        codes = self.codes[field]
+        if value not in codes:
+            codes[value] = len(codes)
+            self.values[field].append(value)
+            self.bitmaps[field].append(np.zeros(self.words, dtype=WORD))
+        return codes[value]
+
+    def _insert_dates(self, ids: np.ndarray, times: np.ndarray):
+        dated = times != NO_DATE
+        ids, times = ids[dated], times[dated]
+        order = np.argsort(times, kind="stable")
+        positions = np.searchsorted(self.date_times, times[order], side="right")
+        self.date_times = np.insert(self.date_times, positions, times[order])
+        self.date_ids = np.insert(self.date_ids, positions, ids[order])
+
+    def _remove_dates(self, ids: np.ndarray):
+        keep = ~np.isin(self.date_ids, ids)
+        self.date_times, self.date_ids = self.date_times[keep], self.date_ids[keep]
+
+    def _set_values(self, ids: np.ndarray, rows: Sequence):
+        """Point the given articles at their field values (rows: category, source, sentiment)"""
+        for position, field in enumerate(FACET_FIELDS):
+            new_codes = np.fromiter((self._code(field, row[position]) for row in rows), dtype=np.int32, count=len(rows))
+            old_codes = self.attributes[field][ids]
+            for code in np.unique(old_codes[(old_codes != new_codes) & (old_codes != NO_VALUE)]):
+                clear_bits(self.bitmaps[field][code], ids[(old_codes == code) & (old_codes != new_codes)])
+            for code in np.unique(new_codes[new_codes != NO_VALUE]):
+                set_bits(self.bitmaps[field][code], ids[new_codes == code])
+            self.attributes[field][ids] = new_codes
+
+    def add_rows(self, rows: Sequence):
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        self._ensure_capacity(int(ids.max()))
+        self._set_values(ids, [row[1:4] for row in rows])
+        set_bits(self.present, ids)
+
+        times = np.fromiter((to_timestamp(row[4]) for row in rows), dtype=np.int64, count=len(rows))
+        self.published[ids] = times
+        self._insert_dates(ids, times)
+        self._unsaved += len(rows)
+
+    def refresh_attributes(self, db):
+        """Move bits for already indexed articles whose metadata changed (e.g. reprocessing)"""
+        synced_at = datetime.utcnow()
+        rows = db.query(
+            Article.id, Article.category, Article.source, Article.sentiment, Article.published_at
+        ).filter(
+            Article.updated_at > self.attributes_synced_at,
+            Article.id <= self.last_article_id
+        ).all()
+        if rows:
+            ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            self._set_values(ids, [row[1:4] for row in rows])
+            times = np.fromiter((to_timestamp(row[4]) for row in rows), dtype=np.int64, count=len(rows))
+            moved = self.published[ids] != times
+            if moved.any():
+                self._remove_dates(ids[moved])
+                self.published[ids[moved]] = times[moved]
+                self._insert_dates(ids[moved], times[moved])
+            self._unsaved += len(rows)
+        self.attributes_synced_at = synced_at
+
+    def sync(self, db, force: bool = False) -> int:
+        throttled = not force and self.loaded and time.monotonic() - self._last_sync < self.sync_interval
+        added = super().sync(db, force)
+        if not throttled:
+            with self._lock:
+                self.refresh_attributes(db)
+                if self._unsaved >= SNAPSHOT_EVERY:
+                    self.save_snapshot()
+        return added
+
+    def after_warm_up(self):
+        if self._unsaved:
+            self.save_snapshot()
+
+    # Querying
+
+    def _field_bitmap(self, field: str, values: Sequence[str]) -> np.ndarray:
+        """Articles having any of the values"""
+        bitmap = np.zeros(self.words, dtype=WORD)
+        for value in values:
+            code = self.codes[field].get(value)
+            if code is not None:
+                bitmap |= self.bitmaps[field][code]
+        return bitmap
+
+    def _date_bitmap(self, date_from: Optional[datetime], date_to: Optional[datetime]) -> np.ndarray:
+        start = np.searchsorted(self.date_times, to_timestamp(date_from), side="left") if date_from else 0
+        end = np.searchsorted(self.date_times, to_timestamp(date_to), side="right") if date_to else len(self.date_times)
+        bitmap = np.zeros(self.words, dtype=WORD)
+        set_bits(bitmap, self.date_ids[start:end])
+        return bitmap
+
+    def search(
+        self,
+        filters: Dict[str, Sequence[str]],
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[int], int, Dict[str, Dict[str, int]]]:
+        """Page of matching article ids (newest first), the total, and facet counts
+
+        Values within a field are ORed and fields are ANDed. Each field's counts
+        apply every filter except that field's own, so the UI can offer alternatives.
+        """
+        with self._lock:
+            field_bitmaps = {
+                field: self._field_bitmap(field, values) for field, values in filters.items() if values
+            }
+            base = self.present.copy()
+            if date_from or date_to:
+                base &= self._date_bitmap(date_from, date_to)
+
+            facets = {}
+            for field in FACET_FIELDS:
+                others = base.copy()
+                for other, bitmap in field_bitmaps.items():
+                    if other != field:
+                        others &= bitmap
+                counts = {
+                    value: popcount(others & self.bitmaps[field][code])
+                    for value, code in self.codes[field].items()
+                }
+                facets[field] = dict(sorted(
+                    ((value, count) for value, count in counts.items() if count), key=lambda item: (-item[1], item[0])
+                ))
+
+            for bitmap in field_bitmaps.values():
+                base &= bitmap
+            ids = bit_ids(base)
+            published = self.published[ids]
+
+        total = len(ids)
+        wanted = min(offset + limit, total)
+        if wanted <= offset:
+            return [], total, facets
+        if wanted < total:
+            # Keep every article tied with the cut-off so ids break the tie exactly
+            threshold = np.partition(published, total - wanted)[total - wanted]
+            top = published >= threshold
+            ids, published = ids[top], published[top]
+        order = np.lexsort((-ids, -published))
+        return [int(article_id) for article_id in ids[order][offset:wanted]], total, facets
+
+    # Snapshots
+
+    def save_snapshot(self):
+        """Write the index to disk atomically"""
+        with self._lock:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            meta = {
+                "format": SNAPSHOT_FORMAT,
+                "last_article_id": self.last_article_id,
+                "attributes_synced_at": self.attributes_synced_at.isoformat(),
+                "values": self.values,
+            }
+            arrays = {
+                f"bitmaps_{field}": np.vstack(self.bitmaps[field]) if self.bitmaps[field] else np.zeros((0, self.words), dtype=WORD)
+                for field in FACET_FIELDS
+            }
+            arrays.update({f"attribute_{field}": self.attributes[field] for field in FACET_FIELDS})
+            tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as snapshot_file:
+                np.savez(
+                    snapshot_file,
+                    meta=np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8),
+                    present=self.present,
+                    published=self.published,
+                    date_times=self.date_times,
+                    date_ids=self.date_ids,
+                    **arrays
+                )
+            os.replace(tmp_path, self.snapshot_path)
+            self._unsaved = 0
+        logger.info(f"💾 Saved {self.name} snapshot (up to id {self.last_article_id})")
+
+    def load_snapshot(self) -> bool:
+        """Restore the index from disk; returns False if there is no usable snapshot"""
+        if not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with np.load(self.snapshot_path) as snapshot:
+                meta = json.loads(snapshot["meta"].tobytes())
+                if meta["format"] != SNAPSHOT_FORMAT:
+                    logger.info(f"ℹ️  Ignoring {self.name} snapshot with a different format")
+                    return False
+
+                with self._lock:
+                    self.clear()
+                    self.present = snapshot["present"]
+                    self.words = len(self.present)
+                    self.published = snapshot["published"]
+                    self.date_times = snapshot["date_times"]
+                    self.date_ids = snapshot["date_ids"]
+                    for field in FACET_FIELDS:
+                        self.values[field] = meta["values"][field]
+                        self.codes[field] = {value: code for code, value in enumerate(self.values[field])}
+                        self.bitmaps[field] = list(snapshot[f"bitmaps_{field}"])
+                        self.attributes[field] = snapshot[f"attribute_{field}"]
+                    self.attributes_synced_at = datetime.fromisoformat(meta["attributes_synced_at"])
+                    self.last_article_id = meta["last_article_id"]
+                    self.loaded = True
+                    self._last_sync = 0.0
+        except Exception as e:
+            logger.error(f"❌ Failed to load {self.name} snapshot: {e}")
+            self.clear()
+            self.last_article_id = 0
+            self.loaded = False
+            return False
+
+        logger.info(f"📂 Loaded {self.name} snapshot (up to id {self.last_article_id})")
+        return True
+
+# Global index instance
+facet_index = FacetIndex()
@@ -0,0 +1,94 @@
+"""
+Per-article feature store
+Article text is parsed once at ingest; sentiment, categorization, trending and chat
+read the stored representation instead of re-tokenizing raw content.
+"""
+
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from ..database import Article, ArticleFeatures
+from .keyword_extractor import extract_keywords, extract_tech_phrases
+from .sentiment_analyzer import analyzer
+from .topics import match_keywords, detect_topics
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction rules change so stale rows are recomputed
+FEATURE_VERSION = 3
+
+# Term fields in trending weight order: tech phrases outrank single keywords, titles outrank content
+TERM_WEIGHTS = (
+    ("title_phrases", 5),
+    ("content_phrases", 3),
+    ("title_keywords", 2),
+    ("content_keywords", 1),
+)
+
+def extract_terms(title: str, content: Optional[str]) -> Dict[str, Dict[str, int]]:
+    """Extract keyword and phrase counts per field, preserving first-occurrence order"""
+    content = content or ""
+    return {
+        "title_phrases": dict(Counter(extract_tech_phrases(title))),
+        "content_phrases": dict(Counter(extract_tech_phrases(content))),
+        "title_keywords": dict(Counter(extract_keywords(title))),
+        "content_keywords": dict(Counter(extract_keywords(content))),
+    }
+
+def extract_features(title: str, content: Optional[str]) -> Dict:
+    """Compute the full feature set for one article"""
+    text = f"{title} {content or ''}"
+    counts = analyzer.count_lexicon_hits([text])[0]
+    category_hits, topics = match_keywords(text)
+
+    return {
+        "version": FEATURE_VERSION,
+        "text_length": len(text.strip()),
+        "lexicon_counts": [int(count) for count in counts],
+        "terms": extract_terms(title, content),
+        "topics": topics,
+        "category_hits": category_hits,
+    }
+
+def build_features(title: str, content: Optional[str]) -> ArticleFeatures:
+    """Create an ArticleFeatures row for an article that is about to be inserted"""
+    return ArticleFeatures(**extract_features(title, content))
+
+def is_current(features: Optional[ArticleFeatures]) -> bool:
+    """Check whether stored features exist and match the current extraction rules"""
+    return features is not None and features.version == FEATURE_VERSION
+
+def sentiment_from_features(features: Dict) -> str:
+    """Classify sentiment from stored lexicon counts"""
+    labels, _ = analyzer.labels_from_counts(
+        np.asarray([features["lexicon_counts"]], dtype=np.int64),
+        np.asarray([features["text_length"]])
+    )
+    return labels[0]
+
+def article_terms(article: Article) -> Dict[str, Dict[str, int]]:
+    """Stored terms for an article, falling back to extraction for rows without features"""
+    if is_current(article.features):
+        return article.features.terms
+    return extract_terms(article.title, article.content)
+
+def article_topics(article: Article) -> List[str]:
+    """Stored related topics for an article, falling back to detection"""
+    if is_current(article.features):
+        return list(article.features.topics or [])
+    return detect_topics(f"{article.title} {article.content or ''}")
+
+def weighted_term_counts(terms: Dict[str, Dict[str, int]]) -> Counter:
+    """Weighted term counts used for trending scores"""
+    weighted = Counter()
+    for field, weight in TERM_WEIGHTS:
+        for term, count in terms.get(field, {}).items():
+            weighted[term] += count * weight
+    return weighted
+
+def term_set(terms: Dict[str, Dict[str, int]]) -> Set[str]:
+    """All distinct terms of an article"""
+    return {term for field_terms in terms.values() for term in field_terms}
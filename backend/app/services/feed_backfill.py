@@ -0,0 +1,183 @@
+"""
+Historical backfill for RSS/Atom sources
+Walks paginated feed archives and loads older articles through the bulk insert path
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse, urlencode, parse_qsl, urlunparse
+
+import feedparser
+import requests
+
+from ..database import SessionLocal
+from .checkpoint import Checkpoint
+from .rss_aggregator import RSSAggregator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PATH = os.getenv("BACKFILL_CHECKPOINT", "./data/backfill_checkpoint.json")
+
+class HostRateLimiter:
+    """Enforce a minimum delay between requests to the same host"""
+
+    def __init__(self, requests_per_second: float = 1.0):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str):
+        """Block until a request to the URL's host is allowed"""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+class FeedBackfiller:
+    """Load historical articles from paginated feeds (Atom rel=next, WordPress ?paged=N)"""
+
+    def __init__(
+        self,
+        aggregator: RSSAggregator,
+        max_workers: int = 8,
+        requests_per_second: float = 1.0,
+        max_pages: int = 100,
+        extract_content: bool = False,
+        checkpoint_path: str = DEFAULT_CHECKPOINT_PATH
+    ):
+        self.aggregator = aggregator
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.extract_content = extract_content
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.timeout = 30
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (compatible; TechNewsAggregator/1.0; +backfill)',
+            'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8',
+        }
+        # SQLite allows a single writer, so inserts are serialized across workers
+        self._write_lock = threading.Lock()
+
+    def fetch_page(self, url: str):
+        """Fetch and parse one feed page, respecting the per-host rate limit"""
+        self.rate_limiter.wait(url)
+        response = requests.get(url, headers=self.headers, timeout=self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return feedparser.parse(response.content)
+
+    @staticmethod
+    def wordpress_page_url(feed_url: str, page: int) -> str:
+        """Build the WordPress archive URL for a page (?paged=N)"""
+        parsed = urlparse(feed_url)
+        query = [(k, v) for k, v in parse_qsl(parsed.query) if k != 'paged']
+        query.append(('paged', str(page)))
+        return urlunparse(parsed._replace(query=urlencode(query)))
+
+    def next_page_url(self, feed, feed_url: str, page_url: str, page: int) -> Optional[str]:
+        """Find the URL of the next archive page, if the feed supports pagination"""
+        # Atom / RFC 5005 paging
+        for link in feed.feed.get('links', []):
+            if link.get('rel') == 'next' and link.get('href'):
+                return urljoin(page_url, link['href'])
+
+        # WordPress feeds accept ?paged=N
+        generator = feed.feed.get('generator', '') or ''
+        if 'wordpress' in generator.lower() or 'paged=' in page_url:
+            return self.wordpress_page_url(feed_url, page + 1)
+
+        return None
+
+    def backfill_source(self, source_name: str, source_config: Dict) -> int:
+        """Walk one source's archive pages until they run out or max_pages is reached"""
+        feed_url = source_config['url']
+        progress = self.checkpoint.get(source_name) or {}
+        if progress.get('done'):
+            logger.info(f"⏭️ Backfill already completed for {source_name}")
+            return 0
+
+        page = progress.get('page', 1)
+        page_url = progress.get('next_url') or feed_url
+        seen_pages = set()
+        total_inserted = 0
+        db = SessionLocal()
+
+        try:
+            while page_url and page <= self.max_pages:
+                try:
+                    feed = self.fetch_page(page_url)
+                except Exception as e:
+                    logger.warning(f"⚠️ Stopping backfill for {source_name} at page {page}: {e}")
+                    break
+
+                if feed is None or not feed.entries:
+                    self.checkpoint.set(source_name, {'page': page, 'next_url': None, 'done': True})
+                    break
+
+                entries = self.aggregator.parse_feed_entries(source_name, feed)
+                page_signature = tuple(sorted(entry['url'] for entry in entries))
+                if page_signature in seen_pages:
+                    # Server ignored the page parameter and returned the same items again
+                    self.checkpoint.set(source_name, {'page': page, 'next_url': None, 'done': True})
+                    break
+                seen_pages.add(page_signature)
+
+                existing_urls = self.aggregator.get_existing_urls(db, [entry['url'] for entry in entries])
+                articles = [
+                    self.aggregator.process_article(entry, extract_content=self.extract_content)
+                    for entry in entries
+                    if entry['url'] and entry['url'] not in existing_urls
+                ]
+
+                with self._write_lock:
+                    inserted = self.aggregator.save_articles(db, articles)
+                total_inserted += len(inserted)
+                logger.info(f"📚 {source_name} page {page}: {len(inserted)} new of {len(entries)} entries")
+
+                next_url = self.next_page_url(feed, feed_url, page_url, page)
+                page += 1
+                self.checkpoint.set(source_name, {
+                    'page': page,
+                    'next_url': next_url,
+                    'done': next_url is None
+                })
+                page_url = next_url
+        finally:
+            db.close()
+
+        return total_inserted
+
+    def run(self, source_names: Optional[List[str]] = None) -> int:
+        """Backfill the selected sources (all by default) in parallel"""
+        sources = {
+            name: config for name, config in self.aggregator.sources.items()
+            if not source_names or name in source_names
+        }
+        total_inserted = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.backfill_source, name, config): name
+                for name, config in sources.items()
+            }
+            for future in as_completed(futures):
+                source_name = futures[future]
+                try:
+                    inserted = future.result()
+                    total_inserted += inserted
+                    logger.info(f"✅ Backfill finished for {source_name}: {inserted} articles")
+                except Exception as e:
+                    logger.error(f"❌ Backfill failed for {source_name}: {e}")
+
+        logger.info(f"Backfill completed. Added {total_inserted} historical articles.")
+        return total_inserted
@@ -0,0 +1,252 @@
+"""
+Columnar in-memory hot set of recent article metadata
+Articles published in the last few days, which most list and analytics
+requests ask for, are held as NumPy columns in recency order: ids, publication
+times, category/source/sentiment codes and titles (one byte buffer plus
+offsets). Filters become vectorized masks, pages are slices, and only the
+handful of articles actually returned are loaded from the database.
+"""
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..database import Article
+from .incremental_index import IncrementalIndex
+from .inverted_index import to_timestamp
+from .timeutil import to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+HOT_SET_DAYS = int(os.getenv("HOT_SET_DAYS", "7"))
+
+HOT_FIELDS = ("category", "source", "sentiment")
+NO_VALUE = -1
+
+class HotColumns(NamedTuple):
+    """One immutable generation of the hot set, newest article first"""
+    ids: np.ndarray  # int64
+    published: np.ndarray  # int64 microseconds since the epoch
+    category: np.ndarray  # int32 value codes, NO_VALUE for NULL
+    source: np.ndarray
+    sentiment: np.ndarray
+    title_offsets: np.ndarray  # int64, len(ids) + 1
+    titles: np.ndarray  # uint8 UTF-8 bytes of every title
+
+    def take(self, positions: np.ndarray) -> "HotColumns":
+        """The rows at positions, in that order"""
+        starts = self.title_offsets[:-1][positions]
+        lengths = self.title_offsets[1:][positions] - starts
+        offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Byte i of the new buffer comes from its row's start plus its distance into the row
+        byte_positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1], dtype=np.int64)
+        return HotColumns(
+            self.ids[positions],
+            self.published[positions],
+            self.category[positions],
+            self.source[positions],
+            self.sentiment[positions],
+            offsets,
+            self.titles[byte_positions]
+        )
+
+def empty_columns() -> HotColumns:
+    codes = np.zeros(0, dtype=np.int32)
+    return HotColumns(
+        np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), codes, codes, codes,
+        np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+    )
+
+def concat_columns(first: HotColumns, second: HotColumns) -> HotColumns:
+    return HotColumns(
+        *(np.concatenate([a, b]) for a, b in zip(first[:5], second[:5])),
+        np.concatenate([first.title_offsets, second.title_offsets[1:] + first.title_offsets[-1]]),
+        np.concatenate([first.titles, second.titles])
+    )
+
+class HotSet(IncrementalIndex):
+    """Recent article metadata as NumPy columns for vectorized filtering and counting"""
+
+    name = "hot set"
+
+    def __init__(self, days: int = HOT_SET_DAYS):
+        super().__init__()
+        self.window = timedelta(days=days)
+        self.clear()
+
+    def clear(self):
+        self.columns = empty_columns()
+        self.values: Dict[str, List[str]] = {field: [] for field in HOT_FIELDS}
+        self.codes: Dict[str, Dict[str, int]] = {field: {} for field in HOT_FIELDS}
+        # Every article published at or after window_start is held
+        self.window_start = datetime.utcnow() - self.window
+        self.attributes_synced_at = datetime.utcnow()
+        self._pending: List[Sequence] = []
+
+    # Building
+
+    def _query(self, db):
+        return db.query(
+            Article.id, Article.published_at, Article.category, Article.source, Article.sentiment, Article.title
+        )
+
+    def load_rows(self, db, after_id: int, limit: int) -> Sequence:
+        # Articles older than the window (e.g. backfills) can never enter it, so they are skipped for good
+        return self._query(db).filter(
+            Article.id > after_id,
+            Article.published_at >= self.window_start
+        ).order_by(Article.id).limit(limit).all()
+
+    def add_rows(self, rows: Sequence):
+        self._pending.extend(rows)
+
+    def _code(self, field: str, value: Optional[str]) -> int:
+        if value is None:
+            return NO_VALUE
+        codes = self.codes[field]
+        if value not in codes:
+            codes[value] = len(codes)
+            self.values[field].append(value)
+        return codes[value]
+
+    def _columns_for(self, rows: Sequence) -> HotColumns:
+        count = len(rows)
+        titles = [(row[5] or "").encode() for row in rows]
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum([len(title) for title in titles], out=offsets[1:])
+        return HotColumns(
+            np.fromiter((row[0] for row in rows), dtype=np.int64, count=count),
+            np.fromiter((to_timestamp(row[1]) for row in rows), dtype=np.int64, count=count),
+            *(
+                np.fromiter((self._code(field, row[position]) for row in rows), dtype=np.int32, count=count)
+                for position, field in enumerate(HOT_FIELDS, start=2)
+            ),
+            offsets,
+            np.frombuffer(b"".join(titles), dtype=np.uint8)
+        )
+
+    def after_sync(self):
+        """Merge pending rows, drop rows that aged out, and swap in the new generation"""
+        now = datetime.utcnow()
+        window_start = max(self.window_start, now - self.window)
+        pending, self._pending = self._pending, []
+        if not pending and window_start - self.window_start < timedelta(hours=1):
+            return
+
+        columns = self.columns
+        if pending:
+            pending_ids = np.fromiter((row[0] for row in pending), dtype=np.int64, count=len(pending))
+            # Re-read rows replace the stored ones
+            columns = columns.take(np.flatnonzero(~np.isin(columns.ids, pending_ids)))
+            columns = concat_columns(columns, self._columns_for(pending))
+
+        keep = columns.published >= to_timestamp(window_start)
+        # Recency order (newest first, then highest id), as RECENCY_ORDER in the database
+        order = np.lexsort((-columns.ids[keep], -columns.published[keep]))
+        self.columns = columns.take(np.flatnonzero(keep)[order])
+        self.window_start = window_start
+
+    def refresh_attributes(self, db):
+        """Re-read held or newly in-window articles whose metadata changed (e.g. reprocessing)"""
+        synced_at = datetime.utcnow()
+        rows = self._query(db).filter(
+            Article.updated_at > self.attributes_synced_at,
+            Article.id <= self.last_article_id
+        ).all()
+        if rows:
+            # Out-of-window rows still go through the merge, which drops any stale copy
+            self._pending.extend(rows)
+            self.after_sync()
+        self.attributes_synced_at = synced_at
+
+    def sync(self, db, force: bool = False) -> int:
+        throttled = not force and self.loaded and time.monotonic() - self._last_sync < self.sync_interval
+        added = super().sync(db, force)
+        if not throttled:
+            with self._lock:
+                self.refresh_attributes(db)
+        return added
+
+    # Querying
+
+    def covers(self, since: Optional[datetime]) -> bool:
+        """Whether every article published at or after `since` is held"""
+        return self.loaded and since is not None and to_naive_utc(since) >= self.window_start
+
+    def mask(
+        self,
+        columns: HotColumns,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> np.ndarray:
+        """Rows matching every given filter (dates inclusive)"""
+        selected = np.ones(len(columns.ids), dtype=bool)
+        for field, value in zip(HOT_FIELDS, (category, source, sentiment)):
+            if value:
+                code = self.codes[field].get(value)
+                if code is None:
+                    return np.zeros(len(columns.ids), dtype=bool)
+                selected &= getattr(columns, field) == code
+        if date_from:
+            selected &= columns.published >= to_timestamp(date_from)
+        if date_to:
+            selected &= columns.published <= to_timestamp(date_to)
+        return selected
+
+    def page(
+        self,
+        filters: Dict,
+        after: Optional[Tuple[datetime, int]],
+        offset: int,
+        limit: int
+    ) -> Optional[Tuple[List[int], Optional[int]]]:
+        """Ids of up to `limit` matches after `offset` (or the keyset position `after`), newest first,
+        and the exact total when every match is held; None when the page reaches past the window"""
+        columns = self.columns
+        selected = self.mask(columns, **filters)
+        complete = self.covers(filters.get("date_from"))
+        total = int(np.count_nonzero(selected)) if complete else None
+
+        if after is not None:
+            published_at, article_id = after
+            published = to_timestamp(published_at)
+            selected &= (columns.published < published) | ((columns.published == published) & (columns.ids < article_id))
+
+        positions = np.flatnonzero(selected)
+        if len(positions) < offset + limit and not complete:
+            return None
+        return columns.ids[positions[offset:offset + limit]].tolist(), total
+
+    def count_by(self, dimension: str, since: datetime) -> List[Tuple[str, int]]:
+        """Article counts per value of a dimension (non-NULL), published since `since`, largest first"""
+        columns = self.columns
+        codes = getattr(columns, dimension)[columns.published >= to_timestamp(since)]
+        counts = np.bincount(codes[codes != NO_VALUE], minlength=len(self.values[dimension]))
+        values = self.values[dimension]
+        order = np.argsort(-counts, kind="stable")
+        return [(values[code], int(counts[code])) for code in order if counts[code]]
+
+    def titles(self, article_ids: Sequence[int]) -> Dict[int, str]:
+        """Titles of the held articles among article_ids"""
+        columns = self.columns
+        by_id = np.argsort(columns.ids)
+        wanted = np.asarray(article_ids, dtype=np.int64)
+        slots = np.minimum(np.searchsorted(columns.ids, wanted, sorter=by_id), max(len(by_id) - 1, 0))
+        result = {}
+        for article_id, slot in zip(wanted.tolist(), slots.tolist()):
+            if len(by_id) and columns.ids[by_id[slot]] == article_id:
+                position = by_id[slot]
+                start, end = columns.title_offsets[position], columns.title_offsets[position + 1]
+                result[article_id] = columns.titles[start:end].tobytes().decode()
+        return result
+
+# Global hot set instance
+hot_set = HotSet()
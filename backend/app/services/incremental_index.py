@@ -0,0 +1,126 @@
+"""
+Base class for in-process indexes that follow the articles table
+Each index remembers the highest article id it has seen and catches up with
+a cheap primary-key range query, so API workers pick up articles inserted by
+the ingestion job without re-reading the corpus.
+"""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+
+from ..database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Indexes created in this process, so ingestion can bring loaded ones up to date
+_registered_indexes: List["IncrementalIndex"] = []
+
+class IncrementalIndex(ABC):
+    """Article-id high-water-mark synchronization shared by in-process indexes"""
+
+    name = "index"
+    sync_interval = 30  # seconds between catch-up queries on the read path
+    batch_size = 5000
+
+    def __init__(self):
+        self.last_article_id = 0
+        self.loaded = False
+        self._last_sync = 0.0
+        self._lock = threading.RLock()
+        self._warmup_thread: Optional[threading.Thread] = None
+        _registered_indexes.append(self)
+
+    @abstractmethod
+    def load_rows(self, db, after_id: int, limit: int) -> Sequence:
+        """Return up to `limit` rows with article id > after_id, ordered by id (first column)"""
+
+    @abstractmethod
+    def add_rows(self, rows: Sequence):
+        """Add a batch of rows returned by load_rows to the index"""
+
+    @abstractmethod
+    def clear(self):
+        """Drop all indexed data"""
+
+    def after_sync(self):
+        """Hook for housekeeping once new rows have been added"""
+
+    def load_snapshot(self) -> bool:
+        """Restore the index from disk, for indexes that persist themselves; returns whether it did"""
+        return False
+
+    def after_warm_up(self):
+        """Hook run once a background warm-up has caught up"""
+
+    def sync(self, db, force: bool = False) -> int:
+        """Index articles inserted since the last sync; returns the number of new rows"""
+        now = time.monotonic()
+        if not force and self.loaded and now - self._last_sync < self.sync_interval:
+            return 0
+
+        added = 0
+        with self._lock:
+            while True:
+                rows = self.load_rows(db, self.last_article_id, self.batch_size)
+                if not rows:
+                    break
+                self.add_rows(rows)
+                self.last_article_id = rows[-1][0]
+                added += len(rows)
+                if len(rows) < self.batch_size:
+                    break
+            self.after_sync()
+            self.loaded = True
+            self._last_sync = time.monotonic()
+
+        if added:
+            logger.info(f"📇 {self.name}: indexed {added} new articles (up to id {self.last_article_id})")
+        return added
+
+    def rebuild(self, db) -> int:
+        """Discard everything and index the corpus from scratch"""
+        with self._lock:
+            self.clear()
+            self.last_article_id = 0
+            self.loaded = False
+            return self.sync(db, force=True)
+
+    def ready(self, db) -> bool:
+        """Catch up if loaded; otherwise start loading in the background and report not ready"""
+        if self.loaded:
+            self.sync(db)
+            return True
+        self.warm_up()
+        return False
+
+    def warm_up(self):
+        """Load the snapshot (if any) and catch up in a background thread"""
+        with self._lock:
+            if self.loaded or (self._warmup_thread and self._warmup_thread.is_alive()):
+                return
+            self._warmup_thread = threading.Thread(target=self._warm_up, name=f"{self.name} warm-up", daemon=True)
+            self._warmup_thread.start()
+
+    def _warm_up(self):
+        db = SessionLocal()
+        try:
+            with self._lock:
+                self.load_snapshot()
+                self.sync(db, force=True)
+                self.after_warm_up()
+        except Exception as e:
+            logger.error(f"❌ Failed to build {self.name}: {e}")
+        finally:
+            db.close()
+
+def sync_loaded_indexes(db):
+    """Bring every index that is already in use in this process up to date"""
+    for index in _registered_indexes:
+        if index.loaded:
+            try:
+                index.sync(db, force=True)
+            except Exception as e:
+                logger.error(f"❌ Failed to sync {index.name}: {e}")
@@ -0,0 +1,476 @@
+"""
+In-process inverted index for article search
+Keeps search fast without a database full-text index (e.g. SQLite built
+without FTS5). Postings are delta-encoded article ids with term frequencies
+in compact arrays, plus token positions for phrase matching. Query plans
+(see query_parser) are evaluated with intersections rarest term first,
+scored with BM25 (title-boosted) and filtered on per-article attribute arrays. The index grows as articles are ingested and
+is snapshotted to disk so restarts only index what is new.
+"""
+
+import json
+import logging
+import os
+import time
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..database import Article
+from .incremental_index import IncrementalIndex
+from .query_parser import And, Attribute, Node, Not, Or, Phrase, Term, parse_query, tokenize
+from .search_backend import search_backend
+from .timeutil import EPOCH, to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+# "auto": use the index only when the database has no ready full-text index
+SEARCH_ENGINE = os.getenv("SEARCH_ENGINE", "auto")
+SNAPSHOT_PATH = os.getenv("SEARCH_INDEX_PATH", "./data/search_index.npz")
+# Content is indexed up to this many characters to bound memory per worker
+CONTENT_CHARS = int(os.getenv("SEARCH_INDEX_CONTENT_CHARS", "3000"))
+
+SNAPSHOT_FORMAT = 3
+SNAPSHOT_EVERY = 1000  # new articles between snapshots
+
+# BM25 parameters; title terms count as several body occurrences
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_BOOST = 3
+
+# Positions are stored as uint16; tokens past the last one are not positioned
+MAX_POSITION = 65535
+POSITION_BITS = 16
+
+FILTER_FIELDS = ("category", "source", "sentiment")
+NO_VALUE = -1
+NO_DATE = -(2 ** 62)  # sorts last when ordering by -published
+EMPTY_IDS = np.zeros(0, dtype=np.int64)
+MICROSECOND = timedelta(microseconds=1)
+
+def to_timestamp(value: Optional[datetime]) -> int:
+    """Microseconds since the epoch, so in-memory order matches the database's"""
+    return NO_DATE if value is None else (to_naive_utc(value) - EPOCH) // MICROSECOND
+
+class InvertedIndex(IncrementalIndex):
+    """BM25 inverted index over article titles, summaries and content"""
+
+    name = "search index"
+    batch_size = 1000  # rows carry article bodies
+
+    def __init__(self, snapshot_path: str = SNAPSHOT_PATH):
+        super().__init__()
+        self.snapshot_path = snapshot_path
+        self.clear()
+
+    def clear(self):
+        self.term_ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.deltas: List[array] = []  # per term: article id gaps
+        self.frequencies: List[array] = []  # per term: weighted term frequency (capped at 255)
+        self.positions: List[array] = []  # per term: token positions of each posting, concatenated
+        self.position_counts: List[array] = []  # per term: number of positions of each posting
+        self.last_doc: List[int] = []  # per term: last article id, to encode the next gap
+
+        # Per-article arrays indexed by article id
+        self.doc_length = np.zeros(0, dtype=np.float32)
+        self.title_length = np.zeros(0, dtype=np.uint16)  # title tokens come first, at positions 0..n-1
+        self.attributes = {field: np.zeros(0, dtype=np.int32) for field in FILTER_FIELDS}
+        self.published = np.zeros(0, dtype=np.int64)
+        self.codes: Dict[str, Dict[str, int]] = {field: {} for field in FILTER_FIELDS}
+
+        self.doc_count = 0
+        self.total_length = 0.0
+        self.attributes_synced_at = datetime.utcnow()
+        self._unsaved = 0
+
+    # Building
+
+    def load_rows(self, db, after_id: int, limit: int) -> Sequence:
+        return db.query(
+            Article.id, Article.title, Article.summary, Article.content,
+            Article.category, Article.source, Article.sentiment, Article.published_at
+        ).filter(Article.id > after_id).order_by(Article.id).limit(limit).all()
+
+    def _ensure_capacity(self, article_id: int):
+        size = len(self.doc_length)
+        if article_id < size:
+            return
+        new_size = max(article_id + 1, size * 2, 1024)
+        self.doc_length = np.concatenate([self.doc_length, np.zeros(new_size - size, dtype=np.float32)])
+        self.title_length = np.concatenate([self.title_length, np.zeros(new_size - size, dtype=np.uint16)])
+        for field in FILTER_FIELDS:
+            self.attributes[field] = np.concatenate([
+                self.attributes[field], np.full(new_size - size, NO_VALUE, dtype=np.int32)
+            ])
+        self.published = np.concatenate([self.published, np.full(new_size - size, NO_DATE, dtype=np.int64)])
+
+    def _code(self, field: str, value: Optional[str]) -> int:
+        if value is None:
+            return NO_VALUE
+        codes = self.codes[field]
+        if value not in codes:
+            codes[value] = len(codes)
+        return codes[value]
+
+    def _set_attributes(self, article_id: int, category, source, sentiment, published_at):
+        for field, value in zip(FILTER_FIELDS, (category, source, sentiment)):
+            self.attributes[field][article_id] = self._code(field, value)
+        self.published[article_id] = to_timestamp(published_at)
+
+    def add_rows(self, rows: Sequence):
+        for article_id, title, summary, content, category, source, sentiment, published_at in rows:
+            self._ensure_capacity(article_id)
+
+            frequencies = Counter()
+            positions = defaultdict(list)
+            position = 0
+            for weight, text in ((TITLE_BOOST, title), (1, summary), (1, (content or "")[:CONTENT_CHARS])):
+                for token in tokenize(text):
+                    frequencies[token] += weight
+                    if position <= MAX_POSITION:
+                        positions[token].append(position)
+                    position += 1
+                if weight == TITLE_BOOST:
+                    self.title_length[article_id] = min(position, MAX_POSITION)
+                position += 1  # so phrases never span two fields
+
+            for term, frequency in frequencies.items():
+                term_id = self.term_ids.get(term)
+                if term_id is None:
+                    term_id = len(self.terms)
+                    self.term_ids[term] = term_id
+                    self.terms.append(term)
+                    self.deltas.append(array('I'))
+                    self.frequencies.append(array('B'))
+                    self.positions.append(array('H'))
+                    self.position_counts.append(array('H'))
+                    self.last_doc.append(0)
+                # Rows arrive in ascending id order, so gaps are positive
+                self.deltas[term_id].append(article_id - self.last_doc[term_id])
+                self.frequencies[term_id].append(min(frequency, 255))
+                term_positions = positions[term]
+                self.positions[term_id].extend(term_positions)
+                self.position_counts[term_id].append(len(term_positions))
+                self.last_doc[term_id] = article_id
+
+            length = float(sum(frequencies.values()))
+            self.doc_length[article_id] = length
+            self.total_length += length
+            self.doc_count += 1
+            self._set_attributes(article_id, category, source, sentiment, published_at)
+
+        self._unsaved += len(rows)
+
+    def refresh_attributes(self, db):
+        """Pick up category/sentiment changes made to already indexed articles (e.g. reprocessing)"""
+        synced_at = datetime.utcnow()
+        rows = db.query(
+            Article.id, Article.category, Article.source, Article.sentiment, Article.published_at
+        ).filter(
+            Article.updated_at > self.attributes_synced_at,
+            Article.id <= self.last_article_id
+        ).all()
+        for article_id, category, source, sentiment, published_at in rows:
+            self._set_attributes(article_id, category, source, sentiment, published_at)
+        self.attributes_synced_at = synced_at
+
+    def sync(self, db, force: bool = False) -> int:
+        throttled = not force and self.loaded and time.monotonic() - self._last_sync < self.sync_interval
+        added = super().sync(db, force)
+        if not throttled:
+            with self._lock:
+                self.refresh_attributes(db)
+                if self._unsaved >= SNAPSHOT_EVERY:
+                    self.save_snapshot()
+        return added
+
+    # Serving
+
+    def serves_queries(self) -> bool:
+        """Whether /api/search should use this index (per SEARCH_ENGINE)"""
+        if SEARCH_ENGINE == "index":
+            return True
+        if SEARCH_ENGINE == "auto":
+            return not search_backend.indexed
+        return False
+
+    def after_warm_up(self):
+        if self._unsaved:
+            self.save_snapshot()
+
+    def _postings(self, term_id: int, memo: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """(article ids, term frequencies) of a term, decoded once per query"""
+        if term_id not in memo:
+            ids = np.frombuffer(self.deltas[term_id], dtype=np.uint32).astype(np.int64).cumsum()
+            memo[term_id] = ids, np.frombuffer(self.frequencies[term_id], dtype=np.uint8).astype(np.float32)
+        return memo[term_id]
+
+    def _position_keys(self, term_id: int, ids: np.ndarray, memo: Dict, shift: int = 0) -> np.ndarray:
+        """Sorted (article id, position - shift) keys of the term's occurrences in the given articles"""
+        term_ids_array, _ = self._postings(term_id, memo)
+        counts = np.frombuffer(self.position_counts[term_id], dtype=np.uint16).astype(np.int64)
+        _, selected, _ = np.intersect1d(term_ids_array, ids, assume_unique=True, return_indices=True)
+        starts = np.concatenate([[0], np.cumsum(counts)])[selected]
+        lengths = counts[selected]
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        positions = np.frombuffer(self.positions[term_id], dtype=np.uint16).astype(np.int64)
+        positions = positions[np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])]
+        articles = np.repeat(term_ids_array[selected], lengths)
+        usable = positions >= shift
+        return (articles[usable] << POSITION_BITS) | (positions[usable] - shift)
+
+    def _estimate(self, node: Node) -> int:
+        """Rough number of matches, to evaluate the most selective operands first"""
+        if isinstance(node, Term):
+            term_id = self.term_ids.get(node.token)
+            return 0 if term_id is None else len(self.deltas[term_id])
+        if isinstance(node, Phrase):
+            return min(self._estimate(Term(token, None, token)) for token in node.tokens)
+        if isinstance(node, And):
+            return min((self._estimate(child) for child in node.children if not isinstance(child, Not)), default=self.doc_count)
+        if isinstance(node, Or):
+            return sum(self._estimate(child) for child in node.children)
+        return self.doc_count
+
+    def _all_articles(self) -> np.ndarray:
+        return np.flatnonzero(self.doc_length > 0)
+
+    def _attribute_codes(self, node: Attribute) -> List[int]:
+        return [code for value, code in self.codes[node.field].items() if value.lower() == node.value]
+
+    def _match(self, node: Node, memo: Dict) -> np.ndarray:
+        """Sorted ids of the articles matching a plan node"""
+        if isinstance(node, Term):
+            term_id = self.term_ids.get(node.token)
+            if term_id is None:
+                return EMPTY_IDS
+            ids, _ = self._postings(term_id, memo)
+            if node.field == "title":
+                keys = self._position_keys(term_id, ids, memo)
+                articles = keys >> POSITION_BITS
+                ids = np.unique(articles[(keys & MAX_POSITION) < self.title_length[articles]])
+            return ids
+        if isinstance(node, Phrase):
+            return self._match_phrase(node, memo)
+        if isinstance(node, Attribute):
+            return np.flatnonzero(np.isin(self.attributes[node.field], self._attribute_codes(node)))
+        if isinstance(node, Or):
+            ids = EMPTY_IDS
+            for child in node.children:
+                ids = np.union1d(ids, self._match(child, memo))
+            return ids
+        if isinstance(node, Not):
+            return np.setdiff1d(self._all_articles(), self._match(node.child, memo), assume_unique=True)
+
+        # AND: text operands smallest first, then attribute masks, then exclusions
+        excluded = [child.child for child in node.children if isinstance(child, Not)]
+        attributes = [child for child in node.children if isinstance(child, Attribute)]
+        operands = sorted(
+            (child for child in node.children if not isinstance(child, (Not, Attribute))), key=self._estimate
+        )
+        ids = None
+        for operand in operands:
+            operand_ids = self._match(operand, memo)
+            ids = operand_ids if ids is None else np.intersect1d(ids, operand_ids, assume_unique=True)
+            if not len(ids):
+                return ids
+        if ids is None:
+            ids = self._match(attributes.pop(), memo) if attributes else self._all_articles()
+        for attribute in attributes:
+            ids = ids[np.isin(self.attributes[attribute.field][ids], self._attribute_codes(attribute))]
+        for child in excluded:
+            if not len(ids):
+                break
+            ids = np.setdiff1d(ids, self._match(child, memo), assume_unique=True)
+        return ids
+
+    def _match_phrase(self, node: Phrase, memo: Dict) -> np.ndarray:
+        term_ids = [self.term_ids.get(token) for token in node.tokens]
+        if None in term_ids:
+            return EMPTY_IDS
+
+        # Articles containing every word, rarest word first
+        ids = None
+        for term_id in sorted(set(term_ids), key=lambda term_id: len(self.deltas[term_id])):
+            term_ids_array, _ = self._postings(term_id, memo)
+            ids = term_ids_array if ids is None else np.intersect1d(ids, term_ids_array, assume_unique=True)
+            if not len(ids):
+                return ids
+
+        # Phrase starts: positions where every word sits at its offset in the phrase
+        starts = None
+        for offset, term_id in enumerate(term_ids):
+            keys = self._position_keys(term_id, ids, memo, shift=offset)
+            starts = keys if starts is None else np.intersect1d(starts, keys, assume_unique=True)
+            if not len(starts):
+                return EMPTY_IDS
+
+        articles = starts >> POSITION_BITS
+        if node.field == "title":
+            articles = articles[(starts & MAX_POSITION) + len(term_ids) <= self.title_length[articles]]
+        return np.unique(articles)
+
+    def _scores(self, ids: np.ndarray, terms: Sequence[str], memo: Dict) -> np.ndarray:
+        """BM25 of the matched articles over the query's positive terms"""
+        scores = np.zeros(len(ids), dtype=np.float32)
+        average_length = self.total_length / max(self.doc_count, 1)
+        for term in terms:
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            term_ids_array, frequencies = self._postings(term_id, memo)
+            _, left, right = np.intersect1d(ids, term_ids_array, assume_unique=True, return_indices=True)
+            if not len(left):
+                continue
+            document_frequency = len(term_ids_array)
+            idf = np.log(1 + (self.doc_count - document_frequency + 0.5) / (document_frequency + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_length[ids[left]] / average_length)
+            scores[left] += idf * frequencies[right] * (BM25_K1 + 1) / (frequencies[right] + norm)
+        return scores
+
+    def search(
+        self,
+        text_query: str,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 20,
+        by_recency: bool = False
+    ) -> Tuple[List[int], int]:
+        """Article ids of one page of results for a query (see query_parser), and the total match count"""
+        plan = parse_query(text_query)
+        if plan is None:
+            return [], 0
+
+        with self._lock:
+            memo = {}
+            ids = self._match(plan.root, memo)
+            if not len(ids):
+                return [], 0
+            scores = self._scores(ids, plan.terms, memo)
+
+            # Attribute filters
+            mask = np.ones(len(ids), dtype=bool)
+            for field, value in zip(FILTER_FIELDS, (category, source, sentiment)):
+                if value:
+                    code = self.codes[field].get(value)
+                    if code is None:
+                        return [], 0
+                    mask &= self.attributes[field][ids] == code
+            published = self.published[ids]
+            if date_from:
+                mask &= published >= to_timestamp(date_from)
+            if date_to:
+                mask &= (published <= to_timestamp(date_to)) & (published != NO_DATE)
+            ids, scores, published = ids[mask], scores[mask], published[mask]
+
+        total = len(ids)
+        wanted = min(offset + limit, total)
+        if wanted <= offset:
+            return [], total
+
+        if by_recency:
+            scores = np.zeros_like(scores)
+
+        # Top-k selection, then an exact sort of just those (score, then newest first)
+        if wanted < total:
+            top = np.argpartition(-(published if by_recency else scores), wanted - 1)[:wanted]
+            ids, scores, published = ids[top], scores[top], published[top]
+        order = np.lexsort((-published, -scores))
+        return [int(article_id) for article_id in ids[order][offset:wanted]], total
+
+    # Snapshots
+
+    def save_snapshot(self):
+        """Write the index to disk atomically"""
+        with self._lock:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            lengths = np.fromiter((len(deltas) for deltas in self.deltas), dtype=np.int64, count=len(self.deltas))
+            meta = {
+                "format": SNAPSHOT_FORMAT,
+                "content_chars": CONTENT_CHARS,
+                "last_article_id": self.last_article_id,
+                "doc_count": self.doc_count,
+                "total_length": self.total_length,
+                "attributes_synced_at": self.attributes_synced_at.isoformat(),
+                "codes": self.codes,
+            }
+            tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as snapshot_file:
+                np.savez(
+                    snapshot_file,
+                    meta=np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8),
+                    terms=np.frombuffer("\n".join(self.terms).encode(), dtype=np.uint8),
+                    posting_lengths=lengths,
+                    deltas=np.frombuffer(b"".join(self.deltas), dtype=np.uint32),
+                    frequencies=np.frombuffer(b"".join(self.frequencies), dtype=np.uint8),
+                    position_lengths=np.fromiter((len(positions) for positions in self.positions), dtype=np.int64, count=len(self.positions)),
+                    positions=np.frombuffer(b"".join(self.positions), dtype=np.uint16),
+                    position_counts=np.frombuffer(b"".join(self.position_counts), dtype=np.uint16),
+                    title_length=self.title_length,
+                    last_doc=np.asarray(self.last_doc, dtype=np.int64),
+                    doc_length=self.doc_length,
+                    published=self.published,
+                    **{f"attribute_{field}": self.attributes[field] for field in FILTER_FIELDS}
+                )
+            os.replace(tmp_path, self.snapshot_path)
+            self._unsaved = 0
+        logger.info(f"💾 Saved {self.name} snapshot ({self.doc_count} articles, {len(self.terms)} terms)")
+
+    def load_snapshot(self) -> bool:
+        """Restore the index from disk; returns False if there is no usable snapshot"""
+        if not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with np.load(self.snapshot_path) as snapshot:
+                meta = json.loads(snapshot["meta"].tobytes())
+                if meta["format"] != SNAPSHOT_FORMAT or meta["content_chars"] != CONTENT_CHARS:
+                    logger.info(f"ℹ️  Ignoring {self.name} snapshot built with different settings")
+                    return False
+
+                with self._lock:
+                    self.clear()
+                    terms_blob = snapshot["terms"].tobytes().decode()
+                    self.terms = terms_blob.split("\n") if terms_blob else []
+                    self.term_ids = {term: term_id for term_id, term in enumerate(self.terms)}
+                    boundaries = np.cumsum(snapshot["posting_lengths"])[:-1]
+                    self.deltas = [array('I', part.tobytes()) for part in np.split(snapshot["deltas"], boundaries)]
+                    self.frequencies = [array('B', part.tobytes()) for part in np.split(snapshot["frequencies"], boundaries)]
+                    self.position_counts = [array('H', part.tobytes()) for part in np.split(snapshot["position_counts"], boundaries)]
+                    position_boundaries = np.cumsum(snapshot["position_lengths"])[:-1]
+                    self.positions = [array('H', part.tobytes()) for part in np.split(snapshot["positions"], position_boundaries)]
+                    if not self.terms:
+                        self.deltas, self.frequencies, self.positions, self.position_counts = [], [], [], []
+                    self.last_doc = snapshot["last_doc"].tolist()
+                    self.doc_length = snapshot["doc_length"]
+                    self.title_length = snapshot["title_length"]
+                    self.published = snapshot["published"]
+                    self.attributes = {field: snapshot[f"attribute_{field}"] for field in FILTER_FIELDS}
+                    self.codes = meta["codes"]
+                    self.doc_count = meta["doc_count"]
+                    self.total_length = meta["total_length"]
+                    self.attributes_synced_at = datetime.fromisoformat(meta["attributes_synced_at"])
+                    self.last_article_id = meta["last_article_id"]
+                    self.loaded = True
+                    self._last_sync = 0.0
+        except Exception as e:
+            logger.error(f"❌ Failed to load {self.name} snapshot: {e}")
+            self.clear()
+            self.last_article_id = 0
+            self.loaded = False
+            return False
+
+        logger.info(f"📂 Loaded {self.name} snapshot ({self.doc_count} articles, up to id {self.last_article_id})")
+        return True
+
+# Global index instance
+search_index = InvertedIndex()
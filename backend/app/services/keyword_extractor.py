@@ -0,0 +1,190 @@
+"""
+Keyword and tech phrase extraction shared by trending and article features
+Stop words and patterns are compiled once at import. Phrase extraction makes a
+single pass over the words of a text and only tries the patterns whose
+alternatives can start with that word.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Comprehensive stop words list for better filtering
+STOP_WORDS = frozenset({
+    # Articles, prepositions, conjunctions
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before',
+    'after', 'above', 'below', 'between', 'among', 'within', 'without',
+    
+    # Pronouns and determiners
+    'this', 'that', 'these', 'those', 'they', 'them', 'their', 'there',
+    'here', 'where', 'when', 'what', 'which', 'who', 'whom', 'whose', 'why',
+    'how', 'your', 'you', 'yours', 'our', 'ours', 'his', 'her', 'hers',
+    'its', 'their', 'theirs', 'some', 'any', 'all', 'each', 'every',
+    'both', 'either', 'neither', 'one', 'two', 'three', 'first', 'second',
+    'other', 'another', 'such', 'same', 'different', 'various', 'several',
+    
+    # Modal and auxiliary verbs
+    'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can',
+    'are', 'was', 'were', 'been', 'have', 'has', 'had', 'did', 'does',
+    'do', 'done', 'being', 'is', 'am', 'are', 'was', 'were', 'get', 'got',
+    'give', 'given', 'take', 'taken', 'make', 'made', 'come', 'came',
+    'go', 'went', 'gone', 'see', 'seen', 'know', 'known', 'think',
+    'thought', 'find', 'found', 'tell', 'told', 'ask', 'asked', 'try',
+    'tried', 'seem', 'seemed', 'feel', 'felt', 'leave', 'left', 'put',
+    
+    # Common adjectives and adverbs
+    'more', 'most', 'less', 'least', 'much', 'many', 'few', 'little',
+    'good', 'better', 'best', 'bad', 'worse', 'worst', 'big', 'bigger',
+    'small', 'smaller', 'large', 'larger', 'great', 'greater', 'high',
+    'higher', 'low', 'lower', 'long', 'longer', 'short', 'shorter',
+    'new', 'newer', 'old', 'older', 'young', 'younger', 'early', 'earlier',
+    'late', 'later', 'last', 'next', 'previous', 'current', 'recent',
+    'important', 'main', 'major', 'minor', 'real', 'right', 'wrong',
+    'true', 'false', 'sure', 'certain', 'possible', 'impossible',
+    'available', 'free', 'open', 'close', 'closed', 'full', 'empty',
+    'easy', 'hard', 'difficult', 'simple', 'complex', 'clear', 'dark',
+    'light', 'heavy', 'quick', 'fast', 'slow', 'strong', 'weak',
+    
+    # Generic tech words that aren't meaningful
+    'using', 'used', 'use', 'uses', 'way', 'ways', 'time', 'times',
+    'work', 'works', 'working', 'worked', 'thing', 'things', 'stuff',
+    'part', 'parts', 'kind', 'type', 'types', 'sort', 'example',
+    'examples', 'case', 'cases', 'point', 'points', 'place', 'places',
+    'end', 'ends', 'start', 'starts', 'beginning', 'middle', 'side',
+    'sides', 'top', 'bottom', 'left', 'right', 'front', 'back',
+    'inside', 'outside', 'around', 'near', 'far', 'away', 'together',
+    'alone', 'only', 'just', 'even', 'still', 'yet', 'already',
+    'always', 'never', 'sometimes', 'often', 'usually', 'probably',
+    'perhaps', 'maybe', 'definitely', 'certainly', 'exactly', 'quite',
+    'very', 'too', 'so', 'such', 'really', 'actually', 'basically',
+    'generally', 'specifically', 'particularly', 'especially', 'mainly',
+    'mostly', 'partly', 'completely', 'totally', 'fully', 'nearly',
+    'almost', 'hardly', 'barely', 'rather', 'pretty', 'fairly',
+    
+    # Common verbs that don't add meaning
+    'said', 'say', 'says', 'saying', 'call', 'called', 'calling',
+    'look', 'looked', 'looking', 'looks', 'like', 'liked', 'liking',
+    'want', 'wanted', 'wanting', 'need', 'needed', 'needing',
+    'help', 'helped', 'helping', 'show', 'showed', 'showing',
+    'turn', 'turned', 'turning', 'keep', 'kept', 'keeping',
+    'let', 'lets', 'letting', 'play', 'played', 'playing',
+    'move', 'moved', 'moving', 'live', 'lived', 'living',
+    'bring', 'brought', 'bringing', 'happen', 'happened', 'happening',
+    'write', 'wrote', 'written', 'writing', 'read', 'reading',
+    'hear', 'heard', 'hearing', 'listen', 'listened', 'listening',
+    'talk', 'talked', 'talking', 'speak', 'spoke', 'speaking',
+    'understand', 'understood', 'understanding', 'mean', 'meant', 'meaning',
+    'include', 'included', 'including', 'follow', 'followed', 'following',
+    'change', 'changed', 'changing', 'become', 'became', 'becoming',
+    'seem', 'seems', 'seemed', 'seeming', 'appear', 'appeared', 'appearing',
+    'continue', 'continued', 'continuing', 'remain', 'remained', 'remaining',
+    'stay', 'stayed', 'staying', 'stop', 'stopped', 'stopping',
+    'begin', 'began', 'beginning', 'finish', 'finished', 'finishing'
+})
+
+# Potential keywords: 4+ characters, letters/numbers/hyphens
+KEYWORD_PATTERN = re.compile(r'\b[A-Za-z][A-Za-z0-9\-]{3,}\b')
+
+# Common 2-3 word tech phrases
+TECH_PATTERNS = [
+    r'\b(artificial intelligence|machine learning|deep learning|neural network|natural language|computer vision|data science|cloud computing|edge computing|quantum computing)\b',
+    r'\b(software development|web development|mobile development|app development|game development|software engineering)\b',
+    r'\b(cyber security|information security|network security|data privacy|data protection|identity management)\b',
+    r'\b(user experience|user interface|user research|design thinking|design system|design patterns)\b',
+    r'\b(business intelligence|data analytics|data mining|big data|data warehouse|data lake)\b',
+    r'\b(internet of things|augmented reality|virtual reality|mixed reality|extended reality)\b',
+    r'\b(social media|social network|social platform|content management|digital marketing)\b',
+    r'\b(open source|version control|continuous integration|continuous deployment|agile development)\b',
+    r'\b(api integration|api management|microservices|serverless|container orchestration)\b',
+    r'\b(digital transformation|automation|process automation|robotic process|workflow automation)\b'
+]
+
+# Company and product patterns
+COMPANY_PATTERNS = [
+    r'\b(Apple|Google|Microsoft|Amazon|Meta|Facebook|Tesla|Netflix|Spotify|Adobe|Oracle|Salesforce)\b',
+    r'\b(OpenAI|ChatGPT|GPT-\d+|Claude|Gemini|Anthropic|DeepMind|Midjourney)\b',
+    r'\b(iPhone|iPad|MacBook|Windows|Android|iOS|Chrome|Safari|Firefox)\b',
+    r'\b(AWS|Azure|Google Cloud|Firebase|Vercel|Netlify|Heroku|Docker|Kubernetes)\b',
+    r'\b(React|Vue|Angular|Node\.js|Python|JavaScript|TypeScript|Java|Swift|Kotlin)\b',
+    r'\b(GitHub|GitLab|Stack Overflow|Reddit|Twitter|LinkedIn|TikTok|Instagram|YouTube)\b'
+]
+
+PHRASE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in TECH_PATTERNS + COMPANY_PATTERNS]
+
+WORD_PATTERN = re.compile(r'\w+')
+
+def _build_phrase_dispatch() -> Dict[str, Tuple[int, ...]]:
+    """Map the lowercased first word of every alternative to the patterns it can start"""
+    dispatch: Dict[str, List[int]] = {}
+    for index, pattern in enumerate(TECH_PATTERNS + COMPANY_PATTERNS):
+        alternatives = re.fullmatch(r'\\b\((.*)\)\\b', pattern).group(1).split('|')
+        for alternative in alternatives:
+            first_word = WORD_PATTERN.match(re.sub(r'\\(.)', r'\1', alternative)).group().lower()
+            indexes = dispatch.setdefault(first_word, [])
+            if index not in indexes:
+                indexes.append(index)
+    return {word: tuple(indexes) for word, indexes in dispatch.items()}
+
+PHRASE_DISPATCH = _build_phrase_dispatch()
+ALL_PHRASE_PATTERNS = tuple(range(len(PHRASE_PATTERNS)))
+
+@lru_cache(maxsize=65536)
+def _keyword_for(word: str) -> Optional[str]:
+    """Keyword form of a candidate word, or None if it should be skipped"""
+    word_lower = word.lower()
+    
+    # Skip stop words
+    if word_lower in STOP_WORDS:
+        return None
+    
+    # Skip pure numbers
+    if word.isdigit():
+        return None
+        
+    # Keep capitalized words (likely proper nouns/tech terms)
+    if word[0].isupper():
+        return word
+    # Keep tech-looking terms (contain numbers/hyphens)
+    elif any(char.isdigit() or char == '-' for char in word):
+        return word.upper() if len(word) <= 6 else word.title()
+    # Keep long words that might be technical
+    elif len(word) >= 6:
+        return word.title()
+    return None
+
+def extract_keywords(text: str) -> List[str]:
+    """Extract meaningful tech-focused keywords from text"""
+    if not text:
+        return []
+    
+    # Words repeat heavily across articles, so each distinct word is classified once
+    return [keyword for keyword in map(_keyword_for, KEYWORD_PATTERN.findall(text)) if keyword]
+
+def extract_tech_phrases(text: str) -> List[str]:
+    """Extract multi-word tech phrases and company names"""
+    if not text:
+        return []
+    
+    # Same results as running re.findall for each pattern in turn: matches are
+    # grouped by pattern, and each pattern's matches never overlap each other
+    matches_by_pattern = [[] for _ in PHRASE_PATTERNS]
+    resume_at = [0] * len(PHRASE_PATTERNS)
+    
+    for word in WORD_PATTERN.finditer(text):
+        token = word.group()
+        # Case-insensitive matching of non-ASCII words is left to the regex engine
+        candidates = PHRASE_DISPATCH.get(token.lower()) if token.isascii() else ALL_PHRASE_PATTERNS
+        if not candidates:
+            continue
+        
+        start = word.start()
+        for index in candidates:
+            if start < resume_at[index]:
+                continue
+            match = PHRASE_PATTERNS[index].match(text, start)
+            if match:
+                matches_by_pattern[index].append(match.group(1).title())
+                resume_at[index] = match.end()
+    
+    return [phrase for matches in matches_by_pattern for phrase in matches]
@@ -0,0 +1,101 @@
+"""
+Multi-pattern keyword matcher
+Keywords match at the start of a word, so inflections still count ("startup"
+matches "startups", "hack" matches "hackers") while a keyword never fires in
+the middle of another word. Short acronyms ("ai", "ml", "ui") and listed
+names must be whole words, so "said", "html" and "metaverse" do not match.
+"""
+
+import re
+from typing import Dict, Hashable, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+# Keywords whose last word is this short only match it as a whole word
+# (plural "s" allowed): as prefixes they would fire on "vcr" or "uid"
+WHOLE_WORD_MAX_LENGTH = 3
+VOWELS = set("aeiou")
+
+# Words of a phrase may be separated by any run of spaces or punctuation
+WORD_GAP = r"[\W_]+"
+WORD_END = r"(?![^\W_])"
+
+def word_endings(word: str, whole_word: bool) -> Tuple[str, str]:
+    """(stem, regex for what may follow it) for the last word of a keyword"""
+    if whole_word:
+        return word, "s?" + WORD_END
+    if word.endswith("y") and len(word) > 2 and word[-2] not in VOWELS:
+        # "vulnerability" -> "vulnerabilities", "study" -> "studied"
+        return word[:-1], "(?:y|ie)"
+    if word.endswith("e") and len(word) > 2:
+        # "raise" -> "raising", "venture" -> "venturing"
+        return word[:-1], "(?:e|ing)"
+    return word, ""
+
+def compile_keyword(words: List[str], whole_word: bool) -> Tuple[str, Pattern]:
+    """(literal prefilter, pattern) finding the keyword at the start of a word"""
+    stem, ending = word_endings(words[-1], whole_word)
+    words = words[:-1] + [stem]
+    first = re.escape(words[0])
+    # The pattern starts with a literal so the regex engine can skip ahead to
+    # it; the lookbehind then rejects hits in the middle of a word
+    pattern = first + r"(?<![^\W_]" + first + ")"
+    pattern += "".join(WORD_GAP + re.escape(word) for word in words[1:]) + ending
+    return words[0], re.compile(pattern)
+
+class KeywordMatcher:
+    """Match many keyword phrases at once and report which labels they belong to"""
+
+    def __init__(self, table: Dict[Hashable, Sequence[str]], whole_words: Iterable[str] = ()):
+        self.labels: List[Hashable] = list(table)
+        whole_words = {" ".join(word.lower().split()) for word in whole_words}
+        # Per label, (literal, pattern) for each keyword; a keyword shared by
+        # several labels compiles once
+        compiled: Dict[str, Tuple[str, Pattern]] = {}
+        self._keywords: List[List[Tuple[str, Pattern]]] = []
+        for keywords in table.values():
+            label_keywords = []
+            for keyword in keywords:
+                words = keyword.lower().split()
+                if not words:
+                    continue
+                key = " ".join(words)
+                if key not in compiled:
+                    whole_word = len(words[-1]) <= WHOLE_WORD_MAX_LENGTH or key in whole_words
+                    compiled[key] = compile_keyword(words, whole_word)
+                label_keywords.append(compiled[key])
+            self._keywords.append(label_keywords)
+
+    def match_mask(self, text: str) -> int:
+        """Return the bitmask of labels with at least one keyword in the text"""
+        if not text:
+            return 0
+        text = text.lower()
+        found = 0
+        # Keywords shared by several labels are only searched for once
+        results: Dict[Pattern, bool] = {}
+        for label_index, keywords in enumerate(self._keywords):
+            for literal, pattern in keywords:
+                hit = results.get(pattern)
+                if hit is None:
+                    # A C-level substring search rules out most keywords; the
+                    # regex only checks word boundaries from the first occurrence on
+                    start = text.find(literal)
+                    hit = results[pattern] = start >= 0 and pattern.search(text, start) is not None
+                if hit:
+                    found |= 1 << label_index
+                    break
+        return found
+
+    def labels_for_mask(self, mask: int) -> List[Hashable]:
+        """Labels for a bitmask, in table order"""
+        return [label for index, label in enumerate(self.labels) if mask >> index & 1]
+
+    def match(self, text: str) -> List[Hashable]:
+        """Return every label with at least one keyword in the text, in table order"""
+        return self.labels_for_mask(self.match_mask(text))
+
+    def first(self, text: str) -> Optional[Hashable]:
+        """Return the first label (in table order) with a keyword in the text"""
+        mask = self.match_mask(text)
+        if not mask:
+            return None
+        return self.labels[(mask & -mask).bit_length() - 1]
@@ -0,0 +1,245 @@
+"""
+Search query log with streaming top-k
+Every search is counted in time buckets (5 minutes for the hourly window, one
+hour for the daily one). Each bucket is a Count-Min Sketch - a small fixed
+grid of counters that never under-counts - plus a bounded min-heap of the
+queries with the highest estimates, so memory does not grow with the number
+of distinct queries. A window's top queries are the bucket heaps' candidates
+re-estimated against the summed sketches. With Redis, buckets are shared
+sorted sets (trimmed to the same bound) so every worker sees the same counts.
+"""
+
+import heapq
+import logging
+import os
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .query_parser import parse_query
+from .redis_cache import cache
+
+logger = logging.getLogger(__name__)
+
+QUERY_LOG_CAPACITY = int(os.getenv("QUERY_LOG_CAPACITY", "200"))  # queries tracked per bucket
+SKETCH_WIDTH = 4096
+SKETCH_DEPTH = 4
+MAX_QUERY_LENGTH = 100
+
+# Window name -> (bucket length in seconds, buckets)
+WINDOWS = {
+    "hour": (300, 12),
+    "day": (3600, 24)
+}
+
+REDIS_PREFIX = "query_log"
+REDIS_BUCKET_SIZE = 4 * QUERY_LOG_CAPACITY
+
+def normalize_query(text: Optional[str]) -> Optional[str]:
+    """The form a query is counted under, or None if it is not worth counting"""
+    plan = parse_query((text or "")[:MAX_QUERY_LENGTH])
+    if plan is None:
+        return None
+    # Plain queries are case-insensitive; operators in structured ones are not
+    return plan.key if plan.simple else plan.text
+
+def most_frequent(item: Tuple[str, int]) -> Tuple[int, str]:
+    """Sort key: highest count first, then alphabetical"""
+    return -item[1], item[0]
+
+class CountMinSketch:
+    """Approximate counts in a fixed depth x width grid (estimates are never too low)"""
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH):
+        self.width = width
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+        self.rows = np.arange(depth)
+
+    def columns(self, key: str) -> np.ndarray:
+        data = key.encode()
+        return np.fromiter((zlib.crc32(data, seed) % self.width for seed in range(len(self.rows))), dtype=np.int64)
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Count key and return its new estimate"""
+        columns = self.columns(key)
+        cells = self.table[self.rows, columns]
+        # Conservative update: only the counters at the current minimum need raising
+        estimate = int(cells.min()) + count
+        self.table[self.rows, columns] = np.maximum(cells, estimate)
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return int(self.table[self.rows, self.columns(key)].min())
+
+class TopK:
+    """The `capacity` keys with the highest counts seen, as a min-heap with lazy updates"""
+
+    def __init__(self, capacity: int = QUERY_LOG_CAPACITY):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.heap: List[Tuple[int, str]] = []  # may hold stale (count, key) entries
+
+    def offer(self, key: str, count: int):
+        if key in self.counts:
+            self.counts[key] = count
+            heapq.heappush(self.heap, (count, key))
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = count
+            heapq.heappush(self.heap, (count, key))
+        else:
+            smallest, smallest_key = self._minimum()
+            if count <= smallest:
+                return
+            heapq.heapreplace(self.heap, (count, key))
+            del self.counts[smallest_key]
+            self.counts[key] = count
+        if len(self.heap) > 4 * self.capacity:
+            self.heap = [(count, key) for key, count in self.counts.items()]
+            heapq.heapify(self.heap)
+
+    def _minimum(self) -> Tuple[int, str]:
+        """Drop stale entries until the heap's top is current"""
+        while True:
+            count, key = self.heap[0]
+            if self.counts.get(key) == count:
+                return count, key
+            heapq.heappop(self.heap)
+
+class Bucket:
+    def __init__(self, number: int):
+        self.number = number
+        self.sketch = CountMinSketch()
+        self.top = TopK()
+        self.columns: Dict[str, np.ndarray] = {}  # sketch columns of the keys in top
+
+class SlidingTopK:
+    """Top queries over the last `buckets` buckets of `bucket_seconds` each"""
+
+    def __init__(self, bucket_seconds: int, buckets: int):
+        self.bucket_seconds = bucket_seconds
+        self.buckets: List[Optional[Bucket]] = [None] * buckets
+        # Summed sketch of the window's completed buckets, by the newest bucket it was built for
+        self._completed: Tuple[Optional[int], Optional[np.ndarray]] = (None, None)
+
+    def bucket_number(self, now: float) -> int:
+        return int(now // self.bucket_seconds)
+
+    def add(self, key: str, now: float):
+        number = self.bucket_number(now)
+        slot = number % len(self.buckets)
+        bucket = self.buckets[slot]
+        if bucket is None or bucket.number != number:
+            # The slot is reused for the new bucket
+            bucket = self.buckets[slot] = Bucket(number)
+        bucket.top.offer(key, bucket.sketch.add(key))
+        if key in bucket.top.counts and key not in bucket.columns:
+            bucket.columns[key] = bucket.sketch.columns(key)
+        if len(bucket.columns) > 2 * bucket.top.capacity:
+            bucket.columns = {key: bucket.columns[key] for key in bucket.top.counts}
+
+    def completed_table(self, newest: int) -> np.ndarray:
+        """Sum of the sketches of the window's buckets before `newest`; they no longer change"""
+        built_for, table = self._completed
+        if built_for != newest:
+            table = np.zeros((SKETCH_DEPTH, SKETCH_WIDTH), dtype=np.uint32)
+            for bucket in self.buckets:
+                if bucket is not None and newest - len(self.buckets) < bucket.number < newest:
+                    table += bucket.sketch.table
+            self._completed = (newest, table)
+        return table
+
+    def top(self, limit: int, now: float) -> List[Tuple[str, int]]:
+        newest = self.bucket_number(now)
+        live = [bucket for bucket in self.buckets if bucket is not None and newest - len(self.buckets) < bucket.number <= newest]
+        if not live:
+            return []
+        # Sketches add up, so the window's sketch is the sum of its buckets'
+        table = self.completed_table(newest)
+        current = self.buckets[newest % len(self.buckets)]
+        if current is not None and current.number == newest:
+            table = table + current.sketch.table
+        candidates: Dict[str, np.ndarray] = {}
+        for bucket in live:
+            for key in bucket.top.counts:
+                candidates[key] = bucket.columns[key]
+        keys = list(candidates)
+        columns = np.stack([candidates[key] for key in keys], axis=1)
+        estimates = table[np.arange(SKETCH_DEPTH)[:, None], columns].min(axis=0)
+        # Only the k largest need sorting
+        wanted = min(limit, len(keys))
+        threshold = np.partition(estimates, len(keys) - wanted)[len(keys) - wanted]
+        return sorted(
+            ((keys[position], int(estimates[position])) for position in np.flatnonzero(estimates >= threshold)),
+            key=most_frequent
+        )[:limit]
+
+class QueryLog:
+    """Search counts per window, in Redis when it is available, else in process"""
+
+    def __init__(self):
+        self.windows = {name: SlidingTopK(*layout) for name, layout in WINDOWS.items()}
+        self._lock = threading.Lock()
+
+    def record(self, text: Optional[str], now: Optional[float] = None):
+        """Count one search"""
+        key = normalize_query(text)
+        if key is None:
+            return
+        now = time.time() if now is None else now
+        if cache.is_connected and self._redis_record(key, now):
+            return
+        with self._lock:
+            for window in self.windows.values():
+                window.add(key, now)
+
+    def popular(self, window: str = "day", limit: int = 10, now: Optional[float] = None) -> List[Tuple[str, int]]:
+        """(query, count) for the most frequent searches in the window, largest first"""
+        now = time.time() if now is None else now
+        if cache.is_connected:
+            popular = self._redis_popular(window, limit, now)
+            if popular is not None:
+                return popular
+        with self._lock:
+            return self.windows[window].top(limit, now)
+
+    # Shared buckets
+
+    def _redis_key(self, window: str, number: int) -> str:
+        return f"{REDIS_PREFIX}:{window}:{number}"
+
+    def _redis_record(self, key: str, now: float) -> bool:
+        try:
+            pipeline = cache.redis_client.pipeline(transaction=False)
+            for name, (bucket_seconds, buckets) in WINDOWS.items():
+                bucket_key = self._redis_key(name, int(now // bucket_seconds))
+                pipeline.zincrby(bucket_key, 1, key)
+                # Bounded like the local heaps; the slack gives new queries room to climb
+                pipeline.zremrangebyrank(bucket_key, 0, -REDIS_BUCKET_SIZE - 1)
+                pipeline.expire(bucket_key, bucket_seconds * (buckets + 1))
+            pipeline.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Query log write failed, counting locally: {e}")
+            return False
+
+    def _redis_popular(self, window: str, limit: int, now: float) -> Optional[List[Tuple[str, int]]]:
+        bucket_seconds, buckets = WINDOWS[window]
+        newest = int(now // bucket_seconds)
+        try:
+            pipeline = cache.redis_client.pipeline(transaction=False)
+            for number in range(newest - buckets + 1, newest + 1):
+                pipeline.zrevrange(self._redis_key(window, number), 0, QUERY_LOG_CAPACITY - 1, withscores=True)
+            totals: Dict[str, int] = {}
+            for entries in pipeline.execute():
+                for key, score in entries:
+                    totals[key] = totals.get(key, 0) + int(score)
+        except Exception as e:
+            logger.warning(f"⚠️ Query log read failed: {e}")
+            return None
+        return heapq.nsmallest(limit, totals.items(), key=most_frequent)
+
+# Global query log instance
+query_log = QueryLog()
@@ -0,0 +1,236 @@
+"""
+Search query language
+Queries may use quoted phrases, AND/OR/NOT (or a leading -), parentheses and
+field prefixes (title:, source:, category:, sentiment:). They are parsed once
+into an immutable plan tree that both the in-process index and the database
+backends evaluate; plans are cached by query text.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
+MAX_TERM_LENGTH = 40
+MAX_QUERY_LENGTH = 500  # characters accepted by the search endpoints
+# Parentheses and NOTs nested deeper than this are read as plain text
+MAX_NESTING = 32
+
+# Prefixes matching text in one field, and prefixes matching an article attribute
+TEXT_FIELDS = ("title",)
+ATTRIBUTE_FIELDS = ("source", "category", "sentiment")
+
+OPERATORS = ("AND", "OR", "NOT")
+
+# Quotes, parentheses, known field prefixes and leading minus signs
+SYNTAX_PATTERN = re.compile(
+    r'["()]|(?:^|[\s(])-\S|\b(?:' + "|".join(TEXT_FIELDS + ATTRIBUTE_FIELDS) + r'):', re.IGNORECASE
+)
+
+LEXEME_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<open>\() | (?P<close>\)) |
+        (?P<negate>-)(?=[^\s\-]) |
+        (?:(?P<field>[A-Za-z]+):)?(?:"(?P<phrase>[^"]*)"?|(?P<word>[^\s()"]+))
+    )
+''', re.VERBOSE)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens, matching the full-text backends' tokenization"""
+    if not text:
+        return []
+    return [token for token in SEARCH_TOKEN_PATTERN.findall(text.lower()) if len(token) <= MAX_TERM_LENGTH]
+
+class Term(NamedTuple):
+    token: str
+    field: Optional[str]  # None for any text field, or "title"
+    text: str  # as typed, for substring matching
+
+class Phrase(NamedTuple):
+    tokens: Tuple[str, ...]
+    field: Optional[str]
+    text: str
+
+class Attribute(NamedTuple):
+    field: str
+    value: str  # lowercase, compared case-insensitively
+
+class And(NamedTuple):
+    children: tuple
+
+class Or(NamedTuple):
+    children: tuple
+
+class Not(NamedTuple):
+    child: "Node"
+
+Node = Union[Term, Phrase, Attribute, And, Or, Not]
+
+class QueryPlan(NamedTuple):
+    root: Node
+    simple: bool  # plain words only: backends may treat the text as they always have
+    text: str  # the query with whitespace normalized
+    terms: Tuple[str, ...]  # tokens that add to relevance (not under NOT)
+    key: str  # canonical form, equal for equivalent queries
+
+def text_leaf(field: Optional[str], text: str, quoted: bool) -> Optional[Node]:
+    tokens = tokenize(text)
+    if not tokens:
+        return None
+    text = " ".join(text.split())
+    if len(tokens) == 1 and not quoted:
+        return Term(tokens[0], field, text)
+    # Quoted text and words like "gpt-4" match as adjacent tokens
+    return Phrase(tuple(tokens), field, text)
+
+def lex(query: str) -> list:
+    """Operators, parentheses and leaf nodes"""
+    lexemes = []
+    position = 0
+    while position < len(query):
+        match = LEXEME_PATTERN.match(query, position)
+        if not match or match.end() == position:
+            break
+        position = match.end()
+        if match.group("open"):
+            lexemes.append("(")
+        elif match.group("close"):
+            lexemes.append(")")
+        elif match.group("negate"):
+            lexemes.append("NOT")
+        elif match.group("phrase") is not None or match.group("word") is not None:
+            field = (match.group("field") or "").lower() or None
+            quoted = match.group("phrase") is not None
+            value = match.group("phrase") if quoted else match.group("word")
+            if field is None and not quoted and value in OPERATORS:
+                lexemes.append(value)
+            elif field in ATTRIBUTE_FIELDS:
+                value = " ".join(value.split()).lower()
+                if value:
+                    lexemes.append(Attribute(field, value))
+            elif field in TEXT_FIELDS or field is None:
+                leaf = text_leaf(field, value, quoted)
+                if leaf is not None:
+                    lexemes.append(leaf)
+            else:
+                # Not a known field: the colon is part of the text
+                leaf = text_leaf(None, match.group(0), quoted)
+                if leaf is not None:
+                    lexemes.append(leaf)
+    return lexemes
+
+def combine(kind, children: list) -> Optional[Node]:
+    """Node of kind over children, flattening nested nodes of the same kind"""
+    flat = []
+    for child in children:
+        if child is None:
+            continue
+        flat.extend(child.children if isinstance(child, kind) else (child,))
+    if not flat:
+        return None
+    return flat[0] if len(flat) == 1 else kind(tuple(flat))
+
+class Parser:
+    """Recursive descent: OR binds loosest, then AND (explicit or implied), then NOT"""
+
+    def __init__(self, lexemes: list):
+        self.lexemes = lexemes
+        self.position = 0
+        self.depth = 0
+
+    def peek(self):
+        return self.lexemes[self.position] if self.position < len(self.lexemes) else None
+
+    def advance(self):
+        self.position += 1
+
+    def parse(self) -> Optional[Node]:
+        nodes = []
+        while self.peek() is not None:
+            nodes.append(self.parse_or())
+            if self.peek() == ")":
+                self.advance()  # unbalanced
+        return combine(And, nodes)
+
+    def parse_or(self) -> Optional[Node]:
+        alternatives = [self.parse_and()]
+        while self.peek() == "OR":
+            self.advance()
+            alternatives.append(self.parse_and())
+        return combine(Or, alternatives)
+
+    def parse_and(self) -> Optional[Node]:
+        operands = []
+        while self.peek() not in (None, ")", "OR"):
+            if self.peek() == "AND":
+                self.advance()
+                continue
+            operands.append(self.parse_not())
+        return combine(And, operands)
+
+    def parse_not(self) -> Optional[Node]:
+        lexeme = self.peek()
+        if lexeme in ("NOT", "(") and self.depth >= MAX_NESTING:
+            # Too deep to be meant: skip the operator, keep the words
+            self.advance()
+            return None
+        if lexeme == "NOT":
+            self.advance()
+            self.depth += 1
+            child = self.parse_not()
+            self.depth -= 1
+            if child is None:
+                return None
+            return child.child if isinstance(child, Not) else Not(child)
+        if lexeme == "(":
+            self.advance()
+            self.depth += 1
+            node = self.parse_or()
+            self.depth -= 1
+            if self.peek() == ")":
+                self.advance()
+            return node
+        self.advance()
+        return lexeme if not isinstance(lexeme, str) else None
+
+def positive_terms(node: Node) -> List[str]:
+    if isinstance(node, Term):
+        return [node.token]
+    if isinstance(node, Phrase):
+        return list(node.tokens)
+    if isinstance(node, (And, Or)):
+        return [token for child in node.children for token in positive_terms(child)]
+    return []
+
+def canonical(node: Node) -> str:
+    if isinstance(node, (Term, Phrase)):
+        # The typed text, since database substring matching uses it
+        return f'{node.field or ""}:"{node.text.lower()}"'
+    if isinstance(node, Attribute):
+        return f"{node.field}={node.value}"
+    if isinstance(node, Not):
+        return f"-{canonical(node.child)}"
+    operator = " AND " if isinstance(node, And) else " OR "
+    # Operands commute, so their order does not change the key
+    return "(" + operator.join(sorted(canonical(child) for child in node.children)) + ")"
+
+def is_plain(query: str, lexemes: list) -> bool:
+    """No syntax beyond words separated by spaces"""
+    return not SYNTAX_PATTERN.search(query) and not any(lexeme in OPERATORS for lexeme in lexemes)
+
+@lru_cache(maxsize=4096)
+def parse_query(query: str) -> Optional[QueryPlan]:
+    """Plan for a query string, or None when it has nothing to match"""
+    lexemes = lex(query or "")
+    root = Parser(lexemes).parse()
+    if root is None:
+        return None
+    text = " ".join(query.split())
+    simple = is_plain(text, lexemes)
+    return QueryPlan(
+        root=root,
+        simple=simple,
+        text=text,
+        terms=tuple(dict.fromkeys(positive_terms(root))),
+        key=text.lower() if simple else canonical(root)
+    )
@@ -1,11 +1,19 @@
 """
 Redis caching service for the tech news aggregator
 Provides centralized caching functionality for API responses
+Hot entries are also held, already deserialized, in a small in-process LRU
+(L1) in front of Redis; deletions are broadcast over Redis pub/sub so every
+worker drops its copy.
 """
 
 import json
+import re
 import logging
-from typing import Any, Optional, Union, List, Dict
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional, Union, List, Dict, Tuple
 from datetime import timedelta
 import redis
 import os
@@ -13,12 +21,100 @@ from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+CACHE_L1_SIZE = int(os.getenv("CACHE_L1_SIZE", "1000"))  # entries per worker; 0 disables the L1
+CACHE_L1_TTL = float(os.getenv("CACHE_L1_TTL", "30"))  # seconds; also bounded by the Redis TTL
+INVALIDATION_CHANNEL = "cache:invalidations"
+
+def pattern_regex(pattern: str) -> "re.Pattern":
+    """Compile a Redis glob pattern (*, ?, [...], backslash escapes) to a regular expression"""
+    parts = []
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char == "\\" and position + 1 < len(pattern):
+            position += 1
+            parts.append(re.escape(pattern[position]))
+        elif char == "*":
+            parts.append(".*")
+        elif char == "?":
+            parts.append(".")
+        elif char == "[" and "]" in pattern[position + 1:]:
+            end = pattern.index("]", position + 1)
+            members = pattern[position + 1:end]
+            negate = members.startswith("^")
+            members = members[1:] if negate else members
+            parts.append("[" + ("^" if negate else "") + members.replace("\\", "\\\\") + "]")
+            position = end
+        else:
+            parts.append(re.escape(char))
+        position += 1
+    return re.compile("".join(parts) + r"\Z", re.DOTALL)
+
+class LocalCache:
+    """Size- and TTL-bounded LRU of deserialized values for one process"""
+
+    def __init__(self, max_entries: int = CACHE_L1_SIZE, max_ttl: float = CACHE_L1_TTL):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (expires at, value)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float):
+        if self.max_entries <= 0:
+            return
+        ttl = min(ttl, self.max_ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self.entries.pop(key, None)
+
+    def delete_pattern(self, pattern: str):
+        matches = pattern_regex(pattern).match
+        with self._lock:
+            for key in [key for key in self.entries if matches(key)]:
+                del self.entries[key]
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
 class RedisCache:
     """Redis cache manager with JSON serialization support"""
     
     def __init__(self):
         self.redis_client = None
         self.is_connected = False
+        self.local = LocalCache()
+        # Bumped by every invalidation, so a read that raced one is not kept locally
+        self._generation = 0
+        self._instance_id = uuid.uuid4().hex
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+        self._listening = False  # the L1 is only used while invalidations are being received
         self._connect()
     
     def _connect(self):
@@ -74,16 +170,34 @@ class RedisCache:
             return None
     
     def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
+        """Get value from cache (the in-process L1 first, then Redis)"""
         if not self.is_connected:
             return None
         
+        use_local = self._local_enabled()
+        if use_local:
+            value = self.local.get(key)
+            if value is not None:
+                return value
+        
         try:
-            cached_value = self.redis_client.get(key)
+            generation = self._generation
+            if not use_local:
+                cached_value = self.redis_client.get(key)
+                return None if cached_value is None else self._deserialize_value(cached_value)
+            
+            # Value and remaining TTL in one round trip; the local copy must not outlive Redis's
+            pipeline = self.redis_client.pipeline(transaction=False)
+            pipeline.get(key)
+            pipeline.pttl(key)
+            cached_value, ttl_ms = pipeline.execute()
             if cached_value is None:
                 return None
             
-            return self._deserialize_value(cached_value)
+            value = self._deserialize_value(cached_value)
+            if value is not None and generation == self._generation:
+                self.local.set(key, value, ttl_ms / 1000 if ttl_ms > 0 else self.local.max_ttl)
+            return value
         except Exception as e:
             logger.error(f"❌ Cache GET failed for key '{key}': {e}")
             return None
@@ -98,7 +212,17 @@ class RedisCache:
             if not serialized_value:
                 return False
             
-            self.redis_client.setex(key, ttl, serialized_value)
+            if not self._local_enabled():
+                self.redis_client.setex(key, ttl, serialized_value)
+                return True
+            
+            # Other workers drop any older copy they hold
+            pipeline = self.redis_client.pipeline(transaction=False)
+            pipeline.setex(key, ttl, serialized_value)
+            pipeline.publish(INVALIDATION_CHANNEL, self._invalidation_message({"key": key}))
+            pipeline.execute()
+            # Stored as read back, so local hits look exactly like Redis hits
+            self.local.set(key, self._deserialize_value(serialized_value), ttl)
             return True
         except Exception as e:
             logger.error(f"❌ Cache SET failed for key '{key}': {e}")
@@ -111,6 +235,7 @@ class RedisCache:
         
         try:
             self.redis_client.delete(key)
+            self._invalidate({"key": key})
             return True
         except Exception as e:
             logger.error(f"❌ Cache DELETE failed for key '{key}': {e}")
@@ -123,9 +248,9 @@ class RedisCache:
         
         try:
             keys = self.redis_client.keys(pattern)
-            if keys:
-                return self.redis_client.delete(*keys)
-            return 0
+            deleted = self.redis_client.delete(*keys) if keys else 0
+            self._invalidate({"pattern": pattern})
+            return deleted
         except Exception as e:
             logger.error(f"❌ Cache DELETE PATTERN failed for '{pattern}': {e}")
             return 0
@@ -152,6 +277,89 @@ class RedisCache:
             logger.error(f"❌ Cache TTL failed for key '{key}': {e}")
             return -2
 
+    def flush_all(self) -> bool:
+        """Delete every key in the Redis database and every worker's local copies"""
+        if not self.is_connected:
+            return False
+        
+        try:
+            self.redis_client.flushdb()
+            self._invalidate({"all": True})
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to clear all cache: {e}")
+            return False
+    
+    # In-process L1 and cross-worker invalidation
+    
+    def _local_enabled(self) -> bool:
+        if self.local.max_entries <= 0:
+            return False
+        self._start_listener()
+        return self._listening
+    
+    def _apply_invalidation(self, message: Dict):
+        self._generation += 1
+        if message.get("all"):
+            self.local.clear()
+        elif "pattern" in message:
+            self.local.delete_pattern(message["pattern"])
+        elif "key" in message:
+            self.local.delete(message["key"])
+    
+    def _invalidation_message(self, message: Dict) -> str:
+        return json.dumps(dict(message, origin=self._instance_id))
+    
+    def _invalidate(self, message: Dict):
+        """Drop local copies here at once and in every other worker via pub/sub"""
+        self._apply_invalidation(message)
+        try:
+            self.redis_client.publish(INVALIDATION_CHANNEL, self._invalidation_message(message))
+        except Exception as e:
+            logger.error(f"❌ Cache invalidation broadcast failed: {e}")
+    
+    def _start_listener(self):
+        if self._listener is None or not self._listener.is_alive():
+            with self._listener_lock:
+                if self._listener is None or not self._listener.is_alive():
+                    self._listener = threading.Thread(target=self._listen, name="cache-invalidations", daemon=True)
+                    self._listener.start()
+    
+    def _listen(self):
+        """Apply other workers' invalidations; the L1 is off whenever messages could be missed"""
+        backoff = 1
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Entries stored before subscribing may have missed invalidations
+                self.local.clear()
+                self._listening = True
+                backoff = 1
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None or message.get("type") != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") != self._instance_id:
+                        self._apply_invalidation(payload)
+            except Exception as e:
+                self._listening = False
+                self.local.clear()
+                logger.warning(f"⚠️ Cache invalidation listener disconnected, local cache off: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+    
+    def local_stats(self) -> Dict[str, Any]:
+        return dict(self.local.stats(), enabled=self._listening)
+
 # Global cache instance
 cache = RedisCache()
 
@@ -186,6 +394,10 @@ def cached(ttl: int = 300, key_prefix: str = ""):
         return wrapper
     return decorator
 
+def escape_pattern(value: str) -> str:
+    """Value matched literally inside a Redis key pattern"""
+    return re.sub(r'([\\*?\[\]])', r'\\\1', value)
+
 # Cache key generators for consistent naming
 class CacheKeys:
     """Centralized cache key generation"""
@@ -225,7 +437,8 @@ class CacheKeys:
     
     @staticmethod
     def bookmarks_list(user_id: str) -> str:
-        return f"bookmarks:list:{user_id}"
+        """Pattern for every cached bookmark list of a user (the decorator scopes them by user_id)"""
+        return f"bookmarks:{escape_pattern(user_id)}:*"
 
 # Cache invalidation helpers
 class CacheInvalidator:
@@ -252,18 +465,13 @@ class CacheInvalidator:
     @staticmethod
     def invalidate_user_bookmarks(user_id: str):
         """Invalidate specific user's bookmarks cache"""
-        key = CacheKeys.bookmarks_list(user_id)
-        cache.delete(key)
+        cache.delete_pattern(CacheKeys.bookmarks_list(user_id))
         logger.info(f"🗑️ Invalidated bookmarks cache for user: {user_id}")
     
     @staticmethod
     def invalidate_all():
         """Nuclear option - clear all cache"""
-        if cache.is_connected:
-            try:
-                cache.redis_client.flushdb()
-                logger.warning("💥 CLEARED ALL CACHE")
-            except Exception as e:
-                logger.error(f"❌ Failed to clear all cache: {e}")
+        if cache.flush_all():
+            logger.warning("💥 CLEARED ALL CACHE")
 
 logger.info("📦 Redis cache service initialized")
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+Corpus reprocessing for article enrichment
+Recomputes features, category and sentiment for stored articles after rule changes
+"""
+
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import update, delete, insert
+
+from ..database import SessionLocal, Article, ArticleFeatures
+from .checkpoint import Checkpoint
+from .feature_store import extract_features
+from .redis_cache import CacheInvalidator
+from .rollups import rebuild_rollups
+from .rss_aggregator import aggregator
+from .sentiment_analyzer import analyzer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PATH = os.getenv("REPROCESS_CHECKPOINT", "./data/reprocess_checkpoint.json")
+CHECKPOINT_KEY = "reprocess"
+
+ArticleRow = Tuple[int, str, Optional[str], Optional[str], Optional[str], Optional[str]]
+
+def enrich_rows(rows: List[ArticleRow]) -> Tuple[List[Dict], List[Dict]]:
+    """Recompute features and enrichment for a chunk of rows
+
+    Returns the enrichment changes (only rows whose category or sentiment changed)
+    and the refreshed feature rows for the whole chunk.
+    """
+    feature_rows = []
+    for article_id, title, content, *_ in rows:
+        features = extract_features(title, content)
+        features["article_id"] = article_id
+        feature_rows.append(features)
+
+    # Score the whole chunk at once from the lexicon counts
+    sentiments, _ = analyzer.labels_from_counts(
+        np.asarray([features["lexicon_counts"] for features in feature_rows], dtype=np.int64),
+        np.asarray([features["text_length"] for features in feature_rows])
+    )
+
+    changes = []
+    for (article_id, title, content, source, category, sentiment), features, new_sentiment in zip(
+        rows, feature_rows, sentiments
+    ):
+        new_category = aggregator.categorize_article(title, content or "", source, features=features)
+        if new_category != category or new_sentiment != sentiment:
+            changes.append({
+                "id": article_id,
+                "category": new_category,
+                "sentiment": new_sentiment,
+            })
+    return changes, feature_rows
+
+class ArticleReprocessor:
+    """Stream articles in primary-key order and re-enrich them in a process pool"""
+
+    def __init__(
+        self,
+        chunk_size: int = 2000,
+        max_workers: Optional[int] = None,
+        checkpoint_path: str = DEFAULT_CHECKPOINT_PATH
+    ):
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.checkpoint = Checkpoint(checkpoint_path)
+
+    def iter_chunks(self, db, after_id: int):
+        """Yield rows in primary-key chunks using keyset pagination on the id index"""
+        last_id = after_id
+        while True:
+            rows = db.query(
+                Article.id,
+                Article.title,
+                Article.content,
+                Article.source,
+                Article.category,
+                Article.sentiment
+            ).filter(
+                Article.id > last_id
+            ).order_by(Article.id).limit(self.chunk_size).execution_options(
+                stream_results=True,
+                yield_per=self.chunk_size
+            ).all()
+
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield last_id, [tuple(row) for row in rows]
+
+    def apply_changes(self, db, changes: List[Dict], feature_rows: List[Dict]) -> int:
+        """Write a chunk back: bulk UPDATE changed articles and replace their feature rows"""
+        if changes:
+            now = datetime.utcnow()
+            for change in changes:
+                change["updated_at"] = now
+            db.execute(update(Article), changes)
+
+        if feature_rows:
+            article_ids = [features["article_id"] for features in feature_rows]
+            db.execute(delete(ArticleFeatures).where(ArticleFeatures.article_id.in_(article_ids)))
+            db.execute(insert(ArticleFeatures), feature_rows)
+
+        db.commit()
+        return len(changes)
+
+    def run(self, reset: bool = False) -> Dict[str, int]:
+        """Reprocess the whole corpus, resuming from the last checkpoint"""
+        if reset:
+            self.checkpoint.reset()
+        start_id = (self.checkpoint.get(CHECKPOINT_KEY) or {}).get("last_id", 0)
+        if start_id:
+            logger.info(f"⏩ Resuming reprocessing after article id {start_id}")
+
+        read_db = SessionLocal()
+        write_db = SessionLocal()
+        processed = 0
+        updated = 0
+        pending = deque()
+
+        def drain_one():
+            nonlocal processed, updated
+            last_id, row_count, future = pending.popleft()
+            updated += self.apply_changes(write_db, *future.result())
+            processed += row_count
+            # Chunks complete in submission order, so last_id is a safe resume point
+            self.checkpoint.set(CHECKPOINT_KEY, {"last_id": last_id})
+            logger.info(f"🔄 Reprocessed {processed} articles ({updated} updated)")
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                for last_id, rows in self.iter_chunks(read_db, start_id):
+                    pending.append((last_id, len(rows), executor.submit(enrich_rows, rows)))
+                    # Keep a bounded number of chunks in flight
+                    if len(pending) >= self.max_workers * 2:
+                        drain_one()
+                while pending:
+                    drain_one()
+        finally:
+            read_db.close()
+            write_db.close()
+
+        # Finished cleanly: the next run starts from the beginning again
+        self.checkpoint.reset()
+
+        if updated:
+            # Categories and sentiments changed, so the hourly rollups are recomputed
+            rollup_db = SessionLocal()
+            try:
+                rebuild_rollups(rollup_db)
+            finally:
+                rollup_db.close()
+            
+            CacheInvalidator.invalidate_articles()
+            CacheInvalidator.invalidate_trending()
+            CacheInvalidator.invalidate_search()
+
+        logger.info(f"Reprocessing completed. {updated} of {processed} articles changed.")
+        return {"processed": processed, "updated": updated}
@@ -0,0 +1,278 @@
+"""
+Hourly article rollups
+Article counts per (published hour, category, source, sentiment) are maintained
+as articles are inserted, so analytics endpoints aggregate a few hundred
+rollup rows instead of scanning the articles table. Like the in-process
+indexes, the rollups remember the highest article id they have counted, so
+articles inserted by any other writer are caught up with a primary-key range
+query before the rollups are read.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..database import Article, ArticleRollup, RollupState, SessionLocal
+from .hot_set import hot_set
+from .timeutil import EPOCH, hour_bucket, to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+RollupKey = Tuple[Optional[datetime], Optional[str], Optional[str], Optional[str]]
+
+ROLLUP_STATE_ID = 1
+
+def floor_hour(value: Optional[datetime]) -> Optional[datetime]:
+    """Start of the (naive UTC) hour containing value"""
+    if value is None:
+        return None
+    return to_naive_utc(value).replace(minute=0, second=0, microsecond=0)
+
+def ceil_hour(value: datetime) -> datetime:
+    """Start of the first whole hour at or after value"""
+    start = floor_hour(value)
+    return start if start == value else start + timedelta(hours=1)
+
+def _key_filter(key: RollupKey):
+    """Equality on every rollup dimension, treating NULL as a value"""
+    columns = (ArticleRollup.hour, ArticleRollup.category, ArticleRollup.source, ArticleRollup.sentiment)
+    return [column.is_(None) if value is None else column == value for column, value in zip(columns, key)]
+
+def rollup_state(db: Session) -> Optional[Tuple[int, int]]:
+    """(last counted article id, articles counted), or None if the rollups were never built"""
+    return db.query(RollupState.last_article_id, RollupState.article_count).filter(
+        RollupState.id == ROLLUP_STATE_ID
+    ).first()
+
+def record_articles(db: Session) -> int:
+    """Add articles inserted since the rollups were last brought up to date; returns how many"""
+    state = rollup_state(db)
+    if state is None:
+        rebuild_rollups(db)
+        return 0
+
+    last_article_id = state[0]
+    rows = db.query(
+        Article.id, Article.published_at, Article.category, Article.source, Article.sentiment
+    ).filter(Article.id > last_article_id).order_by(Article.id).all()
+    if not rows:
+        return 0
+
+    # Moving the mark only from the value read above means two writers
+    # catching up at once never count the same articles twice
+    claimed = db.query(RollupState).filter(
+        RollupState.id == ROLLUP_STATE_ID,
+        RollupState.last_article_id == last_article_id
+    ).update({
+        RollupState.last_article_id: rows[-1][0],
+        RollupState.article_count: RollupState.article_count + len(rows)
+    }, synchronize_session=False)
+    if not claimed:
+        db.rollback()
+        return 0
+
+    increments = Counter(
+        (floor_hour(published_at), category, source, sentiment)
+        for _, published_at, category, source, sentiment in rows
+    )
+    for key, count in increments.items():
+        # Reads sum counts, so a duplicate row from a concurrent writer is harmless
+        updated = db.query(ArticleRollup).filter(*_key_filter(key)).update(
+            {ArticleRollup.count: ArticleRollup.count + count},
+            synchronize_session=False
+        )
+        if not updated:
+            hour, category, source, sentiment = key
+            db.add(ArticleRollup(hour=hour, category=category, source=source, sentiment=sentiment, count=count))
+    db.commit()
+    return len(rows)
+
+def rebuild_rollups(db: Session, batch_size: int = 5000) -> int:
+    """Recompute all rollups from the articles table; returns the number of rollup rows"""
+    counts = Counter()
+    last_article_id = 0
+    rows = db.query(
+        Article.id, Article.published_at, Article.category, Article.source, Article.sentiment
+    ).execution_options(yield_per=batch_size)
+    for article_id, published_at, category, source, sentiment in rows:
+        counts[(floor_hour(published_at), category, source, sentiment)] += 1
+        last_article_id = max(last_article_id, article_id)
+
+    db.query(ArticleRollup).delete(synchronize_session=False)
+    db.bulk_insert_mappings(ArticleRollup, [
+        {"hour": hour, "category": category, "source": source, "sentiment": sentiment, "count": count}
+        for (hour, category, source, sentiment), count in counts.items()
+    ])
+    db.query(RollupState).delete(synchronize_session=False)
+    db.add(RollupState(id=ROLLUP_STATE_ID, last_article_id=last_article_id, article_count=sum(counts.values())))
+    db.commit()
+
+    logger.info(f"📊 Rebuilt {len(counts)} article rollups from {sum(counts.values())} articles")
+    return len(counts)
+
+def ensure_rollups(db: Session):
+    """Build rollups for databases that predate them, and rebuild them if they drifted from the articles"""
+    if rollup_state(db) is None:
+        rebuild_rollups(db)
+        return
+    record_articles(db)
+    # Deleted articles (or ones committed below the mark) only show up in the total
+    state = rollup_state(db)
+    article_count = db.query(func.count(Article.id)).scalar()
+    if state is None or state[1] != article_count:
+        logger.warning(f"⚠️ Article rollups count {state and state[1]} of {article_count} articles; rebuilding")
+        rebuild_rollups(db)
+
+def rollups_current(db: Session) -> bool:
+    """Catch the rollups up with articles inserted without record_articles; False if they can't be trusted"""
+    try:
+        state = rollup_state(db)
+        if state is None:
+            return False
+        last_article_id = db.query(func.max(Article.id)).scalar() or 0
+        if state[0] < last_article_id:
+            # Written in a session of its own so the caller's stays read-only
+            writer = SessionLocal()
+            try:
+                record_articles(writer)
+            finally:
+                writer.close()
+            state = rollup_state(db)
+        return state is not None and state[0] == last_article_id
+    except Exception as e:
+        logger.error(f"❌ Failed to catch up article rollups: {e}")
+        return False
+
+def count_by(db: Session, dimension: str, since: Optional[datetime] = None) -> List[Tuple[str, int]]:
+    """Article counts per value of a dimension (non-NULL), published since `since`, largest first"""
+    # Recent windows are counted from the in-memory hot set
+    if hot_set.covers(since) and hot_set.ready(db):
+        return hot_set.count_by(dimension, since)
+
+    article_column = getattr(Article, dimension)
+    if not rollups_current(db):
+        query = db.query(article_column, func.count(Article.id)).filter(article_column.isnot(None))
+        if since is not None:
+            query = query.filter(Article.published_at >= to_naive_utc(since))
+        return Counter(dict(query.group_by(article_column).all())).most_common()
+
+    rollup_column = getattr(ArticleRollup, dimension)
+    query = db.query(rollup_column, func.sum(ArticleRollup.count)).filter(rollup_column.isnot(None))
+
+    if since is not None:
+        since = to_naive_utc(since)
+        first_full_hour = ceil_hour(since)
+        query = query.filter(ArticleRollup.hour >= first_full_hour)
+
+    counts = Counter({value: int(total) for value, total in query.group_by(rollup_column).all()})
+
+    # The partial hour at the start of the window comes from the (indexed) articles table
+    if since is not None and since < first_full_hour:
+        counts.update(dict(db.query(article_column, func.count(Article.id)).filter(
+            Article.published_at >= since,
+            Article.published_at < first_full_hour,
+            article_column.isnot(None)
+        ).group_by(article_column).all()))
+
+    return counts.most_common()
+
+def count_matching(
+    db: Session,
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> int:
+    """Number of articles matching equality filters and an inclusive published_at range"""
+    filters = [
+        column == value
+        for column, value in ((ArticleRollup.category, category), (ArticleRollup.source, source), (ArticleRollup.sentiment, sentiment))
+        if value
+    ]
+    article_filters = [
+        column == value
+        for column, value in ((Article.category, category), (Article.source, source), (Article.sentiment, sentiment))
+        if value
+    ]
+    date_from = to_naive_utc(date_from) if date_from is not None else None
+    date_to = to_naive_utc(date_to) if date_to is not None else None
+    if not rollups_current(db):
+        # An exact count rather than a total that misses articles
+        query = db.query(func.count(Article.id)).filter(*article_filters)
+        if date_from is not None:
+            query = query.filter(Article.published_at >= date_from)
+        if date_to is not None:
+            query = query.filter(Article.published_at <= date_to)
+        return query.scalar()
+
+    if date_from is None and date_to is None:
+        return int(db.query(func.coalesce(func.sum(ArticleRollup.count), 0)).filter(*filters).scalar())
+
+    # Whole hours from the rollups, partial edge hours from the (indexed) articles table
+    first_full_hour = ceil_hour(date_from) if date_from is not None else None
+    end_full_hours = floor_hour(date_to) if date_to is not None else None
+    if first_full_hour is not None and end_full_hours is not None and end_full_hours <= first_full_hour:
+        edges = [(date_from, date_to)]
+        hour_filters = None
+    else:
+        hour_filters = [ArticleRollup.hour.isnot(None)]
+        edges = []
+        if first_full_hour is not None:
+            hour_filters.append(ArticleRollup.hour >= first_full_hour)
+            if date_from < first_full_hour:
+                edges.append((date_from, first_full_hour))
+        if end_full_hours is not None:
+            hour_filters.append(ArticleRollup.hour < end_full_hours)
+            edges.append((end_full_hours, date_to))
+
+    total = 0
+    if hour_filters is not None:
+        total += int(db.query(func.coalesce(func.sum(ArticleRollup.count), 0)).filter(*filters, *hour_filters).scalar())
+    for start, end in edges:
+        # Half-open on the rollup side, inclusive of date_to
+        upper = Article.published_at <= end if end == date_to else Article.published_at < end
+        total += db.query(func.count(Article.id)).filter(
+            *article_filters, Article.published_at >= start, upper
+        ).scalar()
+    return total
+
+def timeline(db: Session, since: datetime, interval_hours: int) -> List[Dict]:
+    """Article counts and top categories per interval, with intervals aligned to the epoch"""
+    since = to_naive_utc(since)
+    first_full_hour = ceil_hour(since)
+
+    hourly = []
+    articles = db.query(Article.published_at, Article.category).filter(Article.published_at >= since)
+    if rollups_current(db):
+        hourly = db.query(
+            ArticleRollup.hour, ArticleRollup.category, func.sum(ArticleRollup.count)
+        ).filter(
+            ArticleRollup.hour >= first_full_hour
+        ).group_by(ArticleRollup.hour, ArticleRollup.category).all()
+        # Only the partial first hour is read from the articles table
+        articles = articles.filter(Article.published_at < first_full_hour) if since < first_full_hour else None
+
+    if articles is not None:
+        hourly += [(published_at, category, 1) for published_at, category in articles.all()]
+
+    buckets: Dict[int, Dict] = {}
+    for hour, category, count in hourly:
+        bucket = hour_bucket(to_naive_utc(hour)) // interval_hours
+        data = buckets.setdefault(bucket, {"count": 0, "categories": Counter()})
+        data["count"] += int(count)
+        if category:
+            data["categories"][category] += int(count)
+
+    return [
+        {
+            "timestamp": EPOCH + timedelta(hours=bucket * interval_hours),
+            "count": data["count"],
+            "top_categories": dict(data["categories"].most_common(3))
+        }
+        for bucket, data in sorted(buckets.items())
+    ]
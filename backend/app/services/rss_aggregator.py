@@ -2,15 +2,21 @@ import feedparser
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 import re
 from urllib.parse import urljoin, urlparse
 import logging
+from sqlalchemy.orm import Session
 
-from ..database import SessionLocal, Article
-from ..services.sentiment_analyzer import analyze_sentiment
+from ..database import SessionLocal, Article, ArticleFeatures
 from ..services.content_extractor import extract_article_content
+from ..services.feature_store import extract_features, sentiment_from_features
+from ..services.incremental_index import sync_loaded_indexes
 from ..services.redis_cache import CacheInvalidator
+from ..services.rollups import ensure_rollups, record_articles
+from ..services.topics import match_categories, DEFAULT_CATEGORY
+from ..services.trending_snapshots import run_snapshot_job
+from ..services.vector_index import vector_index
 
 logger = logging.getLogger(__name__)
 
@@ -487,7 +493,8 @@ class RSSAggregator:
             }
         }
     
-    def categorize_article(self, title: str, content: str, source: str) -> str:
+    def categorize_article(self, title: str, content: str, source: str,
+                           features: Optional[Dict] = None) -> str:
         """Categorize article based on source category from OPML feeds"""
         # Get category from source configuration
         source_config = self.sources.get(source, {})
@@ -495,39 +502,12 @@ class RSSAggregator:
             return source_config['category']
         
         # Fallback to keyword-based categorization for unknown sources
-        text = f"{title} {content}".lower()
+        if features is not None:
+            category_hits = features["category_hits"]
+        else:
+            category_hits = match_categories(f"{title} {content}")
         
-        # Machine Learning keywords
-        ml_keywords = ["artificial intelligence", "machine learning", "ai", "ml", "neural", "llm", "gpt", "openai", "anthropic", "chatgpt", "deep learning"]
-        if any(keyword in text for keyword in ml_keywords):
-            return "Machine Learning"
-        
-        # Startup keywords
-        startup_keywords = ["funding", "series a", "series b", "venture", "startup", "vc", "investor", "raise", "valuation", "ipo"]
-        if any(keyword in text for keyword in startup_keywords):
-            return "Startup"
-        
-        # Engineering keywords
-        engineering_keywords = ["engineering", "development", "programming", "software", "architecture", "infrastructure", "devops"]
-        if any(keyword in text for keyword in engineering_keywords):
-            return "Engineering blogs"
-        
-        # Design keywords
-        design_keywords = ["design", "ux", "ui", "user experience", "interface", "usability", "frontend"]
-        if any(keyword in text for keyword in design_keywords):
-            return "Design"
-        
-        # Psychology keywords
-        psychology_keywords = ["psychology", "behavior", "cognitive", "mental", "brain", "mind"]
-        if any(keyword in text for keyword in psychology_keywords):
-            return "Psychology"
-        
-        # Science keywords
-        science_keywords = ["research", "study", "scientific", "experiment", "discovery"]
-        if any(keyword in text for keyword in science_keywords):
-            return "Science"
-        
-        return "Tech News"
+        return category_hits[0] if category_hits else DEFAULT_CATEGORY
     
     def parse_date(self, date_string: str) -> Optional[datetime]:
         """Parse various date formats from RSS feeds"""
@@ -557,25 +537,7 @@ class RSSAggregator:
             if feed.bozo:
                 logger.warning(f"RSS feed parsing warning for {source_name}: {feed.bozo_exception}")
             
-            entries = []
-            for entry in feed.entries:
-                # Extract basic information
-                article_data = {
-                    "title": entry.get("title", "").strip(),
-                    "url": entry.get("link", "").strip(),
-                    "summary": entry.get("summary", "").strip(),
-                    "author": entry.get("author", "").strip(),
-                    "published_at": self.parse_date(entry.get("published", "")),
-                    "source": source_name,
-                }
-                
-                # Extract image URL
-                if hasattr(entry, 'media_thumbnail') and entry.media_thumbnail:
-                    article_data["image_url"] = entry.media_thumbnail[0].get("url", "")
-                elif hasattr(entry, 'media_content') and entry.media_content:
-                    article_data["image_url"] = entry.media_content[0].get("url", "")
-                
-                entries.append(article_data)
+            entries = self.parse_feed_entries(source_name, feed)
             
             logger.info(f"Successfully fetched {len(entries)} entries from {source_name}")
             return entries
@@ -584,11 +546,35 @@ class RSSAggregator:
             logger.error(f"Error fetching RSS feed from {source_name}: {e}")
             return []
     
-    def process_article(self, article_data: Dict) -> Optional[Article]:
+    def parse_feed_entries(self, source_name: str, feed) -> List[Dict]:
+        """Convert the entries of a parsed feed into article dictionaries"""
+        entries = []
+        for entry in feed.entries:
+            # Extract basic information
+            article_data = {
+                "title": entry.get("title", "").strip(),
+                "url": entry.get("link", "").strip(),
+                "summary": entry.get("summary", "").strip(),
+                "author": entry.get("author", "").strip(),
+                "published_at": self.parse_date(entry.get("published", "")),
+                "source": source_name,
+            }
+            
+            # Extract image URL
+            if hasattr(entry, 'media_thumbnail') and entry.media_thumbnail:
+                article_data["image_url"] = entry.media_thumbnail[0].get("url", "")
+            elif hasattr(entry, 'media_content') and entry.media_content:
+                article_data["image_url"] = entry.media_content[0].get("url", "")
+            
+            entries.append(article_data)
+        
+        return entries
+    
+    def process_article(self, article_data: Dict, extract_content: bool = True) -> Optional[Article]:
         """Process a single article: extract content, categorize, analyze sentiment"""
         try:
             # Extract full content from article URL
-            full_content = extract_article_content(article_data["url"])
+            full_content = extract_article_content(article_data["url"]) if extract_content else None
             if not full_content:
                 # Fallback to RSS summary but clean HTML and apply same cleaning
                 from .content_extractor import ContentExtractor
@@ -604,15 +590,19 @@ class RSSAggregator:
                 else:
                     full_content = ""
             
+            # Parse the text once; categorization and sentiment read the stored features
+            features = extract_features(article_data["title"], full_content)
+            
             # Categorize article
             category = self.categorize_article(
                 article_data["title"], 
                 full_content, 
-                article_data["source"]
+                article_data["source"],
+                features=features
             )
             
             # Analyze sentiment
-            sentiment = analyze_sentiment(f"{article_data['title']} {full_content}")
+            sentiment = sentiment_from_features(features)
             
             # Create article object
             article = Article(
@@ -625,7 +615,8 @@ class RSSAggregator:
                 source=article_data["source"],
                 category=category,
                 sentiment=sentiment,
-                image_url=article_data.get("image_url", "")
+                image_url=article_data.get("image_url", ""),
+                features=ArticleFeatures(**features)
             )
             
             return article
@@ -634,58 +625,120 @@ class RSSAggregator:
             logger.error(f"Error processing article {article_data.get('title', 'Unknown')}: {e}")
             return None
     
+    def get_existing_urls(self, db: Session, urls: List[str]) -> Set[str]:
+        """Return the subset of URLs that are already stored"""
+        existing = set()
+        urls = [url for url in set(urls) if url]
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            rows = db.query(Article.url).filter(Article.url.in_(chunk)).all()
+            existing.update(url for (url,) in rows)
+        return existing
+    
+    def save_articles(self, db: Session, articles: List[Article]) -> List[Article]:
+        """Bulk insert processed articles, skipping URLs that already exist"""
+        # Drop duplicates within the batch and against the database
+        unique_articles = {}
+        for article in articles:
+            if article is not None and article.url and article.url not in unique_articles:
+                unique_articles[article.url] = article
+        
+        existing_urls = self.get_existing_urls(db, list(unique_articles))
+        new_articles = [
+            article for url, article in unique_articles.items()
+            if url not in existing_urls
+        ]
+        if not new_articles:
+            return []
+        
+        try:
+            db.add_all(new_articles)
+            db.commit()
+            inserted = new_articles
+        except Exception as batch_error:
+            # Fall back to row-by-row commits so one bad article doesn't sink the batch
+            db.rollback()
+            logger.warning(f"⚠️ Bulk insert failed, retrying individually: {batch_error}")
+            inserted = []
+            for article in new_articles:
+                try:
+                    db.add(article)
+                    db.commit()
+                    inserted.append(article)
+                except Exception as commit_error:
+                    db.rollback()
+                    logger.error(f"❌ Failed to commit article '{article.title}': {commit_error}")
+        
+        if inserted:
+            try:
+                record_articles(db)
+            except Exception as rollup_error:
+                db.rollback()
+                logger.error(f"❌ Failed to update article rollups: {rollup_error}")
+            
+            # Local embeddings for related articles and semantic search
+            try:
+                vector_index.embed_articles(db, [article.id for article in inserted])
+            except Exception as vector_error:
+                logger.error(f"❌ Failed to embed articles: {vector_error}")
+            
+            # In-process indexes (e.g. trending) pick up the batch immediately
+            sync_loaded_indexes(db)
+            
+            # Invalidate relevant caches once per batch of new articles
+            CacheInvalidator.invalidate_articles()
+            CacheInvalidator.invalidate_trending()
+            CacheInvalidator.invalidate_search()
+            logger.info(f"🗑️ Cache invalidated after inserting {len(inserted)} articles")
+        
+        return inserted
+    
     def aggregate_news(self) -> int:
-        """Aggregate news from all configured sources with incremental commits"""
+        """Aggregate news from all configured sources with one bulk insert per source"""
         db = SessionLocal()
         total_new_articles = 0
         
         try:
+            # Databases created before the rollups existed get them built once
+            ensure_rollups(db)
+            
             for source_name, source_config in self.sources.items():
                 logger.info(f"Processing source: {source_name}")
                 
                 # Fetch RSS entries
                 entries = self.fetch_feed_entries(source_name, source_config)
                 
-                for entry_data in entries:
-                    try:
-                        # Check if article already exists
-                        existing_article = db.query(Article).filter(
-                            Article.url == entry_data["url"]
-                        ).first()
-                        
-                        if existing_article:
+                try:
+                    # Skip articles we already have before doing any expensive extraction
+                    existing_urls = self.get_existing_urls(db, [entry["url"] for entry in entries])
+                    
+                    articles = []
+                    for entry_data in entries:
+                        if entry_data["url"] in existing_urls:
                             logger.debug(f"Article already exists: {entry_data['title']}")
                             continue
                         
                         # Process new article
                         article = self.process_article(entry_data)
                         if article:
-                            db.add(article)
-                            
-                            # Commit each article individually
-                            try:
-                                db.commit()
-                                total_new_articles += 1
-                                logger.info(f"✅ Added new article: {article.title}")
-                                
-                                # Invalidate relevant caches when new articles are added
-                                if total_new_articles % 5 == 0:  # Batch invalidation every 5 articles
-                                    CacheInvalidator.invalidate_articles()
-                                    CacheInvalidator.invalidate_trending()
-                                    logger.info("🗑️ Cache invalidated due to new articles")
-                                    
-                            except Exception as commit_error:
-                                db.rollback()
-                                logger.error(f"❌ Failed to commit article '{entry_data.get('title', 'Unknown')}': {commit_error}")
-                                continue
-                                
-                    except Exception as article_error:
-                        logger.error(f"❌ Failed to process article '{entry_data.get('title', 'Unknown')}': {article_error}")
-                        # Continue processing other articles
-                        continue
+                            articles.append(article)
+                    
+                    inserted = self.save_articles(db, articles)
+                    total_new_articles += len(inserted)
+                    if inserted:
+                        logger.info(f"✅ Added {len(inserted)} new articles from {source_name}")
+                        
+                except Exception as source_error:
+                    db.rollback()
+                    logger.error(f"❌ Failed to process source '{source_name}': {source_error}")
+                    # Continue processing other sources
+                    continue
             
             logger.info(f"News aggregation completed. Added {total_new_articles} new articles.")
             
+            # Refresh the materialized trending snapshots with the new articles
+            run_snapshot_job()
+            
         except Exception as e:
             logger.error(f"Error during news aggregation: {e}")
         finally:
@@ -0,0 +1,267 @@
+"""
+Full-text search backends
+One interface over SQLite FTS5 (external-content table kept in sync by
+triggers), Postgres tsvector + GIN, and a plain ILIKE scan as the fallback.
+Relevance ranking boosts title matches over summary and content. Queries using
+the search syntax (phrases, AND/OR/NOT, field prefixes) are translated leaf by
+leaf into SQL and returned newest first.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from sqlalchemy import and_, func, literal_column, not_, or_, select, table, column, text
+from sqlalchemy.orm import Query
+
+from ..database import Article, engine
+from .query_parser import SEARCH_TOKEN_PATTERN, And, Attribute, Not, Or, Phrase, parse_query
+
+logger = logging.getLogger(__name__)
+
+# Relative field weights for ranking
+TITLE_WEIGHT = 10.0
+SUMMARY_WEIGHT = 3.0
+CONTENT_WEIGHT = 1.0
+
+class SearchBackend(ABC):
+    """Text matching and relevance ordering for article queries"""
+
+    name = "base"
+    indexed = False  # whether text matching avoids scanning every row
+
+    def setup(self):
+        """Create index structures if they do not exist yet"""
+
+    def filter(self, query: Query, text_query: str) -> Query:
+        """Restrict the query to articles matching the text"""
+        plan = parse_query(text_query)
+        if plan is None or plan.simple:
+            return self.filter_text(query, text_query)
+        return query.filter(self.plan_clause(plan.root))
+
+    def search(self, query: Query, text_query: str) -> Query:
+        """Restrict to matching articles, ordered by relevance then recency"""
+        plan = parse_query(text_query)
+        if plan is None or plan.simple:
+            return self.search_text(query, text_query)
+        # A boolean query has no single relevance expression here; newest first
+        return self.filter(query, text_query).order_by(Article.published_at.desc(), Article.id.desc())
+
+    def plan_clause(self, node):
+        """SQL condition for a query plan node"""
+        if isinstance(node, And):
+            return and_(*(self.plan_clause(child) for child in node.children))
+        if isinstance(node, Or):
+            return or_(*(self.plan_clause(child) for child in node.children))
+        if isinstance(node, Not):
+            return not_(self.plan_clause(node.child))
+        # coalesce() so NOT over a NULL column is true rather than NULL
+        if isinstance(node, Attribute):
+            return func.lower(func.coalesce(getattr(Article, node.field), "")) == node.value
+        return self.match(node)
+
+    @abstractmethod
+    def match(self, node):
+        """SQL condition for a word (Term) or phrase, in the title or any text field"""
+
+    @abstractmethod
+    def filter_text(self, query: Query, text_query: str) -> Query:
+        """filter() for plain text"""
+
+    @abstractmethod
+    def search_text(self, query: Query, text_query: str) -> Query:
+        """search() for plain text"""
+
+class LikeSearchBackend(SearchBackend):
+    """Substring matching with ILIKE; scans every row"""
+
+    name = "ilike"
+
+    def match(self, node):
+        search_term = f"%{node.text}%"
+        fields = (Article.title,) if node.field == "title" else (Article.title, Article.content, Article.summary)
+        return or_(*(func.coalesce(field, "").ilike(search_term) for field in fields))
+
+    def filter_text(self, query: Query, text_query: str) -> Query:
+        search_term = f"%{text_query}%"
+        return query.filter(
+            or_(
+                Article.title.ilike(search_term),
+                Article.content.ilike(search_term),
+                Article.summary.ilike(search_term)
+            )
+        )
+
+    def search_text(self, query: Query, text_query: str) -> Query:
+        # Articles with the search term in the title first, then by date
+        return self.filter_text(query, text_query).order_by(
+            Article.title.ilike(f"%{text_query}%").desc(),
+            Article.published_at.desc()
+        )
+
+class IndexedSearchBackend(SearchBackend):
+    """Backend with a database-side index; uses ILIKE until setup() has succeeded"""
+
+    def __init__(self):
+        self.ready = False
+        self.fallback = LikeSearchBackend()
+
+    @property
+    def indexed(self) -> bool:
+        return self.ready
+
+    @abstractmethod
+    def create_index(self):
+        """Create the database-side index and the triggers or columns that keep it current"""
+
+    def setup(self):
+        try:
+            self.create_index()
+            self.ready = True
+            logger.info(f"🔎 Full-text search backend: {self.name}")
+        except Exception as e:
+            logger.error(f"❌ Failed to set up {self.name} search, falling back to ILIKE: {e}")
+
+class SQLiteFTS5Backend(IndexedSearchBackend):
+    """SQLite FTS5 index over title, summary and content, ranked by BM25"""
+
+    name = "fts5"
+    fts_table = table("articles_fts", column("rowid"))
+
+    SETUP_STATEMENTS = [
+        """CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, title, summary, content)
+            VALUES (new.id, new.title, new.summary, new.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+            VALUES ('delete', old.id, old.title, old.summary, old.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, summary, content ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+            VALUES ('delete', old.id, old.title, old.summary, old.content);
+            INSERT INTO articles_fts(rowid, title, summary, content)
+            VALUES (new.id, new.title, new.summary, new.content);
+        END""",
+    ]
+
+    def create_index(self):
+        with engine.begin() as connection:
+            exists = connection.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+            )).first()
+            if not exists:
+                connection.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+                    "title, summary, content, content='articles', content_rowid='id', "
+                    "tokenize='porter unicode61 remove_diacritics 2')"
+                ))
+            for statement in self.SETUP_STATEMENTS:
+                connection.execute(text(statement))
+            if not exists:
+                # Index articles inserted before the triggers existed
+                connection.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+                logger.info("🔎 Built SQLite FTS5 index for articles")
+
+    @staticmethod
+    def match_expression(text_query: str) -> str:
+        """Quote each word so user input is never parsed as FTS5 query syntax"""
+        return " ".join(f'"{token}"' for token in SEARCH_TOKEN_PATTERN.findall(text_query))
+
+    def match(self, node):
+        if not self.ready:
+            return self.fallback.match(node)
+        tokens = node.tokens if isinstance(node, Phrase) else (node.token,)
+        # One quoted string is an FTS5 phrase, optionally limited to a column
+        expression = '"' + " ".join(tokens) + '"'
+        if node.field == "title":
+            expression = f"title : {expression}"
+        matching_ids = select(self.fts_table.c.rowid).where(
+            literal_column("articles_fts").op("MATCH")(expression)
+        )
+        return Article.id.in_(matching_ids)
+
+    def filter_text(self, query: Query, text_query: str) -> Query:
+        expression = self.match_expression(text_query)
+        if not self.ready or not expression:
+            return self.fallback.filter_text(query, text_query)
+        # Anonymous bind parameters, so stacked filters each keep their own expression
+        matching_ids = select(self.fts_table.c.rowid).where(
+            literal_column("articles_fts").op("MATCH")(expression)
+        )
+        return query.filter(Article.id.in_(matching_ids))
+
+    def search_text(self, query: Query, text_query: str) -> Query:
+        expression = self.match_expression(text_query)
+        if not self.ready or not expression:
+            return self.fallback.search_text(query, text_query)
+        # bm25() is lower for better matches
+        return query.join(
+            self.fts_table, self.fts_table.c.rowid == Article.id
+        ).filter(
+            literal_column("articles_fts").op("MATCH")(expression)
+        ).order_by(
+            func.bm25(literal_column("articles_fts"), TITLE_WEIGHT, SUMMARY_WEIGHT, CONTENT_WEIGHT),
+            Article.published_at.desc()
+        )
+
+class PostgresSearchBackend(IndexedSearchBackend):
+    """Postgres weighted tsvector column with a GIN index, ranked by ts_rank_cd"""
+
+    name = "tsvector"
+    search_vector = literal_column("articles.search_vector")
+
+    SETUP_STATEMENTS = [
+        """ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(content, '')), 'D')
+            ) STORED""",
+        "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING GIN (search_vector)",
+    ]
+
+    def create_index(self):
+        with engine.begin() as connection:
+            for statement in self.SETUP_STATEMENTS:
+                connection.execute(text(statement))
+
+    @staticmethod
+    def ts_query(text_query: str):
+        return func.websearch_to_tsquery('english', text_query)
+
+    def match(self, node):
+        if not self.ready:
+            return self.fallback.match(node)
+        tokens = node.tokens if isinstance(node, Phrase) else (node.token,)
+        if node.field == "title":
+            # Title lexemes carry weight A
+            return self.search_vector.op('@@')(func.to_tsquery('english', " <-> ".join(f"{token}:A" for token in tokens)))
+        return self.search_vector.op('@@')(func.phraseto_tsquery('english', " ".join(tokens)))
+
+    def filter_text(self, query: Query, text_query: str) -> Query:
+        if not self.ready:
+            return self.fallback.filter_text(query, text_query)
+        return query.filter(self.search_vector.op('@@')(self.ts_query(text_query)))
+
+    def search_text(self, query: Query, text_query: str) -> Query:
+        if not self.ready:
+            return self.fallback.search_text(query, text_query)
+        # Weights for D, C, B, A: content, (unused), summary, title
+        weights = literal_column(
+            f"'{{{CONTENT_WEIGHT / TITLE_WEIGHT}, 0, {SUMMARY_WEIGHT / TITLE_WEIGHT}, 1.0}}'::float4[]"
+        )
+        return self.filter_text(query, text_query).order_by(
+            func.ts_rank_cd(weights, self.search_vector, self.ts_query(text_query)).desc(),
+            Article.published_at.desc()
+        )
+
+def create_search_backend() -> SearchBackend:
+    """Pick the full-text backend for the configured database"""
+    if engine.dialect.name == "postgresql":
+        return PostgresSearchBackend()
+    if engine.dialect.name == "sqlite":
+        return SQLiteFTS5Backend()
+    return LikeSearchBackend()
+
+# Global search backend instance; setup() runs at application startup
+search_backend = create_search_backend()
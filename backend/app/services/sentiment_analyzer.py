@@ -1,9 +1,20 @@
 import re
-from typing import Dict, List
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Tokenizer patterns, compiled once at import
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+WORD_PATTERN = re.compile(r'[a-z]+')
+
+# Lexicon ids used by the batch scorer (columns of the count matrix)
+POSITIVE_ID, NEGATIVE_ID, NEUTRAL_ID, OTHER_ID = 0, 1, 2, 3
+
 class SentimentAnalyzer:
     def __init__(self):
         # Positive sentiment keywords
@@ -30,29 +41,42 @@ class SentimentAnalyzer:
             'announcement', 'statement', 'update', 'information', 'data',
             'conference', 'meeting', 'discussion', 'interview', 'opinion'
         }
+        
+        # Token -> lexicon id, so a single lookup classifies each token
+        self.lexicon_ids = {}
+        for lexicon_id, keywords in (
+            (POSITIVE_ID, self.positive_keywords),
+            (NEGATIVE_ID, self.negative_keywords),
+            (NEUTRAL_ID, self.neutral_keywords),
+        ):
+            for keyword in keywords:
+                self.lexicon_ids[keyword] = lexicon_id
     
     def preprocess_text(self, text: str) -> str:
         """Clean and preprocess text for sentiment analysis"""
         if not text:
             return ""
         
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove URLs, email addresses, and special characters
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-        text = re.sub(r'\S+@\S+', '', text)
-        text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+        return ' '.join(self.tokenize(text))
+    
+    def tokenize(self, text: str) -> List[str]:
+        """Lowercase, drop URLs and email addresses, and split into letter-only words"""
+        if not text:
+            return []
         
-        # Remove extra whitespace
-        text = ' '.join(text.split())
+        text = text.lower()
+        # Cheap substring checks skip the regex passes for most texts
+        if 'http' in text:
+            text = URL_PATTERN.sub('', text)
+        if '@' in text:
+            text = EMAIL_PATTERN.sub('', text)
         
-        return text
+        # Runs of letters are exactly the words left after replacing non-letters with spaces
+        return WORD_PATTERN.findall(text)
     
     def calculate_sentiment_score(self, text: str) -> Dict[str, float]:
         """Calculate sentiment scores based on keyword matching"""
-        processed_text = self.preprocess_text(text)
-        words = processed_text.split()
+        words = self.tokenize(text)
         
         if not words:
             return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
@@ -111,9 +135,81 @@ class SentimentAnalyzer:
         except Exception:
             return 0.5
 
+    def count_lexicon_hits(self, texts: Iterable[Optional[str]]) -> np.ndarray:
+        """Count positive/negative/neutral/other tokens per text as an (n, 4) array"""
+        lexicon_get = self.lexicon_ids.get
+        token_ids = []
+        lengths = []
+        
+        for text in texts:
+            tokens = self.tokenize(text or "")
+            lengths.append(len(tokens))
+            token_ids.extend(map(lexicon_get, tokens, repeat(OTHER_ID)))
+        
+        n = len(lengths)
+        if n == 0:
+            return np.zeros((0, 4), dtype=np.int64)
+        
+        # One bincount over (document, lexicon id) pairs for the whole batch
+        doc_ids = np.repeat(np.arange(n, dtype=np.int64), lengths)
+        flat = doc_ids * 4 + np.asarray(token_ids, dtype=np.int64)
+        return np.bincount(flat, minlength=n * 4).reshape(n, 4)
+    
+    def scores_from_counts(self, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized equivalent of calculate_sentiment_score for a count matrix"""
+        total = counts.sum(axis=1)
+        safe_total = np.maximum(total, 1)
+        
+        positive = counts[:, POSITIVE_ID] / safe_total
+        negative = counts[:, NEGATIVE_ID] / safe_total
+        
+        # Boost scores based on keyword density
+        positive = np.where(counts[:, POSITIVE_ID] > 0, positive * 2, positive)
+        negative = np.where(counts[:, NEGATIVE_ID] > 0, negative * 2, negative)
+        neutral = np.maximum(0.1, 1.0 - positive - negative)
+        
+        # Texts without any words are fully neutral
+        empty = total == 0
+        neutral = np.where(empty, 1.0, neutral)
+        
+        return positive, negative, neutral
+    
+    def labels_from_counts(self, counts: np.ndarray, text_lengths: np.ndarray) -> Tuple[List[str], np.ndarray]:
+        """Classify count rows; text_lengths are stripped text lengths used for the short-text rule"""
+        positive, negative, neutral = self.scores_from_counts(counts)
+        max_score = np.maximum(np.maximum(positive, negative), neutral)
+        
+        is_positive = (positive == max_score) & (positive > 0.02)
+        is_negative = ~is_positive & (negative == max_score) & (negative > 0.02)
+        too_short = np.asarray(text_lengths) < 10
+        
+        labels = np.where(is_positive, "positive", np.where(is_negative, "negative", "neutral"))
+        labels = np.where(too_short, "neutral", labels)
+        confidence = np.minimum(max_score * 10, 1.0)
+        
+        return labels.tolist(), confidence
+    
+    def analyze_many(self, texts: List[Optional[str]]) -> Tuple[List[str], np.ndarray]:
+        """Classify a batch of texts, returning labels and get_sentiment_confidence scores"""
+        texts = list(texts)
+        if not texts:
+            return [], np.zeros(0, dtype=np.float64)
+        
+        text_lengths = np.fromiter(
+            (len(text.strip()) if text else 0 for text in texts),
+            dtype=np.int64,
+            count=len(texts)
+        )
+        return self.labels_from_counts(self.count_lexicon_hits(texts), text_lengths)
+
 # Global analyzer instance
 analyzer = SentimentAnalyzer()
 
 def analyze_sentiment(text: str) -> str:
     """Helper function for sentiment analysis"""
-    return analyzer.analyze_sentiment(text)
\ No newline at end of file
+    return analyzer.analyze_sentiment(text)
+
+def analyze_sentiment_many(texts: List[Optional[str]]) -> List[str]:
+    """Helper function for batch sentiment analysis"""
+    labels, _ = analyzer.analyze_many(texts)
+    return labels
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""
+Typo-tolerant query correction
+A SymSpell-style dictionary: every corpus word's deletions (of up to
+MAX_EDIT_DISTANCE characters from its first PREFIX_LENGTH) are precomputed,
+so candidates for a misspelled word are the words sharing one of its own
+deletions - a few binary searches - verified by edit distance. Deletions are
+stored as sorted crc32 hashes, which keeps the dictionary compact; a hash
+collision only adds a candidate that verification drops.
+"""
+
+import re
+import zlib
+from collections import Counter
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..database import Article
+from .incremental_index import IncrementalIndex
+from .inverted_index import CONTENT_CHARS
+from .query_parser import ATTRIBUTE_FIELDS, OPERATORS, SEARCH_TOKEN_PATTERN, TEXT_FIELDS, tokenize
+
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+MIN_WORD_LENGTH = 4  # shorter words have too many neighbours to correct reliably
+MIN_WORD_COUNT = 2  # articles a word must appear in to be offered as a correction
+MAX_CACHED_CORRECTIONS = 10000
+
+FIELD_NAMES = set(TEXT_FIELDS + ATTRIBUTE_FIELDS)
+ATTRIBUTE_PREFIX = re.compile(r'\b(?:' + "|".join(ATTRIBUTE_FIELDS) + r'):"?$', re.IGNORECASE)
+
+def deletions(word: str, max_distance: int = MAX_EDIT_DISTANCE) -> set:
+    """The word's prefix with up to max_distance characters removed (including none)"""
+    prefix = word[:PREFIX_LENGTH]
+    results = {prefix}
+    for removed in range(1, min(max_distance, len(prefix) - 1) + 1):
+        for positions in combinations(range(len(prefix)), removed):
+            results.add("".join(char for index, char in enumerate(prefix) if index not in positions))
+    return results
+
+def hash_keys(keys) -> np.ndarray:
+    return np.fromiter((zlib.crc32(key.encode()) for key in keys), dtype=np.uint32)
+
+def edit_distance(first: str, second: str, max_distance: int) -> int:
+    """Optimal string alignment distance (transpositions count once), or max_distance + 1 if larger"""
+    if abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+    # Only the differing middle needs the dynamic program
+    while first and second and first[-1] == second[-1]:
+        first, second = first[:-1], second[:-1]
+    common = 0
+    while common < min(len(first), len(second)) and first[common] == second[common]:
+        common += 1
+    first, second = first[common:], second[common:]
+    if not first or not second:
+        return len(first) + len(second)
+
+    over = max_distance + 1
+    width = len(second)
+    before, previous_row = None, list(range(width + 1))
+    for i in range(1, len(first) + 1):
+        row = [over] * (width + 1)
+        row[0] = i
+        char = first[i - 1]
+        row_min = i
+        # Cells further than max_distance from the diagonal cannot lead to a match
+        for j in range(max(1, i - max_distance), min(width, i + max_distance) + 1):
+            value = previous_row[j - 1] + (char != second[j - 1])
+            if previous_row[j] + 1 < value:
+                value = previous_row[j] + 1
+            if row[j - 1] + 1 < value:
+                value = row[j - 1] + 1
+            if i > 1 and j > 1 and char == second[j - 2] and first[i - 2] == second[j - 1] and before[j - 2] + 1 < value:
+                value = before[j - 2] + 1
+            row[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return over
+        before, previous_row = previous_row, row
+    return min(previous_row[-1], over)
+
+def correctable(word: str) -> bool:
+    return len(word) >= MIN_WORD_LENGTH and word.isalpha()
+
+class SpellChecker(IncrementalIndex):
+    """Corpus word counts plus a hashed deletion dictionary for corrections"""
+
+    name = "spell checker"
+    batch_size = 1000  # rows carry article bodies
+
+    def __init__(self):
+        super().__init__()
+        self.clear()
+
+    def clear(self):
+        self.counts = Counter()  # word -> articles containing it
+        self.words: List[str] = []  # dictionary words, in the order they qualified
+        # Sorted deletion hashes and the dictionary word each belongs to, swapped in together
+        self.deletions: Tuple[np.ndarray, np.ndarray] = (np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.int32))
+        self._new_words: List[str] = []
+        # Corrections already worked out; valid until the vocabulary changes
+        self._corrections: Dict[str, Optional[str]] = {}
+        self._changed = False
+
+    def load_rows(self, db, after_id: int, limit: int) -> Sequence:
+        return db.query(
+            Article.id, Article.title, Article.summary, Article.content
+        ).filter(Article.id > after_id).order_by(Article.id).limit(limit).all()
+
+    def add_rows(self, rows: Sequence):
+        for _, title, summary, content in rows:
+            # Same text the search index covers, so a known word is a searchable word
+            words = set(tokenize(title)) | set(tokenize(summary)) | set(tokenize((content or "")[:CONTENT_CHARS]))
+            for word in words:
+                self.counts[word] += 1
+                if self.counts[word] == MIN_WORD_COUNT and correctable(word):
+                    self._new_words.append(word)
+        self._changed = True
+
+    def after_sync(self):
+        if self._changed:
+            self._corrections = {}
+            self._changed = False
+        if not self._new_words:
+            return
+        new_words, self._new_words = self._new_words, []
+        first_id = len(self.words)
+        self.words.extend(new_words)
+
+        keys, owners = [], []
+        for word_id, word in enumerate(new_words, start=first_id):
+            word_deletions = deletions(word)
+            keys.extend(word_deletions)
+            owners.extend([word_id] * len(word_deletions))
+        hashes, word_ids = self.deletions
+        hashes = np.concatenate([hashes, hash_keys(keys)])
+        word_ids = np.concatenate([word_ids, np.asarray(owners, dtype=np.int32)])
+        order = np.argsort(hashes, kind="stable")
+        self.deletions = (hashes[order], word_ids[order])
+
+    def correct(self, word: str) -> Optional[str]:
+        """Closest more common spelling of a word the corpus does not contain, if any"""
+        word = word.lower()
+        if not correctable(word) or self.counts.get(word):
+            return None
+        corrections = self._corrections
+        if word in corrections:
+            return corrections[word]
+
+        hashes, word_ids = self.deletions
+        lookups = hash_keys(deletions(word))
+        starts = np.searchsorted(hashes, lookups, side="left")
+        lengths = np.searchsorted(hashes, lookups, side="right") - starts
+        # Every slot of every matching hash run
+        slots = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        candidates = np.unique(word_ids[slots]).tolist()
+
+        best, best_rank = None, None
+        for word_id in candidates:
+            candidate = self.words[word_id]
+            distance = edit_distance(word, candidate, MAX_EDIT_DISTANCE)
+            if distance > MAX_EDIT_DISTANCE:
+                continue
+            # Closest first, then most common, then alphabetical
+            rank = (distance, -self.counts[candidate], candidate)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = candidate, rank
+        if len(corrections) >= MAX_CACHED_CORRECTIONS:
+            corrections.clear()
+        corrections[word] = best
+        return best
+
+    def did_you_mean(self, text: str) -> Optional[str]:
+        """The text with misspelled words corrected, or None if nothing needed correcting"""
+        corrections: Dict[str, Optional[str]] = {}
+
+        def replace(match) -> str:
+            word = match.group(0)
+            # Leave query syntax (operators, field prefixes) alone
+            if word in OPERATORS or (word.lower() in FIELD_NAMES and text[match.end():match.end() + 1] == ":"):
+                return word
+            # Attribute values (source:..., category:...) are not corpus words
+            if ATTRIBUTE_PREFIX.search(text, 0, match.start()):
+                return word
+            if word not in corrections:
+                corrections[word] = self.correct(word)
+            return corrections[word] or word
+
+        corrected = SEARCH_TOKEN_PATTERN.sub(replace, text)
+        return corrected if any(corrections.values()) else None
+
+# Global spell checker instance
+spell_checker = SpellChecker()
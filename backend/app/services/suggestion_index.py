@@ -0,0 +1,89 @@
+"""
+Prefix index for search suggestions
+Title words and tech phrases with their document frequency, kept as a sorted
+term list so each keystroke is a binary search instead of a table scan.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from typing import List, Sequence
+
+import numpy as np
+
+from ..database import Article
+from .incremental_index import IncrementalIndex
+from .keyword_extractor import STOP_WORDS, WORD_PATTERN, extract_tech_phrases
+
+MIN_WORD_LENGTH = 3
+PREFIX_END = "\U0010ffff"  # sorts after every character a term can continue with
+
+def suggestion_terms(title: str) -> set:
+    """Distinct lowercase words and phrases a title contributes"""
+    if not title:
+        return set()
+    terms = {
+        word for word in WORD_PATTERN.findall(title.lower())
+        if len(word) >= MIN_WORD_LENGTH and word not in STOP_WORDS and not word.isdigit()
+    }
+    terms.update(phrase.lower() for phrase in extract_tech_phrases(title))
+    return terms
+
+class SuggestionIndex(IncrementalIndex):
+    """Sorted title terms with per-term document frequency"""
+
+    name = "suggestion index"
+
+    def __init__(self):
+        super().__init__()
+        self.clear()
+
+    def clear(self):
+        self.frequencies = Counter()
+        self.sorted_terms: List[str] = []
+        self.sorted_counts = np.zeros(0, dtype=np.int64)
+        self._dirty = False
+
+    def load_rows(self, db, after_id: int, limit: int) -> Sequence:
+        return db.query(Article.id, Article.title).filter(
+            Article.id > after_id
+        ).order_by(Article.id).limit(limit).all()
+
+    def add_rows(self, rows: Sequence):
+        for _, title in rows:
+            self.frequencies.update(suggestion_terms(title))
+        self._dirty = True
+
+    def after_sync(self):
+        if not self._dirty:
+            return
+        # Swap in new arrays so concurrent readers always see a consistent pair
+        terms = sorted(self.frequencies)
+        counts = np.fromiter((self.frequencies[term] for term in terms), dtype=np.int64, count=len(terms))
+        self.sorted_terms, self.sorted_counts = terms, counts
+        self._dirty = False
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        """Terms starting with prefix, most frequent first"""
+        prefix = " ".join(prefix.lower().split())
+        if not prefix:
+            return []
+
+        terms, counts = self.sorted_terms, self.sorted_counts
+        start = bisect_left(terms, prefix)
+        end = bisect_left(terms, prefix + PREFIX_END, start)
+        if start == end:
+            return []
+
+        matches = counts[start:end]
+        if len(matches) > limit:
+            # Everything at least as frequent as the limit-th term, so ties resolve alphabetically
+            threshold = np.partition(matches, len(matches) - limit)[len(matches) - limit]
+            candidates = np.flatnonzero(matches >= threshold)
+        else:
+            candidates = np.arange(len(matches))
+        # Most frequent first, alphabetical among equals
+        ranked = sorted(candidates.tolist(), key=lambda position: (-matches[position], position))
+        return [terms[start + position] for position in ranked[:limit]]
+
+# Global index instance
+suggestion_index = SuggestionIndex()
@@ -0,0 +1,81 @@
+"""
+Compact per-term hourly count history
+A term x hour float32 matrix used as a ring buffer (column = hour % length),
+so burst scores for every term are computed with a few vectorized operations.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+class TermHistory:
+    """Hourly counts for every term over the last `hours` hours"""
+
+    def __init__(self, hours: int, initial_terms: int = 1024):
+        self.hours = hours
+        self.term_index: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.counts = np.zeros((initial_terms, hours), dtype=np.float32)
+        # Absolute hour currently stored in each column; -1 for never written
+        self.column_hours = np.full(hours, -1, dtype=np.int64)
+
+    def _row(self, term: str) -> int:
+        row = self.term_index.get(term)
+        if row is None:
+            row = len(self.terms)
+            if row == len(self.counts):
+                grown = np.zeros((len(self.counts) * 2, self.hours), dtype=np.float32)
+                grown[:row] = self.counts
+                self.counts = grown
+            self.term_index[term] = row
+            self.terms.append(term)
+        return row
+
+    def add(self, hour: int, term_counts: Dict[str, int]):
+        """Add counts for one hour"""
+        column = hour % self.hours
+        stored_hour = self.column_hours[column]
+        if hour < stored_hour:
+            return  # older than the history that is kept
+        if hour > stored_hour:
+            # The column is reused for a newer hour
+            self.counts[:, column] = 0
+            self.column_hours[column] = hour
+
+        rows = [self._row(term) for term in term_counts]
+        self.counts[rows, column] += np.fromiter(term_counts.values(), dtype=np.float32, count=len(rows))
+
+    def series(self, end_hour: int, length: int) -> np.ndarray:
+        """(terms, length) counts for the hours ending at end_hour, oldest first"""
+        length = min(length, self.hours)
+        hours = np.arange(end_hour - length + 1, end_hour + 1)
+        columns = hours % self.hours
+        valid = (self.column_hours[columns] == hours).astype(np.float32)
+        return self.counts[:len(self.terms), columns] * valid
+
+    def compact(self, end_hour: int):
+        """Drop terms with no counts left in the history"""
+        alive = self.series(end_hour, self.hours).any(axis=1)
+        if alive.all():
+            return
+        keep = np.flatnonzero(alive)
+        self.terms = [self.terms[row] for row in keep]
+        self.term_index = {term: row for row, term in enumerate(self.terms)}
+        counts = np.zeros((max(len(keep) * 2, 1024), self.hours), dtype=np.float32)
+        counts[:len(keep)] = self.counts[keep]
+        self.counts = counts
+
+    def burst_scores(
+        self, end_hour: int, recent_hours: int, baseline_hours: int, prior_variance: float = 1.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-term (recent count, baseline hourly mean, z-score of the recent hourly rate)"""
+        baseline_hours = max(1, min(baseline_hours, self.hours - recent_hours))
+        matrix = self.series(end_hour, baseline_hours + recent_hours)
+        baseline, recent = matrix[:, :baseline_hours], matrix[:, baseline_hours:]
+
+        recent_count = recent.sum(axis=1)
+        baseline_mean = baseline.mean(axis=1)
+        # The prior variance keeps terms without history (zero variance) finite
+        standard_error = np.sqrt((baseline.var(axis=1) + prior_variance) / recent_hours)
+        z_scores = (recent_count / recent_hours - baseline_mean) / standard_error
+        return recent_count, baseline_mean, z_scores
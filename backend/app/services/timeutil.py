@@ -0,0 +1,19 @@
+"""
+Timestamp helpers shared by the indexes, rollups and cache keys
+Feed timestamps arrive both naive and timezone-aware; everything is stored
+and compared as naive UTC.
+"""
+
+from datetime import datetime
+
+EPOCH = datetime(1970, 1, 1)
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Normalize feed timestamps (some carry a timezone) to naive UTC"""
+    if value.tzinfo is not None:
+        value = (value - value.utcoffset()).replace(tzinfo=None)
+    return value
+
+def hour_bucket(value: datetime) -> int:
+    """Hours since the epoch for a naive UTC datetime"""
+    return int((value - EPOCH).total_seconds() // 3600)
@@ -0,0 +1,58 @@
+"""
+Keyword tables for fallback categorization and related-topic detection
+Both tables are compiled into one matcher at import; keywords match at the
+start of a word, and short acronyms plus WHOLE_WORD_KEYWORDS only as whole words.
+"""
+
+from typing import Dict, List, Tuple
+
+from .keyword_matcher import KeywordMatcher
+
+# Fallback categories for unknown sources, checked in priority order
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "Machine Learning": ["artificial intelligence", "machine learning", "ai", "ml", "neural", "llm", "gpt", "openai", "anthropic", "chatgpt", "deep learning"],
+    "Startup": ["funding", "series a", "series b", "venture", "startup", "vc", "investor", "raise", "valuation", "ipo"],
+    "Engineering blogs": ["engineering", "development", "programming", "software", "architecture", "infrastructure", "devops"],
+    "Design": ["design", "ux", "ui", "user experience", "interface", "usability", "frontend"],
+    "Psychology": ["psychology", "behavior", "cognitive", "mental", "brain", "mind"],
+    "Science": ["research", "study", "scientific", "experiment", "discovery"],
+}
+
+DEFAULT_CATEGORY = "Tech News"
+
+# Common tech topics used for related-topic detection in chat
+TOPIC_KEYWORDS: Dict[str, List[str]] = {
+    "artificial intelligence": ["ai", "machine learning", "neural network", "deep learning"],
+    "blockchain": ["bitcoin", "ethereum", "cryptocurrency", "web3"],
+    "cybersecurity": ["security", "hack", "breach", "vulnerability"],
+    "mobile": ["smartphone", "ios", "android", "mobile app"],
+    "startups": ["funding", "venture capital", "ipo", "unicorn"],
+    "big tech": ["google", "apple", "microsoft", "amazon", "meta"],
+}
+
+# Names that begin ordinary words ("metaverse", "metadata")
+WHOLE_WORD_KEYWORDS = ["meta"]
+
+CATEGORY_GROUP = "category"
+TOPIC_GROUP = "topic"
+
+# One matcher for both tables; labels are (group, name) pairs in table order
+keyword_matcher = KeywordMatcher({
+    **{(CATEGORY_GROUP, category): keywords for category, keywords in CATEGORY_KEYWORDS.items()},
+    **{(TOPIC_GROUP, topic): keywords for topic, keywords in TOPIC_KEYWORDS.items()},
+}, whole_words=WHOLE_WORD_KEYWORDS)
+
+def match_keywords(text: str) -> Tuple[List[str], List[str]]:
+    """Return (matched categories, detected topics) from a single pass over the text"""
+    categories, topics = [], []
+    for group, name in keyword_matcher.match(text):
+        (categories if group == CATEGORY_GROUP else topics).append(name)
+    return categories, topics
+
+def match_categories(text: str) -> List[str]:
+    """Return every fallback category whose keywords occur in the text"""
+    return match_keywords(text)[0]
+
+def detect_topics(text: str) -> List[str]:
+    """Return every tech topic whose keywords occur in the text"""
+    return match_keywords(text)[1]
@@ -0,0 +1,196 @@
+"""
+Incremental sliding-window trending engine
+Weighted term counts are kept in hourly buckets as articles arrive, so reading
+the top terms for any window sums a few counters instead of re-extracting
+keywords from every article body.
+"""
+
+import logging
+import os
+from bisect import insort
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..database import Article, ArticleFeatures
+from .feature_store import FEATURE_VERSION, extract_terms, weighted_term_counts
+from .incremental_index import IncrementalIndex
+from .term_history import TermHistory
+from .timeutil import hour_bucket, to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+# Oldest window the engine can answer; older buckets are expired
+RETENTION_HOURS = int(os.getenv("TRENDING_RETENTION_HOURS", "720"))
+
+# Related articles returned per trending term
+RELATED_ARTICLES = 5
+
+# Hourly per-term history kept for burst detection (recent window + baseline)
+BURST_HISTORY_HOURS = int(os.getenv("TRENDING_BURST_HISTORY_HOURS", "336"))
+
+class TrendingTerm(NamedTuple):
+    topic: str
+    count: int
+    score: float
+    article_ids: List[int]
+    rank: int  # position by count, before the score ordering
+
+class BurstTerm(NamedTuple):
+    topic: str
+    count: int  # weighted count in the recent window
+    recent_rate: float  # per hour, recent window
+    baseline_rate: float  # per hour, baseline window
+    score: float  # z-score of the recent rate against the baseline
+
+class TrendingEngine(IncrementalIndex):
+    """Hour-bucketed weighted term counters with per-term article postings"""
+
+    name = "trending engine"
+
+    def __init__(self, retention_hours: int = RETENTION_HOURS):
+        super().__init__()
+        self.retention_hours = retention_hours
+        self.clear()
+
+    def clear(self):
+        # hour -> weighted term counts
+        self.buckets: Dict[int, Counter] = {}
+        # hour -> term -> (published_at, article id), kept sorted oldest first
+        self.postings: Dict[int, Dict[str, List[Tuple[datetime, int]]]] = {}
+        # term x hour counts for burst detection
+        self.history = TermHistory(BURST_HISTORY_HOURS)
+
+    def load_rows(self, db, after_id: int, limit: int) -> Sequence:
+        """Load stored features (never article bodies) for new articles in the retention window"""
+        cutoff = datetime.utcnow() - timedelta(hours=self.retention_hours)
+        rows = db.query(
+            Article.id,
+            Article.published_at,
+            ArticleFeatures.version,
+            ArticleFeatures.terms
+        ).outerjoin(
+            ArticleFeatures, ArticleFeatures.article_id == Article.id
+        ).filter(
+            Article.id > after_id,
+            # Older articles can never enter a window, so they are skipped for good
+            Article.published_at >= cutoff
+        ).order_by(Article.id).limit(limit).all()
+
+        # Rows ingested before the feature store existed still need extraction
+        missing_ids = [row.id for row in rows if row.version != FEATURE_VERSION]
+        extracted = {}
+        if missing_ids:
+            for article_id, title, content in db.query(
+                Article.id, Article.title, Article.content
+            ).filter(Article.id.in_(missing_ids)).all():
+                extracted[article_id] = extract_terms(title, content)
+
+        return [(row.id, row.published_at, extracted.get(row.id, row.terms)) for row in rows]
+
+    def add_rows(self, rows: Sequence):
+        for article_id, published_at, terms in rows:
+            if not terms:
+                continue
+            self.add_article(article_id, to_naive_utc(published_at), terms)
+
+    def add_article(self, article_id: int, published_at: datetime, terms: Dict[str, Dict[str, int]]):
+        """Count one article's weighted terms into its hour bucket"""
+        hour = hour_bucket(published_at)
+        weighted = weighted_term_counts(terms)
+
+        self.buckets.setdefault(hour, Counter()).update(weighted)
+        self.history.add(hour, weighted)
+        bucket_postings = self.postings.setdefault(hour, defaultdict(list))
+        for term in weighted:
+            insort(bucket_postings[term], (published_at, article_id))
+
+    def after_sync(self):
+        self.expire()
+
+    def expire(self, now: Optional[datetime] = None):
+        """Drop buckets that have aged out of the retention window"""
+        now = now or datetime.utcnow()
+        oldest = hour_bucket(now - timedelta(hours=self.retention_hours))
+        expired = [hour for hour in self.buckets if hour < oldest]
+        for hour in expired:
+            del self.buckets[hour]
+            self.postings.pop(hour, None)
+        if expired:
+            self.history.compact(hour_bucket(now))
+
+    def trending_terms(self, hours: int = 24, limit: int = 10) -> List[TrendingTerm]:
+        """Top terms for the last `hours` (aligned to hour buckets), scored by count plus recency"""
+        now = datetime.utcnow()
+        start_hour = hour_bucket(now - timedelta(hours=min(hours, self.retention_hours)))
+
+        with self._lock:
+            # Newest hour first: walking the sorted postings backwards then
+            # yields related articles newest first without any sorting
+            window = sorted((hour for hour in self.buckets if hour >= start_hour), reverse=True)
+            keyword_counter = Counter()
+            for hour in reversed(window):  # oldest first keeps most_common tie order stable
+                keyword_counter.update(self.buckets[hour])
+
+            trending = []
+            for rank, (keyword, count) in enumerate(keyword_counter.most_common(limit)):
+                if count < 2:  # Only include keywords that appear in multiple articles
+                    continue
+
+                # Top related articles and the recency factor in one pass over the postings
+                related = []
+                recency_factor = 0.0
+                for hour in window:
+                    for published_at, article_id in reversed(self.postings[hour].get(keyword, ())):
+                        recency_factor += 1 / max(1, (now - published_at).total_seconds() / 3600)
+                        if len(related) < RELATED_ARTICLES:
+                            related.append(article_id)
+
+                # Trending score: count plus a recency factor favouring fresh articles
+                trending.append(TrendingTerm(
+                    topic=keyword.title(),
+                    count=count,
+                    score=count + recency_factor,
+                    article_ids=related,
+                    rank=rank
+                ))
+
+        # Sort by score (highest first)
+        trending.sort(key=lambda term: term.score, reverse=True)
+        return trending
+
+    def bursts(
+        self, hours: int = 6, baseline_hours: int = 168, limit: int = 20, min_count: int = 3
+    ) -> List[BurstTerm]:
+        """Terms whose recent hourly rate deviates most from their own baseline"""
+        hours = max(1, min(hours, self.history.hours - 1))
+
+        with self._lock:
+            recent_count, baseline_mean, z_scores = self.history.burst_scores(
+                hour_bucket(datetime.utcnow()), hours, baseline_hours
+            )
+            # Ignore terms too rare in the recent window to call a burst
+            z_scores = np.where(recent_count >= min_count, z_scores, -np.inf)
+
+            count = min(limit, len(z_scores))
+            if not count:
+                return []
+            top = np.argpartition(-z_scores, count - 1)[:count]
+            top = top[np.argsort(-z_scores[top], kind="stable")]
+
+            return [
+                BurstTerm(
+                    topic=self.history.terms[row].title(),
+                    count=int(recent_count[row]),
+                    recent_rate=float(recent_count[row] / hours),
+                    baseline_rate=float(baseline_mean[row]),
+                    score=float(z_scores[row])
+                )
+                for row in top
+                if np.isfinite(z_scores[row])
+            ]
+
+# Global engine instance
+trending_engine = TrendingEngine()
@@ -0,0 +1,101 @@
+"""
+Materialized trending snapshots
+Trending topics for the standard windows are computed after ingestion (and
+periodically by cron) and stored in the trending_topics table, so the API
+serves an indexed read and every snapshot doubles as trend history.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal, TrendingTopic
+from .redis_cache import CacheInvalidator
+from .trending_engine import TrendingTerm, trending_engine
+
+logger = logging.getLogger(__name__)
+
+# Windows requested by the frontend; other windows are computed live
+STANDARD_WINDOWS = (24, 168)
+
+# Topics stored per snapshot (by count rank); larger limits are computed live
+SNAPSHOT_TOPICS = 50
+
+# Snapshots older than this are ignored by the API
+SNAPSHOT_MAX_AGE_MINUTES = int(os.getenv("TRENDING_SNAPSHOT_MAX_AGE_MINUTES", "45"))
+
+# Trend history kept in the table
+SNAPSHOT_RETENTION_DAYS = int(os.getenv("TRENDING_SNAPSHOT_RETENTION_DAYS", "90"))
+
+def materialize_trending_snapshots(db: Session, windows=STANDARD_WINDOWS) -> int:
+    """Compute trending topics for each window and store them as one snapshot; returns rows written"""
+    trending_engine.sync(db, force=True)
+    snapshot_time = datetime.utcnow()
+
+    rows = []
+    for window_hours in windows:
+        for term in trending_engine.trending_terms(hours=window_hours, limit=SNAPSHOT_TOPICS):
+            rows.append(TrendingTopic(
+                topic=term.topic,
+                count=term.count,
+                score=term.score,
+                date=snapshot_time,
+                window_hours=window_hours,
+                rank=term.rank,
+                article_ids=term.article_ids
+            ))
+
+    db.add_all(rows)
+    db.query(TrendingTopic).filter(
+        TrendingTopic.date < snapshot_time - timedelta(days=SNAPSHOT_RETENTION_DAYS)
+    ).delete(synchronize_session=False)
+    db.commit()
+
+    CacheInvalidator.invalidate_trending()
+    logger.info(f"📸 Stored trending snapshot with {len(rows)} topics for windows {list(windows)}")
+    return len(rows)
+
+def run_snapshot_job() -> int:
+    """Materialize snapshots in a session of their own (cron and post-ingestion hook)"""
+    db = SessionLocal()
+    try:
+        return materialize_trending_snapshots(db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Failed to materialize trending snapshots: {e}")
+        return 0
+    finally:
+        db.close()
+
+def latest_snapshot(db: Session, hours: int, limit: int) -> Optional[List[TrendingTerm]]:
+    """Trending terms from the freshest snapshot, or None if it cannot answer this request"""
+    if hours not in STANDARD_WINDOWS or limit > SNAPSHOT_TOPICS:
+        return None
+
+    snapshot_time = db.query(func.max(TrendingTopic.date)).filter(
+        TrendingTopic.window_hours == hours
+    ).scalar()
+    if snapshot_time is None or snapshot_time < datetime.utcnow() - timedelta(minutes=SNAPSHOT_MAX_AGE_MINUTES):
+        return None
+
+    # Same selection as the live path: top `limit` by count, then ordered by score
+    rows = db.query(TrendingTopic).filter(
+        TrendingTopic.window_hours == hours,
+        TrendingTopic.date == snapshot_time,
+        TrendingTopic.rank < limit
+    ).order_by(TrendingTopic.score.desc()).all()
+
+    return [
+        TrendingTerm(
+            topic=row.topic,
+            count=row.count,
+            score=row.score,
+            article_ids=row.article_ids or [],
+            rank=row.rank
+        )
+        for row in rows
+    ]
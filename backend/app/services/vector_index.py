@@ -0,0 +1,310 @@
+"""
+Local article embeddings and nearest-neighbor search
+Articles are embedded offline with a hashing vectorizer (word unigrams and
+bigrams) followed by a sparse random projection, so embeddings are
+deterministic and need no trained model. Vectors live in a memory-mapped
+float32 matrix indexed by article id that every process shares; neighbors
+come from batched matrix products, optionally narrowed by an IVF coarse
+quantizer once the corpus is large.
+"""
+
+import fcntl
+import json
+import logging
+import math
+import os
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..database import Article
+from .incremental_index import IncrementalIndex
+from .keyword_extractor import STOP_WORDS, WORD_PATTERN
+
+logger = logging.getLogger(__name__)
+
+VECTOR_DIR = os.getenv("VECTOR_INDEX_DIR", "./data/vectors")
+DIMENSIONS = int(os.getenv("VECTOR_DIMENSIONS", "256"))
+# The IVF quantizer is trained once this many articles are embedded
+IVF_MIN_ARTICLES = int(os.getenv("VECTOR_IVF_MIN_ARTICLES", "200000"))
+IVF_PROBES = int(os.getenv("VECTOR_IVF_PROBES", "8"))
+
+EMBEDDING_VERSION = 1
+HASH_BUCKETS = 2 ** 18
+NONZEROS_PER_FEATURE = 4
+TITLE_WEIGHT = 2
+CONTENT_CHARS = 2000
+GROWTH_ROWS = 65536  # matrix file grows in steps of this many article ids
+SEARCH_BATCH_ROWS = 65536
+
+# Sparse random projection: each hashed feature adds +-1 to a few dimensions
+_projection_rng = np.random.default_rng(EMBEDDING_VERSION)
+PROJECTION_INDEX = _projection_rng.integers(0, DIMENSIONS, (HASH_BUCKETS, NONZEROS_PER_FEATURE), dtype=np.int32)
+PROJECTION_SIGN = _projection_rng.choice(np.array([-1.0, 1.0], dtype=np.float32), (HASH_BUCKETS, NONZEROS_PER_FEATURE))
+
+@lru_cache(maxsize=65536)
+def _bucket(feature: str) -> int:
+    # crc32 rather than hash(), which is salted per process
+    return zlib.crc32(feature.encode()) % HASH_BUCKETS
+
+def _features(text: Optional[str]) -> List[str]:
+    words = [
+        word for word in WORD_PATTERN.findall(text.lower())
+        if len(word) > 1 and word not in STOP_WORDS and not word.isdigit()
+    ] if text else []
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+def embed_text(title: Optional[str], summary: Optional[str] = None, content: Optional[str] = None) -> np.ndarray:
+    """Unit-length embedding of an article (zero vector if it has no usable words)"""
+    counts = Counter()
+    for feature in _features(title):
+        counts[feature] += TITLE_WEIGHT
+    counts.update(_features(summary))
+    counts.update(_features((content or "")[:CONTENT_CHARS]))
+    if not counts:
+        return np.zeros(DIMENSIONS, dtype=np.float32)
+
+    buckets = np.fromiter((_bucket(feature) for feature in counts), dtype=np.int64, count=len(counts))
+    weights = np.fromiter((1 + math.log(count) for count in counts.values()), dtype=np.float32, count=len(counts))
+    vector = np.bincount(
+        PROJECTION_INDEX[buckets].ravel(),
+        (PROJECTION_SIGN[buckets] * weights[:, None]).ravel(),
+        minlength=DIMENSIONS
+    ).astype(np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class VectorStore:
+    """Memory-mapped embedding matrix (row = article id) plus a written-rows flag column"""
+
+    def __init__(self, directory: str = VECTOR_DIR, dimensions: int = DIMENSIONS):
+        self.directory = directory
+        self.dimensions = dimensions
+        self.vectors_path = os.path.join(directory, "embeddings.f32")
+        self.present_path = os.path.join(directory, "present.u8")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.vectors: Optional[np.memmap] = None
+        self.present: Optional[np.memmap] = None
+        self.capacity = 0
+
+    def open(self):
+        """Map the files, discarding them if they were written with other embedding settings"""
+        os.makedirs(self.directory, exist_ok=True)
+        meta = {"version": EMBEDDING_VERSION, "dimensions": self.dimensions, "buckets": HASH_BUCKETS}
+        with open(os.path.join(self.directory, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            stored = None
+            if os.path.exists(self.meta_path):
+                with open(self.meta_path) as meta_file:
+                    stored = json.load(meta_file)
+            if stored != meta:
+                for path in (self.vectors_path, self.present_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                with open(self.meta_path, "w") as meta_file:
+                    json.dump(meta, meta_file)
+                if stored is not None:
+                    logger.info("ℹ️  Embedding settings changed, discarding stored vectors")
+        self._map(GROWTH_ROWS)
+
+    def _map(self, rows: int):
+        """(Re)map the files with room for at least `rows` article ids, growing them if needed"""
+        with open(os.path.join(self.directory, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # Files only ever grow, so a concurrent process can't truncate rows we wrote
+            existing = os.path.getsize(self.present_path) if os.path.exists(self.present_path) else 0
+            capacity = max(existing, -(-rows // GROWTH_ROWS) * GROWTH_ROWS)
+            for path, row_bytes in ((self.vectors_path, self.dimensions * 4), (self.present_path, 1)):
+                with open(path, "ab") as data_file:
+                    if data_file.tell() < capacity * row_bytes:
+                        data_file.truncate(capacity * row_bytes)
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions))
+        self.present = np.memmap(self.present_path, dtype=np.uint8, mode="r+", shape=(capacity,))
+        self.capacity = capacity
+
+    def ensure_rows(self, rows: int):
+        if self.vectors is None:
+            self.open()
+        if rows > self.capacity:
+            self._map(rows)
+
+    def missing(self, article_ids: Sequence[int]) -> List[int]:
+        """Article ids without a stored vector"""
+        self.ensure_rows(0)
+        return [
+            article_id for article_id in article_ids
+            if article_id >= self.capacity or not self.present[article_id]
+        ]
+
+    def write(self, article_ids: Sequence[int], vectors: np.ndarray):
+        if not article_ids:
+            return
+        # Only writes grow the files, so lookups of unknown ids can't inflate them
+        self.ensure_rows(max(article_ids) + 1)
+        self.vectors[article_ids] = vectors
+        # Flag after the vector so readers never see a half-written row
+        self.present[article_ids] = 1
+
+    def vector(self, article_id: int) -> Optional[np.ndarray]:
+        self.ensure_rows(0)
+        if article_id >= self.capacity or not self.present[article_id]:
+            return None
+        return np.array(self.vectors[article_id])
+
+def embed_rows(rows: Iterable[Tuple[int, Optional[str], Optional[str], Optional[str]]]) -> Tuple[List[int], np.ndarray]:
+    ids, vectors = [], []
+    for article_id, title, summary, content in rows:
+        ids.append(article_id)
+        vectors.append(embed_text(title, summary, content))
+    return ids, np.vstack(vectors) if vectors else np.zeros((0, DIMENSIONS), dtype=np.float32)
+
+class CoarseQuantizer:
+    """IVF lists: k-means centroids and the article ids assigned to each"""
+
+    def __init__(self, centroids: np.ndarray):
+        self.centroids = centroids
+        self.lists: List[List[int]] = [[] for _ in range(len(centroids))]
+
+    @classmethod
+    def train(cls, sample: np.ndarray, iterations: int = 10, seed: int = 0) -> "CoarseQuantizer":
+        rng = np.random.default_rng(seed)
+        lists = max(1, int(math.sqrt(len(sample))))
+        centroids = sample[rng.choice(len(sample), lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(lists):
+                members = sample[assignment == cluster]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm:
+                        centroids[cluster] = centroid / norm
+        return cls(centroids)
+
+    def add(self, article_ids: Sequence[int], vectors: np.ndarray):
+        for article_id, cluster in zip(article_ids, np.argmax(vectors @ self.centroids.T, axis=1)):
+            self.lists[cluster].append(article_id)
+
+    def candidates(self, query: np.ndarray, probes: int) -> np.ndarray:
+        nearest = np.argsort(-(self.centroids @ query))[:probes]
+        return np.fromiter(
+            (article_id for cluster in nearest for article_id in self.lists[cluster]), dtype=np.int64
+        )
+
+class VectorIndex(IncrementalIndex):
+    """Cosine nearest neighbors over the embedding store"""
+
+    name = "vector index"
+    batch_size = 1000  # rows carry article bodies
+
+    def __init__(self, store: Optional[VectorStore] = None):
+        super().__init__()
+        self.store = store or VectorStore()
+        self.clear()
+
+    def clear(self):
+        self.quantizer: Optional[CoarseQuantizer] = None
+        self.trained_at_count = 0
+        self.embedded_count = 0
+
+    def load_rows(self, db, after_id: int, limit: int) -> Sequence:
+        article_ids = [article_id for (article_id,) in db.query(Article.id).filter(
+            Article.id > after_id
+        ).order_by(Article.id).limit(limit).all()]
+        missing = self.store.missing(article_ids)
+        texts = {
+            article_id: (title, summary, content)
+            for article_id, title, summary, content in db.query(
+                Article.id, Article.title, Article.summary, Article.content
+            ).filter(Article.id.in_(missing)).all()
+        } if missing else {}
+        return [(article_id, texts.get(article_id)) for article_id in article_ids]
+
+    def add_rows(self, rows: Sequence):
+        new_rows = [(article_id, *text) for article_id, text in rows if text is not None]
+        if new_rows:
+            self.store.write(*embed_rows(new_rows))
+        self.embedded_count += len(rows)
+        if self.quantizer is not None:
+            article_ids = [article_id for article_id, _ in rows]
+            self.quantizer.add(article_ids, np.asarray(self.store.vectors[article_ids]))
+
+    def after_sync(self):
+        # (Re)train the quantizer when the corpus first gets large and whenever it doubles
+        if self.embedded_count >= IVF_MIN_ARTICLES and self.embedded_count >= 2 * self.trained_at_count:
+            self.train_quantizer()
+
+    def train_quantizer(self, sample_size: int = 50000):
+        ids = self.indexed_ids()
+        rng = np.random.default_rng(0)
+        sample = np.asarray(self.store.vectors[np.sort(rng.choice(ids, min(sample_size, len(ids)), replace=False))])
+        quantizer = CoarseQuantizer.train(sample)
+        for start in range(0, len(ids), SEARCH_BATCH_ROWS):
+            batch = ids[start:start + SEARCH_BATCH_ROWS]
+            quantizer.add(batch.tolist(), np.asarray(self.store.vectors[batch]))
+        self.quantizer = quantizer
+        self.trained_at_count = self.embedded_count
+        logger.info(f"📇 {self.name}: trained IVF quantizer with {len(quantizer.centroids)} lists")
+
+    def indexed_ids(self) -> np.ndarray:
+        """Ids of embedded articles up to the high-water mark"""
+        rows = min(self.last_article_id + 1, self.store.capacity)
+        return np.flatnonzero(self.store.present[:rows])
+
+    def embed_articles(self, db, article_ids: Sequence[int]):
+        """Store embeddings for freshly inserted articles"""
+        missing = self.store.missing(list(article_ids))
+        if missing:
+            rows = db.query(Article.id, Article.title, Article.summary, Article.content).filter(
+                Article.id.in_(missing)
+            ).all()
+            self.store.write(*embed_rows(rows))
+
+    def vector_for(self, db, article_id: int) -> Optional[np.ndarray]:
+        """Stored embedding of an article, computing it if needed; None if the article doesn't exist"""
+        vector = self.store.vector(article_id)
+        if vector is None:
+            self.embed_articles(db, [article_id])
+            vector = self.store.vector(article_id)
+        return vector
+
+    def nearest(self, query: np.ndarray, limit: int, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(article id, cosine similarity) of the closest articles, best first"""
+        if not query.any():
+            return []
+        with self._lock:
+            if self.quantizer is not None:
+                candidate_batches = [np.sort(self.quantizer.candidates(query, IVF_PROBES))]
+            else:
+                # Presence flags are authoritative, so vectors written by the ingestion process count too
+                rows = self.store.capacity
+                candidate_batches = [
+                    np.arange(start, min(start + SEARCH_BATCH_ROWS, rows))
+                    for start in range(0, rows, SEARCH_BATCH_ROWS)
+                ]
+
+            best_ids, best_scores = [], []
+            for candidates in candidate_batches:
+                candidates = candidates[self.store.present[candidates].astype(bool)]
+                if exclude is not None:
+                    candidates = candidates[candidates != exclude]
+                if not len(candidates):
+                    continue
+                scores = self.store.vectors[candidates] @ query
+                if len(scores) > limit:
+                    top = np.argpartition(-scores, limit - 1)[:limit]
+                    candidates, scores = candidates[top], scores[top]
+                best_ids.append(candidates)
+                best_scores.append(scores)
+
+        if not best_ids:
+            return []
+        ids, scores = np.concatenate(best_ids), np.concatenate(best_scores)
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [(int(ids[position]), float(scores[position])) for position in order]
+
+# Global index instance
+vector_index = VectorIndex()
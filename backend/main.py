@@ -8,7 +8,16 @@ import os
 # Load environment variables
 load_dotenv()
 
-from app.database import init_db
+from app.database import SessionLocal, init_db
+from app.decorators.cache_decorator import cache_hit_rates
+from app.services.redis_cache import cache
+from app.services.search_backend import search_backend
+from app.services.facet_index import facet_index
+from app.services.hot_set import hot_set
+from app.services.inverted_index import search_index
+from app.services.rollups import ensure_rollups
+from app.services.spell_checker import spell_checker
+from app.services.vector_index import vector_index
 from app.routers import articles, chat, bookmarks, trending, search
 
 @asynccontextmanager
@@ -18,6 +27,29 @@ async def lifespan(app: FastAPI):
         init_db()
     except Exception as e:
         print(f"Database initialization: {e}")
+    
+    # Totals and analytics read the hourly rollups; build them for databases that predate them
+    db = SessionLocal()
+    try:
+        ensure_rollups(db)
+    except Exception as e:
+        print(f"Rollup initialization: {e}")
+    finally:
+        db.close()
+    
+    # Full-text index and its sync triggers (falls back to ILIKE search on failure)
+    search_backend.setup()
+    # In-process search index for databases without one (loads in the background)
+    if search_index.serves_queries():
+        search_index.warm_up()
+    # Facet bitmaps from their snapshot plus articles inserted since
+    facet_index.warm_up()
+    # Columnar metadata of the last few days for list pages and recent counts
+    hot_set.warm_up()
+    # Corpus vocabulary for "did you mean" corrections
+    spell_checker.warm_up()
+    # Article embeddings for related articles and semantic search
+    vector_index.warm_up()
     yield
 
 app = FastAPI(
@@ -84,6 +116,11 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/cache")
+async def cache_health():
+    """Response cache hits and misses per key prefix (this worker, since startup)"""
+    return {"connected": cache.is_connected, "local": cache.local_stats(), "prefixes": cache_hit_rates()}
+
 @app.get("/cors-debug")
 async def cors_debug():
     """Debug endpoint to check CORS configuration"""
@@ -12,6 +12,7 @@ import random
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal, Article, init_db
+from app.services.rollups import record_articles
 
 def add_sample_articles():
     """Add sample articles for testing"""
@@ -128,6 +129,8 @@ def add_sample_articles():
                 added_count += 1
         
         db.commit()
+        # Totals and analytics read the hourly rollups
+        record_articles(db)
         print(f"✅ Added {added_count} sample articles to the database")
         
         # Show summary
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Script to backfill historical articles from paginated feed archives.
+Progress is checkpointed, so the script can be stopped and re-run safely.
+"""
+
+import sys
+import os
+import argparse
+import logging
+
+# Add the parent directory to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import init_db
+from app.services.rss_aggregator import aggregator
+from app.services.feed_backfill import FeedBackfiller, DEFAULT_CHECKPOINT_PATH
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler('news_backfill.log'),
+        logging.StreamHandler()
+    ]
+)
+
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Backfill historical articles from paginated feeds")
+    parser.add_argument("--source", action="append", dest="sources",
+                        help="Source name to backfill (repeatable, defaults to all sources)")
+    parser.add_argument("--max-pages", type=int, default=100, help="Maximum archive pages per source")
+    parser.add_argument("--workers", type=int, default=8, help="Number of sources fetched in parallel")
+    parser.add_argument("--rate", type=float, default=1.0, help="Maximum requests per second per host")
+    parser.add_argument("--extract-content", action="store_true",
+                        help="Download full article pages instead of using feed summaries")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH, help="Checkpoint file path")
+    parser.add_argument("--reset", action="store_true", help="Ignore saved progress and start over")
+    return parser.parse_args()
+
+def main():
+    """Main function to run the historical backfill"""
+    args = parse_args()
+    init_db()
+
+    backfiller = FeedBackfiller(
+        aggregator,
+        max_workers=args.workers,
+        requests_per_second=args.rate,
+        max_pages=args.max_pages,
+        extract_content=args.extract_content,
+        checkpoint_path=args.checkpoint
+    )
+    if args.reset:
+        backfiller.checkpoint.reset()
+
+    logger.info("Starting historical backfill...")
+
+    try:
+        new_articles_count = backfiller.run(args.sources)
+        print(f"✅ Backfill added {new_articles_count} historical articles")
+    except Exception as e:
+        logger.error(f"Error during backfill: {e}")
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
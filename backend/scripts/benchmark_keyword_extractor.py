@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark and identity check for the keyword/phrase extractor.
+Runs the precompiled extractor and the previous per-call implementation over
+a deterministic 10k-article fixture and verifies the outputs are identical.
+"""
+
+import sys
+import os
+import random
+import re
+import time
+
+# Add the parent directory to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.keyword_extractor import (
+    STOP_WORDS, TECH_PATTERNS, COMPANY_PATTERNS, extract_keywords, extract_tech_phrases
+)
+
+# Overlaps, punctuation, casing and non-ASCII text that the fast path must handle
+EDGE_CASES = [
+    "",
+    "Big data warehouse and data lake news",
+    "GPT-4 and gpt-35 beat GPT- and GPT4",
+    "Node.js, node.js and NodeXjs; JavaScript is not Java",
+    "Google Cloud outage hits Google customers",
+    "process automation vs. automation vs. workflow automation",
+    "\u017fecurity, \u212aubernetes and Kubernetes",  # long s / Kelvin sign match under IGNORECASE
+    "caf\u00e9 OpenAI\u2019s ChatGPT_plugin and Stack  Overflow",
+    "iOS18 iOS 18 ios IOS",
+    "open-source open source OPEN SOURCE",
+]
+
+def legacy_extract_keywords(text: str) -> list:
+    """Previous extract_keywords: stop-word set rebuilt and regex looked up per call"""
+    if not text:
+        return []
+    stop_words = set(STOP_WORDS)
+    keywords = []
+    for word in re.findall(r'\b[A-Za-z][A-Za-z0-9\-]{3,}\b', text):
+        if word.lower() in stop_words or word.isdigit():
+            continue
+        if word[0].isupper():
+            keywords.append(word)
+        elif any(char.isdigit() or char == '-' for char in word):
+            keywords.append(word.upper() if len(word) <= 6 else word.title())
+        elif len(word) >= 6:
+            keywords.append(word.title())
+    return keywords
+
+def legacy_extract_tech_phrases(text: str) -> list:
+    """Previous extract_tech_phrases: one IGNORECASE findall per pattern"""
+    if not text:
+        return []
+    phrases = []
+    for pattern in TECH_PATTERNS + COMPANY_PATTERNS:
+        for match in re.findall(pattern, text, re.IGNORECASE):
+            phrases.append(match.title())
+    return phrases
+
+def build_fixture(size: int = 10000) -> list:
+    """Deterministic articles: a title plus a ~300-word body with occasional tech terms"""
+    random.seed(42)
+    terms = [
+        re.sub(r'\\(.)', r'\1', alternative).replace('\\d+', str(random.randint(1, 5)))
+        for pattern in TECH_PATTERNS + COMPANY_PATTERNS
+        for alternative in re.fullmatch(r'\\b\((.*)\)\\b', pattern).group(1).split('|')
+    ]
+    filler = ("the company announced that its product will ship next quarter, with better "
+              "performance and lower prices for customers across markets. Engineers said "
+              "deployment pipelines, databases and latency budgets improved; Analysts "
+              "expect growth in 2025 and beyond.").split()
+
+    def text(words: int, term_rate: float) -> str:
+        return " ".join(
+            random.choice(terms) if random.random() < term_rate else random.choice(filler)
+            for _ in range(words)
+        )
+
+    return [(text(10, 0.2).capitalize(), text(300, 0.02)) for _ in range(size)]
+
+def timed(func, texts) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        func(text)
+    return time.perf_counter() - start
+
+def main():
+    articles = build_fixture()
+    texts = EDGE_CASES + [text for article in articles for text in article]
+
+    mismatches = 0
+    for text in texts:
+        if extract_keywords(text) != legacy_extract_keywords(text):
+            mismatches += 1
+            print(f"❌ keywords differ for {text[:60]!r}")
+        if extract_tech_phrases(text) != legacy_extract_tech_phrases(text):
+            mismatches += 1
+            print(f"❌ phrases differ for {text[:60]!r}")
+    print(f"Identity check: {len(texts)} texts, {mismatches} mismatches")
+
+    print(f"\nFixture: {len(articles)} articles (title + ~300-word body)")
+    for label, legacy, current in (
+        ("extract_keywords", legacy_extract_keywords, extract_keywords),
+        ("extract_tech_phrases", legacy_extract_tech_phrases, extract_tech_phrases),
+    ):
+        legacy_time = timed(legacy, texts)
+        current_time = timed(current, texts)
+        print(f"{label:22} previous {legacy_time * 1000:8.1f} ms   "
+              f"current {current_time * 1000:8.1f} ms   ({legacy_time / current_time:.1f}x)")
+
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
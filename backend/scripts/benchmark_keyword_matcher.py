@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark and regression check for the keyword matcher.
+Compares the keyword matcher with the previous substring-scan logic
+for categorize_article and get_related_topics.
+"""
+
+import sys
+import os
+import random
+import time
+
+# Add the parent directory to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.topics import (
+    CATEGORY_KEYWORDS, TOPIC_KEYWORDS, DEFAULT_CATEGORY, match_keywords
+)
+
+# (text, expected fallback category, expected topics)
+REGRESSION_FIXTURES = [
+    ("OpenAI ships a new LLM for developers", "Machine Learning", []),
+    ("Machine learning at scale", "Machine Learning", ["artificial intelligence"]),
+    ("She said the email was important", DEFAULT_CATEGORY, []),  # "ai" inside "said"/"email"
+    ("HTML tips for beginners", DEFAULT_CATEGORY, []),  # "ml" inside "html"
+    ("How to build a guide", DEFAULT_CATEGORY, []),  # "ui" inside "build"/"guide"
+    ("AI-powered search is here", "Machine Learning", ["artificial intelligence"]),
+    ("The startup closed a Series A round", "Startup", []),
+    ("Series Alpha is not a funding round", "Startup", ["startups"]),  # via "funding" only
+    ("Bitcoin and Ethereum rally", DEFAULT_CATEGORY, ["blockchain"]),
+    ("Security breach at Meta", DEFAULT_CATEGORY, ["cybersecurity", "big tech"]),
+    ("Metaverse news roundup", DEFAULT_CATEGORY, []),  # "meta" inside "metaverse"
+    ("A new iOS and Android mobile app", DEFAULT_CATEGORY, ["mobile"]),
+    ("Building a design system for the UI", "Design", []),
+    ("Venture capital firms back the IPO", "Startup", ["startups"]),
+    ("Cognitive science of the brain", "Psychology", []),
+    ("New research study on chips", "Science", []),
+    ("Web3 wallets explained", DEFAULT_CATEGORY, ["blockchain"]),
+    # Plurals and inflections match at the start of the word
+    ("Startups chase investors", "Startup", []),
+    ("Hackers breached Google servers", DEFAULT_CATEGORY, ["cybersecurity", "big tech"]),
+    ("Designing interfaces for mobile apps", "Design", ["mobile"]),
+    ("Vulnerabilities found in Android", DEFAULT_CATEGORY, ["cybersecurity", "mobile"]),
+    ("Raising a seed round after two IPOs", "Startup", ["startups"]),
+    ("Researchers studied the neural networks of LLMs", "Machine Learning", ["artificial intelligence"]),
+    ("Scientists published new studies", "Science", []),
+    ("Mindful UIs", "Design", []),
+    ("Metadata and guidelines", DEFAULT_CATEGORY, []),  # "meta" and "ui" are whole words only
+]
+
+def legacy_category(text: str) -> str:
+    """Previous categorize_article fallback: substring scan per keyword"""
+    text = text.lower()
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            return category
+    return DEFAULT_CATEGORY
+
+def legacy_topics(text: str) -> list:
+    """Previous get_related_topics: substring scan per keyword"""
+    text = text.lower()
+    return [
+        topic for topic, keywords in TOPIC_KEYWORDS.items()
+        if any(keyword in text for keyword in keywords)
+    ]
+
+def matcher_category(text: str) -> str:
+    categories, _ = match_keywords(text)
+    return categories[0] if categories else DEFAULT_CATEGORY
+
+def check_fixtures() -> int:
+    """Verify the matcher against hand-labelled fixtures"""
+    failures = 0
+    for text, expected_category, expected_topics in REGRESSION_FIXTURES:
+        categories, topics = match_keywords(text)
+        category = categories[0] if categories else DEFAULT_CATEGORY
+        if category != expected_category or topics != expected_topics:
+            failures += 1
+            print(f"❌ {text!r}: got ({category}, {topics}), expected ({expected_category}, {expected_topics})")
+    print(f"Fixtures: {len(REGRESSION_FIXTURES) - failures}/{len(REGRESSION_FIXTURES)} passed")
+    return failures
+
+def build_corpus(size: int, words_per_text: int, keyword_rate: float) -> list:
+    """Deterministic synthetic corpus mixing keywords, near-misses and filler words"""
+    random.seed(42)
+    keywords = [kw for table in (CATEGORY_KEYWORDS, TOPIC_KEYWORDS) for kws in table.values() for kw in kws]
+    filler = ("the company announced that its product will ship next quarter, with better "
+              "performance and lower prices for customers across markets. said email html "
+              "build guide metaverse capital mind-blowing explained").split()
+    return [
+        " ".join(
+            random.choice(keywords) if random.random() < keyword_rate else random.choice(filler)
+            for _ in range(words_per_text)
+        )
+        for _ in range(size)
+    ]
+
+def timed(func, corpus) -> float:
+    start = time.perf_counter()
+    for text in corpus:
+        func(text)
+    return time.perf_counter() - start
+
+def main():
+    failures = check_fixtures()
+
+    # ~10KB article bodies: realistic keyword density, then a keyword-dense worst case
+    for label, keyword_rate in (("1% keywords", 0.01), ("10% keywords", 0.10)):
+        corpus = build_corpus(size=2000, words_per_text=1500, keyword_rate=keyword_rate)
+
+        legacy_time = timed(lambda t: (legacy_category(t), legacy_topics(t)), corpus)
+        matcher_time = timed(match_keywords, corpus)
+
+        category_diffs = sum(legacy_category(t) != matcher_category(t) for t in corpus)
+        topic_diffs = sum(legacy_topics(t) != match_keywords(t)[1] for t in corpus)
+
+        print(f"\nCorpus ({label}): {len(corpus)} texts x 1500 words")
+        print(f"Legacy substring scans: {legacy_time * 1000:.1f} ms")
+        print(f"Keyword matcher:        {matcher_time * 1000:.1f} ms (categories and topics together)")
+        # The legacy scans stop a table at its first substring hit, and false
+        # hits such as "ai" in "said" come early in most texts
+        print(f"Differences from legacy (word-start and acronym fixes): {category_diffs} categories, {topic_diffs} topic lists")
+
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Script to compute local embeddings for every article that lacks one.
+New articles are embedded at ingest; run this once for an existing database
+(or after changing VECTOR_DIMENSIONS) so the first related/semantic queries are fast.
+"""
+
+import sys
+import os
+import logging
+
+# Add the parent directory to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, init_db
+from app.services.vector_index import vector_index
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+def main():
+    """Main function to build article embeddings"""
+    init_db()
+    db = SessionLocal()
+    
+    try:
+        vector_index.sync(db, force=True)
+        print(f"✅ Embeddings stored for articles up to id {vector_index.last_article_id}")
+    except Exception as e:
+        logger.error(f"Error building embeddings: {e}")
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the hourly article rollups from the articles table.
+Run after bulk edits to articles made outside the ingestion pipeline.
+"""
+
+import sys
+import os
+import logging
+
+# Add the parent directory to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, init_db
+from app.services.redis_cache import CacheInvalidator
+from app.services.rollups import rebuild_rollups
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+def main():
+    """Main function to rebuild rollups"""
+    init_db()
+    db = SessionLocal()
+    
+    try:
+        rows = rebuild_rollups(db)
+        CacheInvalidator.invalidate_trending()
+        CacheInvalidator.invalidate_search()
+        print(f"✅ Rebuilt {rows} rollup rows")
+    except Exception as e:
+        logger.error(f"Error rebuilding rollups: {e}")
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
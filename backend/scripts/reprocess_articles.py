@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Script to recompute category and sentiment for all stored articles.
+Run it after changing categorization rules or sentiment keywords.
+"""
+
+import sys
+import os
+import argparse
+import logging
+
+# Add the parent directory to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.reprocessor import ArticleReprocessor, DEFAULT_CHECKPOINT_PATH
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler('reprocess.log'),
+        logging.StreamHandler()
+    ]
+)
+
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Recompute article categories and sentiment")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Articles per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (defaults to CPU count)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH, help="Checkpoint file path")
+    parser.add_argument("--reset", action="store_true", help="Ignore saved progress and start over")
+    return parser.parse_args()
+
+def main():
+    """Main function to run corpus reprocessing"""
+    args = parse_args()
+    reprocessor = ArticleReprocessor(
+        chunk_size=args.chunk_size,
+        max_workers=args.workers,
+        checkpoint_path=args.checkpoint
+    )
+
+    logger.info("Starting article reprocessing...")
+
+    try:
+        stats = reprocessor.run(reset=args.reset)
+        print(f"✅ Reprocessed {stats['processed']} articles, updated {stats['updated']}")
+    except Exception as e:
+        logger.error(f"Error during reprocessing: {e}")
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
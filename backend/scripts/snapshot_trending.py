@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Script to materialize trending topic snapshots for the standard windows.
+Scheduled with cron between ingestion runs so recency scores stay fresh.
+"""
+
+import sys
+import os
+import logging
+
+# Add the parent directory to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import init_db
+from app.services.trending_snapshots import run_snapshot_job
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+def main():
+    """Main function to store a trending snapshot"""
+    init_db()
+    rows = run_snapshot_job()
+    
+    if rows > 0:
+        print(f"✅ Stored trending snapshot with {rows} topics")
+    else:
+        print("ℹ️  No trending topics to store")
+
+if __name__ == "__main__":
+    main()
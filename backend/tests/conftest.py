@@ -0,0 +1,9 @@
+"""
+Shared test setup
+"""
+
+import os
+import tempfile
+
+# A throwaway database, configured before the app modules create their engine
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
@@ -0,0 +1,86 @@
+"""
+Search query language parsing
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.routers import search
+from app.schemas import SearchRequest
+from app.services.query_parser import (
+    MAX_NESTING, MAX_QUERY_LENGTH, And, Attribute, Not, Or, Phrase, Term, parse_query
+)
+
+def root(query):
+    return parse_query(query).root
+
+def test_plain_words_are_simple():
+    plan = parse_query("OpenAI  Funding")
+    assert plan.simple
+    assert plan.root == And((Term("openai", None, "OpenAI"), Term("funding", None, "Funding")))
+    assert plan.key == "openai funding"
+    assert parse_query("   ") is None
+
+def test_phrases():
+    assert root('"machine learning"') == Phrase(("machine", "learning"), None, "machine learning")
+    # Hyphenated words match as adjacent tokens
+    assert root("gpt-4") == Phrase(("gpt", "4"), None, "gpt-4")
+    assert parse_query('"Machine  Learning" models').terms == ("machine", "learning", "models")
+
+def test_negation():
+    assert root("openai -crypto") == And((Term("openai", None, "openai"), Not(Term("crypto", None, "crypto"))))
+    assert root("openai NOT crypto") == root("openai -crypto")
+    assert root("NOT NOT openai") == Term("openai", None, "openai")
+    # Negated words don't add to relevance
+    assert parse_query("openai -crypto").terms == ("openai",)
+    # A minus inside or after a word is not an operator
+    assert root("covid-19") == Phrase(("covid", "19"), None, "covid-19")
+    assert not isinstance(root("openai - crypto"), Not)
+
+def test_or_binds_looser_than_and():
+    assert root("a b OR c") == Or((And((Term("a", None, "a"), Term("b", None, "b"))), Term("c", None, "c")))
+    assert root("a (b OR c)") == And((Term("a", None, "a"), Or((Term("b", None, "b"), Term("c", None, "c")))))
+    # Operand order doesn't change the cache key
+    assert parse_query("a OR b").key == parse_query("b OR a").key
+    # Lowercase "or" is a word
+    assert root("this or that") == And(tuple(Term(word, None, word) for word in ("this", "or", "that")))
+
+def test_field_prefixes():
+    assert root("title:openai") == Term("openai", "title", "openai")
+    assert root('title:"open source"') == Phrase(("open", "source"), "title", "open source")
+    assert root("source:TechCrunch") == Attribute("source", "techcrunch")
+    assert root("Category:AI") == Attribute("category", "ai")
+    # Unknown prefixes are part of the text
+    assert root("http:example") == Phrase(("http", "example"), None, "http:example")
+
+def test_unbalanced_quotes_and_parentheses():
+    assert root('"open source') == Phrase(("open", "source"), None, "open source")
+    assert root('openai "') == Term("openai", None, "openai")
+    assert root("(a OR b") == Or((Term("a", None, "a"), Term("b", None, "b")))
+    assert root("a) b") == And((Term("a", None, "a"), Term("b", None, "b")))
+    assert parse_query("((") is None
+    assert parse_query(")(") is None
+    assert parse_query('""') is None
+
+def test_deep_nesting_is_read_as_text():
+    # Far deeper than the interpreter's recursion limit allows for recursive descent
+    deep = parse_query("(" * 5000 + "a")
+    assert deep.root == Term("a", None, "a")
+    assert parse_query("NOT " * 5000 + "a") is not None
+    assert parse_query("-(" * 5000 + "a" + ")" * 5000) is not None
+    # Nesting up to the limit is kept
+    nested = "(" * MAX_NESTING + "a OR b" + ")" * MAX_NESTING
+    assert root(nested) == Or((Term("a", None, "a"), Term("b", None, "b")))
+
+def test_query_length_is_limited():
+    SearchRequest(query="a" * MAX_QUERY_LENGTH)
+    with pytest.raises(ValidationError):
+        SearchRequest(query="a" * (MAX_QUERY_LENGTH + 1))
+
+    app = FastAPI()
+    app.include_router(search.router, prefix="/api/search")
+    client = TestClient(app)
+    assert client.get("/api/search/", params={"q": "a" * (MAX_QUERY_LENGTH + 1)}).status_code == 422
+    assert client.post("/api/search/", json={"query": "a" * (MAX_QUERY_LENGTH + 1)}).status_code == 422
@@ -0,0 +1,109 @@
+"""
+Totals and timelines from the hourly article rollups
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+from app.database import Article, SessionLocal, init_db
+from app.services.counts import count_articles
+from app.services.rollups import count_matching, ensure_rollups, record_articles, rollup_state, timeline
+from app.services.timeutil import EPOCH, hour_bucket
+
+SOURCE = "Rollup Wire"
+BASE = datetime(2024, 3, 1, 10)
+
+# Around hour boundaries: on them, just after, and just before the next
+OFFSETS = [
+    timedelta(0), timedelta(minutes=30), timedelta(hours=1), timedelta(hours=1, minutes=59, seconds=59),
+    timedelta(hours=2), timedelta(hours=5, minutes=1), timedelta(days=1, hours=3), timedelta(days=3)
+]
+
+def add_articles(db, offsets, category="Science"):
+    db.add_all(
+        Article(
+            title=f"rollup {category} {index}",
+            url=f"https://example.com/rollups/{category}/{datetime.utcnow().timestamp()}/{index}",
+            source=SOURCE,
+            category=category,
+            published_at=BASE + offset
+        )
+        for index, offset in enumerate(offsets)
+    )
+    db.commit()
+
+def exact_count(db, date_from=None, date_to=None):
+    query = db.query(Article).filter(Article.source == SOURCE)
+    if date_from is not None:
+        query = query.filter(Article.published_at >= date_from)
+    if date_to is not None:
+        query = query.filter(Article.published_at <= date_to)
+    return query.count()
+
+def setup_module():
+    init_db()
+    db = SessionLocal()
+    try:
+        ensure_rollups(db)
+        add_articles(db, OFFSETS)
+        record_articles(db)
+    finally:
+        db.close()
+
+def test_direct_inserts_are_counted():
+    db = SessionLocal()
+    try:
+        before, approximate = count_articles(db, {"source": SOURCE})
+        assert (before, approximate) == (exact_count(db), False)
+
+        # Written without record_articles, as scripts and other writers may do
+        add_articles(db, [timedelta(hours=7)], category="Design")
+        assert count_articles(db, {"source": SOURCE}) == (before + 1, False)
+        assert count_matching(db, source=SOURCE, category="Design") == exact_count(db) - len(OFFSETS)
+        # ...and the rollups caught up rather than falling back for good
+        assert rollup_state(db)[0] == db.query(Article.id).order_by(Article.id.desc()).first()[0]
+    finally:
+        db.close()
+
+def test_deleted_articles_are_rebuilt_by_ensure_rollups():
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.source == SOURCE, Article.category == "Design").delete()
+        db.commit()
+        ensure_rollups(db)
+        assert count_matching(db, source=SOURCE) == exact_count(db)
+        assert rollup_state(db)[1] == db.query(Article).count()
+    finally:
+        db.close()
+
+def test_count_matching_edge_hours():
+    db = SessionLocal()
+    try:
+        bounds = [None] + [BASE + offset + delta for offset in OFFSETS for delta in (
+            timedelta(0), timedelta(seconds=-1), timedelta(seconds=1), timedelta(minutes=15)
+        )]
+        for date_from in bounds:
+            for date_to in bounds:
+                expected = exact_count(db, date_from, date_to)
+                assert count_matching(db, source=SOURCE, date_from=date_from, date_to=date_to) == expected, (date_from, date_to)
+    finally:
+        db.close()
+
+def test_timeline_buckets_longer_than_a_day():
+    db = SessionLocal()
+    try:
+        since = BASE + timedelta(minutes=10)  # partial first hour
+        for interval_hours in (1, 24, 48, 72):
+            expected = Counter(
+                hour_bucket(published_at) // interval_hours
+                for (published_at,) in db.query(Article.published_at).filter(Article.published_at >= since)
+            )
+            points = timeline(db, since, interval_hours)
+            assert {
+                (point["timestamp"] - EPOCH) // timedelta(hours=interval_hours): point["count"] for point in points
+            } == dict(expected)
+            # Aligned to the epoch, oldest first
+            assert all((point["timestamp"] - EPOCH) % timedelta(hours=interval_hours) == timedelta(0) for point in points)
+            assert [point["timestamp"] for point in points] == sorted(point["timestamp"] for point in points)
+    finally:
+        db.close()
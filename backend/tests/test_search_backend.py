@@ -0,0 +1,30 @@
+"""
+Regression checks for the SQLite FTS5 search backend
+"""
+
+from app.database import Article, SessionLocal, init_db
+from app.services.search_backend import SQLiteFTS5Backend
+
+TITLES = ["openai funding", "crypto crash", "openai crypto deal", "openai crypto wallet", "quantum chips"]
+
+def setup_module():
+    init_db()
+    db = SessionLocal()
+    db.add_all(Article(title=title, url=f"https://example.com/{index}") for index, title in enumerate(TITLES))
+    db.commit()
+    db.close()
+
+def test_stacked_filters_are_anded():
+    backend = SQLiteFTS5Backend()
+    backend.setup()
+    assert backend.ready
+    db = SessionLocal()
+    try:
+        query = backend.filter(backend.filter(db.query(Article), "openai"), "crypto")
+        assert sorted(article.title for article in query.all()) == ["openai crypto deal", "openai crypto wallet"]
+        assert query.count() == 2
+        # A ranked search on top of a filter keeps both expressions too
+        ranked = backend.search(backend.filter(db.query(Article), "wallet"), "openai")
+        assert [article.title for article in ranked.all()] == ["openai crypto wallet"]
+    finally:
+        db.close()
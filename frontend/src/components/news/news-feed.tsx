@@ -107,7 +107,7 @@ export function NewsFeed({ searchQuery, selectedCategory, onArticleSelect }: New
           )}
         </h2>
         <span className="text-sm text-muted-foreground">
-          {data?.total || 0} articles
+          {data && data.total != null && `${data.approximate ? '~' : ''}${data.total} articles`}
         </span>
       </div>
       
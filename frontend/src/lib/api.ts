@@ -145,7 +145,7 @@ export const searchApi = {
     return data;
   },
 
-  getSearchSuggestions: async (query: string, limit = 10): Promise<{ suggestions: string[] }> => {
+  getSearchSuggestions: async (query: string, limit = 10): Promise<{ suggestions: string[]; did_you_mean?: string | null }> => {
     const { data } = await api.get('/api/search/suggestions', { params: { q: query, limit } });
     return data;
   },
@@ -26,10 +26,14 @@ export const articleSchema = z.object({
 // Article list response schema
 export const articleListResponseSchema = z.object({
   articles: z.array(articleSchema),
-  total: z.number(),
+  // null when the total was not counted (cursor pages unless include_total is set)
+  total: z.number().nullable(),
+  approximate: z.boolean().optional(),
   page: z.number(),
   page_size: z.number(),
   has_next: z.boolean(),
+  next_cursor: z.string().nullable().optional(),
+  did_you_mean: z.string().nullable().optional(),
 });
 
 // Chat message schema
@@ -71,6 +75,8 @@ export const searchRequestSchema = z.object({
   filters: searchFiltersSchema.optional(),
   page: z.number().min(1).default(1),
   page_size: z.number().min(1).max(100).default(20),
+  cursor: z.string().optional(),
+  include_total: z.boolean().optional(),
 });
 
 // Bookmark schema